@@ -0,0 +1,84 @@
+# This script compares the latency of the clipboard backends against stub helper executables,
+# 	so it runs anywhere (no real clipboard needed).
+#
+# Usage: python benchmarks/bench_clipboard.py [--calls 50] [--out results.json]
+
+import argparse
+import pathlib as paths
+import sys
+import tempfile
+
+sys.path.insert(0, str(paths.Path(__file__).resolve().parent.parent))
+import system
+from bench_common import summarise, time_call, write_results
+
+# Stub for pbcopy/xclip style commands: stores its input in a file.
+STUB_COPY = '''import sys
+with open(sys.argv[1], 'w', encoding='utf-8') as clip_file:
+	clip_file.write(sys.stdin.read())
+'''
+
+# Stub for pbpaste/xclip -o style commands: prints the stored file.
+STUB_PASTE = '''import sys
+with open(sys.argv[1], encoding='utf-8') as clip_file:
+	sys.stdout.write(clip_file.read())
+'''
+
+# Stub SessionClipboard helper that keeps the clipboard in memory.
+STUB_HELPER = '''import sys
+clip_value = ''
+for line in sys.stdin:
+	line = line.rstrip('\\n')
+	if line.startswith('copy'):
+		clip_value = line[5:]
+		sys.stdout.write('ok \\n')
+	elif line == 'paste':
+		sys.stdout.write('ok ' + clip_value + '\\n')
+	else:
+		sys.stdout.write('err unknown request\\n')
+	sys.stdout.flush()
+'''
+
+def time_backend(clipboard, calls):
+	"""Returns the seconds of every copy and of every paste."""
+
+	copy_seconds = [time_call(lambda: clipboard.copy(f'clipboard value {call}')) for call in range(calls)]
+
+	def check_paste():
+		if clipboard.paste() != f'clipboard value {calls - 1}':
+			raise RuntimeError('The clipboard stub returned the wrong value.')
+	paste_seconds = [time_call(check_paste) for call in range(calls)]
+	return copy_seconds, paste_seconds
+
+def main(args):
+	with tempfile.TemporaryDirectory() as stub_dir:
+		stub_dir = paths.Path(stub_dir)
+		for stub_name, stub_code in (('copy.py', STUB_COPY), ('paste.py', STUB_PASTE), ('helper.py', STUB_HELPER)):
+			stub_dir.joinpath(stub_name).write_text(stub_code)
+		clip_file = str(stub_dir.joinpath('clipboard.txt'))
+
+		backends = {
+			'spawn': system.SpawnClipboard([sys.executable, str(stub_dir.joinpath('copy.py')), clip_file],
+			                               [sys.executable, str(stub_dir.joinpath('paste.py')), clip_file]),
+			'session': system.SessionClipboard([sys.executable, str(stub_dir.joinpath('helper.py'))]),
+		}
+		results = {}
+		for backend_name, clipboard in backends.items():
+			try:
+				copy_seconds, paste_seconds = time_backend(clipboard, args.calls)
+			finally:
+				clipboard.close()
+			results[f'copy/{backend_name}'] = summarise(copy_seconds)
+			results[f'paste/{backend_name}'] = summarise(paste_seconds)
+
+	params = {'calls': args.calls}
+	return write_results('clipboard', params, results, args.out)
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description='Time the clipboard backends against stub helper executables.')
+	parser.add_argument('--calls', type=int, default=50, help='copies and pastes timed on every backend')
+	parser.add_argument('--out', default=None, help='also write the JSON results to this file')
+	return parser.parse_args(argv)
+
+if __name__ == '__main__':
+	main(parse_args())
@@ -0,0 +1,58 @@
+# Helpers shared by the benchmark scripts: timing, summarising and writing the results as JSON
+# 	in the same layout so compare.py can diff the results of two versions.
+
+import json
+import pathlib as paths
+import statistics
+import subprocess as sub
+import sys
+import time
+
+REPO_DIR = paths.Path(__file__).resolve().parent.parent
+
+def summarise(seconds_list):
+	"""Returns the run count and the min/median/mean/max milliseconds of seconds_list."""
+
+	return {
+		'runs': len(seconds_list),
+		'min_ms': min(seconds_list) * 1000,
+		'median_ms': statistics.median(seconds_list) * 1000,
+		'mean_ms': statistics.mean(seconds_list) * 1000,
+		'max_ms': max(seconds_list) * 1000,
+	}
+
+def time_call(bench_func):
+	"""Returns the seconds bench_func() took."""
+
+	start = time.perf_counter()
+	bench_func()
+	return time.perf_counter() - start
+
+def repo_version():
+	"""Returns the git commit of the repository (with "-dirty" if it has changes), or None outside of git."""
+
+	try:
+		commit = sub.run(['git', 'describe', '--always', '--dirty'], cwd=REPO_DIR, capture_output=True,
+		                 universal_newlines=True, check=True).stdout.strip()
+	except (OSError, sub.CalledProcessError):
+		return None
+	return commit or None
+
+def write_results(bench_name, params, results, out_path=None, extra=None):
+	"""Print the results as JSON, and also write them to out_path if it's set."""
+
+	report = {
+		'benchmark': bench_name,
+		'version': repo_version(),
+		'python': sys.version.split()[0],
+		'platform': sys.platform,
+		'params': params,
+		'results': results,
+	}
+	if extra is not None:
+		report.update(extra)
+	report_json = json.dumps(report, indent=2)
+	if out_path is not None:
+		paths.Path(out_path).write_text(report_json + '\n')
+	print(report_json)
+	return report
@@ -0,0 +1,51 @@
+# This script measures how long "import system" takes in a fresh interpreter, compared to an interpreter that
+# 	doesn't import anything, and checks which of the lazily imported modules got imported anyway.
+#
+# Usage: python benchmarks/bench_import.py [--runs 20] [--out results.json]
+
+import argparse
+import subprocess as sub
+import sys
+
+from bench_common import REPO_DIR, summarise, time_call, write_results
+
+# Modules that system.py only imports the first time they're needed.
+LAZY_MODULES = ['subprocess', 'platform', 'shutil', 'concurrent.futures', 'queue', 'json', 'hashlib', 'base64',
+                'datetime', 'signal']
+
+def time_interpreter(code, runs):
+	"""Returns the seconds of every run of starting python, running code and exiting."""
+
+	def run_code():
+		sub.run([sys.executable, '-c', code], cwd=REPO_DIR, check=True)
+
+	# Run once first so the timings aren't skewed by compiling system.py.
+	run_code()
+	return [time_call(run_code) for run in range(runs)]
+
+def main(args):
+	baseline_seconds = time_interpreter('pass', args.runs)
+	import_seconds = time_interpreter('import system', args.runs)
+
+	check_code = f'import sys, system; print(" ".join(m for m in {LAZY_MODULES!r} if m in sys.modules))'
+	imported = sub.run([sys.executable, '-c', check_code], cwd=REPO_DIR, check=True, capture_output=True,
+	                   universal_newlines=True).stdout.split()
+
+	results = {
+		'baseline': summarise(baseline_seconds),
+		'import_system': summarise(import_seconds),
+		# The time of each run minus the baseline run it's paired with.
+		'import_cost': summarise([import_time - baseline_time
+		                          for import_time, baseline_time in zip(import_seconds, baseline_seconds)]),
+	}
+	params = {'runs': args.runs}
+	return write_results('import', params, results, args.out, {'lazy_modules_imported': imported})
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description='Time "import system" in a fresh interpreter.')
+	parser.add_argument('--runs', type=int, default=20, help='interpreters started for each timing')
+	parser.add_argument('--out', default=None, help='also write the JSON results to this file')
+	return parser.parse_args(argv)
+
+if __name__ == '__main__':
+	main(parse_args())
@@ -0,0 +1,126 @@
+# This script times the Operations clipboard/open/quit latency against stub executables that are put first on
+# 	PATH (pbcopy/pbpaste/open/osascript/killall on macOS, xclip/wl-copy/wl-paste/xsel/xdg-open/gtk-launch on
+# 	Linux), so nothing real is copied, opened or quit and no display is needed.
+# On Linux fq_apps quits real processes, so every run starts a few stub app processes for it to quit.
+# The stubs are scripts with a #! line, so this only runs on macOS and Linux.
+#
+# Usage: python benchmarks/bench_operations.py [--runs 30] [--apps 3] [--out results.json]
+
+import argparse
+import os
+import pathlib as paths
+import subprocess as sub
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(paths.Path(__file__).resolve().parent.parent))
+import system
+from bench_common import summarise, time_call, write_results
+
+# Stub for every command the backends run, what it does depends on the name it's run as.
+# 	The clipboard is kept in the file $BENCH_CLIP_FILE.
+STUB_COMMAND = '''import os
+import sys
+clip_path = os.environ['BENCH_CLIP_FILE']
+cmd_name = os.path.basename(sys.argv[0])
+args = sys.argv[1:]
+if cmd_name in ('pbcopy', 'wl-copy') or cmd_name == 'xclip' and '-o' not in args or cmd_name == 'xsel' and '--input' in args:
+	with open(clip_path, 'w', encoding='utf-8') as clip_file:
+		clip_file.write(sys.stdin.read())
+elif cmd_name == 'xclip' and 'TIMESTAMP' in args:
+	print(os.stat(clip_path).st_mtime_ns if os.path.exists(clip_path) else 0)
+elif cmd_name in ('pbpaste', 'wl-paste', 'xclip', 'xsel'):
+	if os.path.exists(clip_path):
+		with open(clip_path, encoding='utf-8') as clip_file:
+			sys.stdout.write(clip_file.read())
+elif cmd_name == 'osascript':
+	# One status line for every app in the batch script.
+	for index in range(args[-1].count('on error errMsg')):
+		print(f'{index}\\tok')
+'''
+
+STUB_NAMES = ('pbcopy', 'pbpaste', 'open', 'osascript', 'killall', 'xclip', 'xsel', 'wl-copy', 'wl-paste',
+              'xdg-open', 'gtk-launch')
+
+# Stub app for fq_apps to quit on Linux, it just waits to be sent SIGTERM.
+STUB_APP = '''import time
+while True:
+	time.sleep(60)
+'''
+
+def write_stub(stub_path, stub_code):
+	stub_path.write_text(f'#!{sys.executable}\n' + stub_code)
+	stub_path.chmod(0o755)
+
+def start_apps(stub_dir, app_count):
+	"""Start app_count stub app processes and wait until they're all running their script,
+	returns the Popen objects."""
+
+	app_processes = [sub.Popen([str(stub_dir.joinpath(f'bench-app{app_index}'))]) for app_index in range(app_count)]
+	deadline = time.monotonic() + 10
+	while time.monotonic() < deadline:
+		found_pids = system._find_pids([f'bench-app{app_index}' for app_index in range(app_count)])
+		if all(found_pids.values()):
+			break
+		time.sleep(0.01)
+	return app_processes
+
+def main(args):
+	if sys.platform not in ('darwin', 'linux'):
+		print(f'Error, the stub executables only work on macOS and Linux, not "{sys.platform}".')
+		return None
+
+	results = {}
+	with tempfile.TemporaryDirectory() as stub_dir:
+		stub_dir = paths.Path(stub_dir)
+		for stub_name in STUB_NAMES:
+			write_stub(stub_dir.joinpath(stub_name), STUB_COMMAND)
+		for app_index in range(args.apps):
+			write_stub(stub_dir.joinpath(f'bench-app{app_index}'), STUB_APP)
+		os.environ['BENCH_CLIP_FILE'] = str(stub_dir.joinpath('clipboard.txt'))
+		os.environ['PATH'] = str(stub_dir) + os.pathsep + os.environ['PATH']
+		# So the Linux backend picks xclip rather than the Wayland tools.
+		os.environ.pop('WAYLAND_DISPLAY', None)
+
+		system.instrumentation.reset()
+		# A new backend so the clipboard command is looked up on the stub PATH.
+		operations = system.Operations(print_success=False, print_err=True,
+		                               backend=system.PLATFORM_BACKENDS[sys.platform]())
+		open_file = stub_dir.joinpath('open me.txt')
+		open_file.write_text('')
+		app_names = [f'bench-app{app_index}' for app_index in range(args.apps)]
+
+		bench_funcs = {
+			'copy_to_clipboard': lambda: operations.copy_to_clipboard('clipboard value'),
+			'get_clipboard': operations.get_clipboard,
+			'open_path_or_app': lambda: operations.open_path_or_app(open_file),
+		}
+		for bench_name, bench_func in bench_funcs.items():
+			results[bench_name] = summarise([time_call(bench_func) for run in range(args.runs)])
+
+		quit_seconds = []
+		for run in range(args.runs):
+			app_processes = []
+			if sys.platform == 'linux':
+				app_processes = start_apps(stub_dir, args.apps)
+			quit_seconds.append(time_call(lambda: operations.fq_apps(app_names)))
+			for app_process in app_processes:
+				if app_process.poll() is None:
+					app_process.kill()
+				app_process.wait()
+		results['fq_apps'] = summarise(quit_seconds)
+		operations.close()
+
+	params = {'runs': args.runs, 'apps': args.apps}
+	return write_results('operations', params, results, args.out, {'instrumentation': system.instrumentation.to_dict()})
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description='Time the Operations clipboard/open/quit latency against stubs.')
+	parser.add_argument('--runs', type=int, default=30, help='runs of every operation')
+	parser.add_argument('--apps', type=int, default=3, help='apps quit at once by every fq_apps run')
+	parser.add_argument('--out', default=None, help='also write the JSON results to this file')
+	return parser.parse_args(argv)
+
+if __name__ == '__main__':
+	main(parse_args())
@@ -0,0 +1,150 @@
+# This script times the Paths file operations on synthetic trees:
+# 	"tiny" (many tiny files with a .DS_Store in every folder), "deep" (one long chain of nested folders)
+# 	and "sparse" (a few multi-GB sparse files).
+# Every run gets a freshly generated tree, only the operation itself is timed.
+#
+# The copies of the sparse files write their full size unless the filesystem can reflink them,
+# 	so point --dir at a disk with enough free space (or lower --sparse-gb, 0 skips the sparse tree).
+#
+# Usage: python benchmarks/bench_paths.py [--runs 3] [--tiny-files 20000] [--depth 200] [--sparse-files 3]
+# 	[--sparse-gb 2] [--dir scratch folder] [--out results.json] [--only delete,duplicate]
+
+import argparse
+import os
+import pathlib as paths
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, str(paths.Path(__file__).resolve().parent.parent))
+import system
+from bench_common import summarise, time_call, write_results
+
+def make_tiny_tree(tree_dir, file_count, files_per_dir=100):
+	"""Make file_count files of 1 to 100 bytes, files_per_dir to a folder, with a .DS_Store in every folder."""
+
+	tree_dir.mkdir()
+	for file_index in range(file_count):
+		sub_dir = tree_dir.joinpath(f'dir{file_index // files_per_dir:05}')
+		if file_index % files_per_dir == 0:
+			sub_dir.mkdir()
+			sub_dir.joinpath('.DS_Store').write_bytes(b'\0' * 64)
+		sub_dir.joinpath(f'file{file_index:06}.txt').write_bytes(b'x' * (file_index % 100 + 1))
+
+def make_deep_tree(tree_dir, depth):
+	"""Make depth nested folders that each have a small file and a .DS_Store."""
+
+	tree_dir.mkdir()
+	cur_dir = tree_dir
+	for level in range(depth):
+		cur_dir = cur_dir.joinpath('d')
+		cur_dir.mkdir()
+		cur_dir.joinpath(f'level{level}.txt').write_bytes(b'x' * 32)
+		cur_dir.joinpath('.DS_Store').write_bytes(b'\0' * 64)
+
+def make_sparse_tree(tree_dir, file_count, size_gb):
+	"""Make file_count sparse files of size_gb GiB, they only have a few bytes of real data each."""
+
+	tree_dir.mkdir()
+	for file_index in range(file_count):
+		with open(tree_dir.joinpath(f'sparse{file_index}.bin'), 'wb') as sparse_file:
+			sparse_file.write(b'start')
+			sparse_file.truncate(int(size_gb * 1024 ** 3))
+
+def tree_files(tree_dir):
+	"""Returns every file in tree_dir except the .DS_Store files."""
+
+	return [paths.Path(dir_path, file_name) for dir_path, dir_names, file_names in os.walk(tree_dir)
+	        for file_name in file_names if file_name != '.DS_Store']
+
+# Each bench_ function gets everything ready and returns the function that's timed.
+
+def bench_delete(paths_ops, tree_dir, out_dir):
+	return lambda: paths_ops.delete(tree_dir, del_dir_contents=False, del_in_dir_files=False, del_in_dir_dirs=False)
+
+def bench_del_ds_store(paths_ops, tree_dir, out_dir):
+	return lambda: paths_ops.del_ds_store(tree_dir)
+
+def bench_copy_to_new_dir(paths_ops, tree_dir, out_dir):
+	return lambda: paths_ops.copy_to_new_dir(tree_dir, out_dir)
+
+def bench_duplicate(paths_ops, tree_dir, out_dir):
+	return lambda: paths_ops.duplicate(tree_dir)
+
+def bench_move_to_new_dir(paths_ops, tree_dir, out_dir):
+	return lambda: paths_ops.move_to_new_dir(tree_dir, out_dir)
+
+def bench_change_ext(paths_ops, tree_dir, out_dir):
+	# Change the extension of every file in the tree, the sparse files are copied (so it's the copy path)
+	# 	and the rest are renamed.
+	keep_orig_file = tree_dir.name == 'sparse'
+	file_paths = tree_files(tree_dir)
+
+	def change_every_ext():
+		for file_path in file_paths:
+			paths_ops.change_ext(file_path, '.dat', keep_orig_file=keep_orig_file)
+	return change_every_ext
+
+# Operation name to (its bench_ function, the trees it runs on).
+BENCHMARKS = {
+	'delete': (bench_delete, ('tiny', 'deep', 'sparse')),
+	'del_ds_store': (bench_del_ds_store, ('tiny', 'deep')),
+	'copy_to_new_dir': (bench_copy_to_new_dir, ('tiny', 'deep', 'sparse')),
+	'duplicate': (bench_duplicate, ('tiny', 'deep', 'sparse')),
+	'move_to_new_dir': (bench_move_to_new_dir, ('tiny', 'deep', 'sparse')),
+	'change_ext': (bench_change_ext, ('tiny', 'sparse')),
+}
+
+def main(args):
+	tree_makers = {
+		'tiny': lambda tree_dir: make_tiny_tree(tree_dir, args.tiny_files),
+		'deep': lambda tree_dir: make_deep_tree(tree_dir, args.depth),
+		'sparse': lambda tree_dir: make_sparse_tree(tree_dir, args.sparse_files, args.sparse_gb),
+	}
+	if args.sparse_gb <= 0 or args.sparse_files <= 0:
+		del tree_makers['sparse']
+
+	bench_names = list(BENCHMARKS)
+	if args.only is not None:
+		bench_names = [bench_name for bench_name in args.only.split(',') if bench_name in BENCHMARKS]
+
+	paths_ops = system.Paths(print_success=False, print_err=True)
+	system.instrumentation.reset()
+	results = {}
+	with tempfile.TemporaryDirectory(dir=args.dir) as scratch_dir:
+		scratch_dir = paths.Path(scratch_dir)
+		for bench_name in bench_names:
+			bench_func, tree_names = BENCHMARKS[bench_name]
+			for tree_name in tree_names:
+				if tree_name not in tree_makers:
+					continue
+				seconds_list = []
+				for run in range(args.runs):
+					run_dir = scratch_dir.joinpath('run')
+					run_dir.mkdir()
+					tree_dir = run_dir.joinpath(tree_name)
+					out_dir = run_dir.joinpath('out')
+					out_dir.mkdir()
+					tree_makers[tree_name](tree_dir)
+					seconds_list.append(time_call(bench_func(paths_ops, tree_dir, out_dir)))
+					shutil.rmtree(run_dir)
+				results[f'{bench_name}/{tree_name}'] = summarise(seconds_list)
+
+	params = {'runs': args.runs, 'tiny_files': args.tiny_files, 'depth': args.depth, 'sparse_files': args.sparse_files,
+	          'sparse_gb': args.sparse_gb}
+	return write_results('paths', params, results, args.out, {'instrumentation': system.instrumentation.to_dict()})
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description='Time the Paths file operations on synthetic trees.')
+	parser.add_argument('--runs', type=int, default=3, help='runs of every operation on every tree')
+	parser.add_argument('--tiny-files', type=int, default=20000, help='files in the tiny tree')
+	parser.add_argument('--depth', type=int, default=200, help='nested folders in the deep tree')
+	parser.add_argument('--sparse-files', type=int, default=3, help='files in the sparse tree')
+	parser.add_argument('--sparse-gb', type=float, default=2, help='GiB per sparse file, 0 skips the sparse tree')
+	parser.add_argument('--dir', default=None, help='folder to make the trees in (the temp folder by default)')
+	parser.add_argument('--out', default=None, help='also write the JSON results to this file')
+	parser.add_argument('--only', default=None, help='comma separated operations to run (all of them by default)')
+	return parser.parse_args(argv)
+
+if __name__ == '__main__':
+	main(parse_args())
@@ -0,0 +1,47 @@
+# This script compares two JSON results of the same benchmark (like bench_paths.py --out from two versions)
+# 	and flags every result whose median got slower by more than the threshold.
+# It exits with 1 if anything regressed so it can be used in a script.
+#
+# Usage: python benchmarks/compare.py old.json new.json [threshold percent, 10 by default]
+
+import json
+import sys
+
+def compare(old_report, new_report, threshold=10.0):
+	"""Returns a list of (result name, old median ms, new median ms, percent change, regressed)
+	for every result that's in both reports."""
+
+	rows = []
+	for result_name, new_result in new_report['results'].items():
+		old_result = old_report['results'].get(result_name)
+		if old_result is None:
+			continue
+		old_ms = old_result['median_ms']
+		new_ms = new_result['median_ms']
+		change = (new_ms - old_ms) / old_ms * 100 if old_ms > 0 else 0.0
+		rows.append((result_name, old_ms, new_ms, change, change > threshold))
+	return rows
+
+def main(old_path, new_path, threshold=10.0):
+	with open(old_path, encoding='utf-8') as old_file:
+		old_report = json.load(old_file)
+	with open(new_path, encoding='utf-8') as new_file:
+		new_report = json.load(new_file)
+	if old_report.get('benchmark') != new_report.get('benchmark'):
+		print(f'Error, "{old_path}" and "{new_path}" are results of different benchmarks.')
+		return 2
+
+	print(f'{old_report.get("version")} -> {new_report.get("version")}')
+	rows = compare(old_report, new_report, threshold)
+	for result_name, old_ms, new_ms, change, regressed in rows:
+		flag = '  REGRESSION' if regressed is True else ''
+		print(f'{result_name:<32} {old_ms:>12.2f} ms {new_ms:>12.2f} ms {change:>+8.1f}%{flag}')
+	if any(row[4] for row in rows):
+		return 1
+	return 0
+
+if __name__ == '__main__':
+	if len(sys.argv) not in (3, 4):
+		print('Usage: python benchmarks/compare.py old.json new.json [threshold percent]')
+		sys.exit(2)
+	sys.exit(main(sys.argv[1], sys.argv[2], *(float(arg) for arg in sys.argv[3:])))
@@ -1,13 +1,61 @@
 # This module is to automate system based events.
 
 import pathlib as paths
-import shutil
-import subprocess as sub
-import platform as plat
-import datetime as dates
+import os
+import sys
+import errno
+import stat
+import threading
+import fnmatch
+import re
+import time
+import math
 
-# Function to confirm method input(s) are the correct type 
-def _is_type_or_print_err(in_type, target_type, in_type_str):
+class _LazyModule:
+	"""This stands in for a module that's only imported the first time one of its attributes is used,
+	so scripts that only need some of this module don't pay for importing everything."""
+
+	def __init__(self, module_name):
+		self._module_name = module_name
+		self._module = None
+
+	def __getattr__(self, attr_name):
+		module = self._module
+		if module is None:
+			# __import__ waits if another thread is in the middle of importing it.
+			__import__(self._module_name)
+			module = self._module = sys.modules[self._module_name]
+		return getattr(module, attr_name)
+
+shutil = _LazyModule('shutil')
+futures = _LazyModule('concurrent.futures')
+queue = _LazyModule('queue')
+json = _LazyModule('json')
+hashlib = _LazyModule('hashlib')
+base64 = _LazyModule('base64')
+sub = _LazyModule('subprocess')
+asyncio = _LazyModule('asyncio')
+signal = _LazyModule('signal')
+dates = _LazyModule('datetime')
+struct = _LazyModule('struct')
+
+class SystemCommandError(Exception):
+	"""The base of the errors this module raises."""
+
+class InvalidInputError(SystemCommandError, ValueError):
+	"""Raised when a method is given an input of the wrong type or an invalid value."""
+
+class PathNotFoundError(SystemCommandError, FileNotFoundError):
+	"""Raised when a path a method can't do anything without doesn't exist."""
+
+class UnsupportedPlatformError(SystemCommandError, NotImplementedError):
+	"""Raised when something isn't supported on the current operating system."""
+
+class OperationCancelled(SystemCommandError):
+	"""Raised inside a file operation that was cancelled from AsyncPaths."""
+
+# Function to confirm method input(s) are the correct type, raises InvalidInputError if they're not.
+def _is_type_or_raise(in_type, target_type, in_type_str):
 	if in_type is not target_type:
 		if target_type is paths.Path:
 			# To keep this cross-platform the target_type = paths.Path() so it knows which type to check
@@ -23,54 +71,2239 @@ def _is_type_or_print_err(in_type, target_type, in_type_str):
 		elif target_type is str:
 			target_type_err_str = 'a str,'
 		else:
-			print(f'Error, "{target_type}" is not a type that can be checked in _is_type_or_print_err yet.')
-			quit()
-		print(f'Error, {in_type_str} must be {target_type_err_str} not "{in_type}"')
-		quit()
+			raise InvalidInputError(f'"{target_type}" is not a type that can be checked in _is_type_or_raise yet.')
+		raise InvalidInputError(f'{in_type_str} must be {target_type_err_str} not "{in_type}"')
+
+class Instrumentation:
+	"""This class keeps process wide counters and per operation timers for the Paths/Operations methods,
+	and calls the hooks registered with the on method when an operation starts, ends or raises an error.\n
+	Use the module level instrumentation instance instead of making a new one."""
+
+	COUNTERS = ('bytes_copied', 'files_copied', 'files_deleted', 'dirs_deleted', 'bytes_deleted', 'stat_calls',
+	            'subprocesses')
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._hooks = {}
+		self.counters = dict.fromkeys(self.COUNTERS, 0)
+		# Operation name (like "Paths.delete") to {'calls', 'total_seconds', 'max_seconds'}.
+		self.timers = {}
+
+	def on(self, event, hook_func):
+		"""Call hook_func(event, op, info) whenever event ("op_start", "op_end" or "op_error",
+		or "*" for all of them) happens.\n
+		info is a dict that has the "seconds" the operation took and its "result" or "error"."""
+
+		with self._lock:
+			# Replaced instead of appended to so emit never sees a list that's being changed.
+			self._hooks[event] = self._hooks.get(event, ()) + (hook_func,)
+		return hook_func
+
+	def off(self, event, hook_func):
+		"""Remove a hook added with the on method."""
+
+		with self._lock:
+			self._hooks[event] = tuple(hook for hook in self._hooks.get(event, ()) if hook is not hook_func)
+
+	def emit(self, event, op, info):
+		hooks = self._hooks.get(event, ()) + self._hooks.get('*', ())
+		for hook_func in hooks:
+			hook_func(event, op, info)
+
+	def count(self, name, amount=1):
+		with self._lock:
+			self.counters[name] = self.counters.get(name, 0) + amount
+
+	def add_time(self, op, seconds):
+		with self._lock:
+			op_timer = self.timers.get(op)
+			if op_timer is None:
+				op_timer = self.timers[op] = {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+			op_timer['calls'] += 1
+			op_timer['total_seconds'] += seconds
+			if seconds > op_timer['max_seconds']:
+				op_timer['max_seconds'] = seconds
+
+	def to_dict(self):
+		with self._lock:
+			return {'counters': dict(self.counters), 'timers': {op: dict(op_timer) for op, op_timer in self.timers.items()}}
+
+	def to_json(self, indent=None):
+		return json.dumps(self.to_dict(), indent=indent)
+
+	def reset(self):
+		"""Set every counter back to 0 and clear the timers (the hooks are kept)."""
+
+		with self._lock:
+			self.counters = dict.fromkeys(self.COUNTERS, 0)
+			self.timers = {}
+
+instrumentation = Instrumentation()
+
+# Every stat this module makes goes through these helpers so the stat_calls counter is exact.
+# 	The file types os.scandir already read (DirEntry.is_dir/is_symlink) don't need a stat, so they aren't counted.
+
+def _stat(path):
+	instrumentation.count('stat_calls')
+	return os.stat(path)
+
+def _lstat(path):
+	instrumentation.count('stat_calls')
+	return os.lstat(path)
+
+def _fstat(fd):
+	instrumentation.count('stat_calls')
+	return os.fstat(fd)
+
+def _entry_stat(entry, follow_symlinks=True):
+	# DirEntry.stat caches its result, but the first call is a real stat (except on Windows).
+	instrumentation.count('stat_calls')
+	return entry.stat(follow_symlinks=follow_symlinks)
+
+def _exists(path):
+	try:
+		_stat(path)
+	except (OSError, ValueError):
+		return False
+	return True
+
+def _lexists(path):
+	try:
+		_lstat(path)
+	except (OSError, ValueError):
+		return False
+	return True
+
+def _is_dir(path):
+	try:
+		return stat.S_ISDIR(_stat(path).st_mode)
+	except (OSError, ValueError):
+		return False
+
+def _is_file(path):
+	try:
+		return stat.S_ISREG(_stat(path).st_mode)
+	except (OSError, ValueError):
+		return False
+
+def _copystat(src, dst):
+	# shutil.copystat stats src once.
+	instrumentation.count('stat_calls')
+	shutil.copystat(src, dst)
+
+def _count_copytree_dir(dir_path, names):
+	"""ignore function for shutil.copytree that doesn't ignore anything, it counts the stat of the copystat
+	copytree does for every folder."""
+
+	instrumentation.count('stat_calls')
+	return ()
+
+def _instrumented(method):
+	"""Decorator that times method and emits the instrumentation events around every call."""
+
+	op = method.__qualname__
+
+	def instrumented_method(*args, **kwargs):
+		if instrumentation._hooks:
+			instrumentation.emit('op_start', op, {})
+		start = time.perf_counter()
+		try:
+			result = method(*args, **kwargs)
+		except BaseException as err:
+			seconds = time.perf_counter() - start
+			instrumentation.add_time(op, seconds)
+			if instrumentation._hooks:
+				instrumentation.emit('op_error', op, {'seconds': seconds, 'error': err})
+			raise
+		seconds = time.perf_counter() - start
+		instrumentation.add_time(op, seconds)
+		if instrumentation._hooks:
+			instrumentation.emit('op_end', op, {'seconds': seconds, 'result': result})
+		return result
+
+	instrumented_method.__name__ = method.__name__
+	instrumented_method.__qualname__ = op
+	instrumented_method.__doc__ = method.__doc__
+	instrumented_method.__wrapped__ = method
+	return instrumented_method
+
+class OpResult:
+	"""This class holds the outcome of a single file/folder operation (like a move, copy, rename or one job of
+	copy_many/move_many) and the failure of the methods that return stats when they succeed (like delete and sync_dir).\n
+	It's truthy only if the operation succeeded, and can be used like a path to the output (os.fspath) when it did."""
+
+	def __init__(self, op, in_path, out_path=None, ok=False, err=''):
+		self.op = op
+		self.in_path = in_path
+		self.out_path = out_path
+		self.ok = ok
+		self.err = err
+
+	def __bool__(self):
+		return self.ok
+
+	def __fspath__(self):
+		if self.out_path is None:
+			raise TypeError(f'the {self.op} of "{self.in_path}" failed so there is no output path: {self.err}')
+		return os.fspath(self.out_path)
+
+	def __repr__(self):
+		if self.ok is True and self.out_path is None:
+			return f'OpResult({self.op} ok, "{self.in_path}")'
+		elif self.ok is True:
+			return f'OpResult({self.op} ok, "{self.in_path}" -> "{self.out_path}")'
+		return f'OpResult({self.op} failed, "{self.in_path}": {self.err})'
+
+class DeleteStats:
+	"""This class counts what a delete removed."""
+
+	def __init__(self):
+		self.files = 0
+		self.dirs = 0
+		self.bytes = 0
+		# Set by Paths.delete, True if the input was a folder.
+		self.is_dir = None
+
+	def __repr__(self):
+		return f'DeleteStats(files={self.files}, dirs={self.dirs}, bytes={self.bytes})'
+
+	@staticmethod
+	def total(stats_list):
+		"""Add up a list of DeleteStats into a new one."""
+		total_stats = DeleteStats()
+		for del_stats in list(stats_list):
+			total_stats.files += del_stats.files
+			total_stats.dirs += del_stats.dirs
+			total_stats.bytes += del_stats.bytes
+		return total_stats
+
+def _print_deleted(del_path, is_dir, size):
+	if is_dir is True:
+		print(f'Deleted folder "{del_path}"')
+	else:
+		print(f'Deleted file "{del_path}" ({size} bytes)')
+
+def _rmtree_scandir(dir_path, del_stats, on_deleted=None, known_dirs=None):
+	"""Delete dir_path and everything in it using the file types os.scandir already read,
+	so only the size of each file needs an extra lstat (and none for the files of the folders in known_dirs,
+	a set of folder paths whose bytes are already known)."""
+
+	# Walk with a stack instead of recursion so very deep trees can't hit the recursion limit.
+	# 	Each folder is pushed twice, once to empty it and once (after its contents) to remove it.
+	dir_stack = [(dir_path, False)]
+	while dir_stack:
+		cur_dir, emptied = dir_stack.pop()
+		if emptied is True:
+			os.rmdir(cur_dir)
+			del_stats.dirs += 1
+			if on_deleted is not None:
+				on_deleted(cur_dir, True, 0)
+			continue
+
+		dir_stack.append((cur_dir, True))
+		count_bytes = known_dirs is None or cur_dir not in known_dirs
+		with os.scandir(cur_dir) as dir_entries:
+			for entry in dir_entries:
+				# Symlinks to folders are unlinked rather than followed (like shutil.rmtree).
+				if _is_junction(entry):
+					_rmdir_junction(entry, del_stats, on_deleted)
+				elif entry.is_dir(follow_symlinks=False):
+					dir_stack.append((entry.path, False))
+				else:
+					_unlink_entry(entry, del_stats, on_deleted, count_bytes)
+
+def _unlink_entry(entry, del_stats, on_deleted=None, count_bytes=True):
+	size = 0
+	if count_bytes is True:
+		size = _entry_stat(entry, follow_symlinks=False).st_size
+	os.unlink(entry.path)
+	del_stats.files += 1
+	del_stats.bytes += size
+	if on_deleted is not None:
+		on_deleted(entry.path, False, size)
+
+def _is_junction(entry):
+	# Windows junctions look like folders to os.scandir, but (like symlinks) they have to be removed without
+	# 	emptying the folder they point to. The stat is free on Windows and skipped everywhere else.
+	if os.name != 'nt' or entry.is_dir(follow_symlinks=False) is False:
+		return False
+	return entry.stat(follow_symlinks=False).st_file_attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT != 0
+
+def _rmdir_junction(entry, del_stats, on_deleted=None):
+	os.rmdir(entry.path)
+	del_stats.files += 1
+	if on_deleted is not None:
+		on_deleted(entry.path, False, 0)
+
+def _delete_tree(dir_path, workers, del_files=True, del_dirs=True, del_top=False, on_deleted=None, live_stats=None,
+                 known_dirs=None):
+	"""Delete the contents of dir_path (and dir_path itself if del_top is True) on up to workers threads.\n
+	del_files/del_dirs only apply to the entries directly inside dir_path, anything deeper is always deleted.\n
+	known_dirs can be a set of folder paths (joined onto dir_path) whose bytes are already known, their files
+	aren't stat'ed for their size (so they add nothing to the bytes).\n
+	Returns the combined DeleteStats."""
+
+	if live_stats is None:
+		live_stats = []
+	main_stats = DeleteStats()
+	live_stats.append(main_stats)
+
+	# Split the tree up level by level until there are enough sibling folders to keep every worker busy
+	# 	(so one huge folder next to a few small ones still gets deleted in parallel).
+	# 	The folders that were split are emptied by the workers and then removed deepest first.
+	split_dirs = []
+	level = [os.fspath(dir_path)]
+	depth = 0
+	while True:
+		next_level = []
+		for cur_dir in level:
+			count_bytes = known_dirs is None or cur_dir not in known_dirs
+			with os.scandir(cur_dir) as dir_entries:
+				for entry in dir_entries:
+					if entry.is_dir(follow_symlinks=False):
+						if depth > 0 or del_dirs is True:
+							if _is_junction(entry):
+								_rmdir_junction(entry, main_stats, on_deleted)
+							else:
+								next_level.append(entry.path)
+					elif depth > 0 or del_files is True:
+						_unlink_entry(entry, main_stats, on_deleted, count_bytes)
+		depth += 1
+		if workers == 1 or len(next_level) >= workers * 2 or depth >= 4 or next_level == []:
+			break
+		split_dirs.extend(next_level)
+		level = next_level
+
+	def rmtree_worker(sub_dir):
+		sub_stats = DeleteStats()
+		live_stats.append(sub_stats)
+		_rmtree_scandir(sub_dir, sub_stats, on_deleted, known_dirs)
+
+	if workers == 1:
+		for sub_dir in next_level:
+			rmtree_worker(sub_dir)
+	else:
+		with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+			for del_future in [pool.submit(rmtree_worker, sub_dir) for sub_dir in next_level]:
+				del_future.result()
+
+	for split_dir in reversed(split_dirs):
+		os.rmdir(split_dir)
+		main_stats.dirs += 1
+		if on_deleted is not None:
+			on_deleted(split_dir, True, 0)
+
+	if del_top is True:
+		os.rmdir(dir_path)
+		main_stats.dirs += 1
+		if on_deleted is not None:
+			on_deleted(dir_path, True, 0)
+
+	return DeleteStats.total(live_stats)
+
+# File names/globs of operating system metadata files that are safe to delete.
+JUNK_PATTERNS = ('.DS_Store', '._*', 'Thumbs.db', 'desktop.ini')
+
+class SweepResult:
+	"""This class holds the paths a junk sweep deleted (or would delete) and their total size in bytes."""
+
+	def __init__(self):
+		self.paths = []
+		self.bytes = 0
+
+	def __repr__(self):
+		return f'SweepResult({len(self.paths)} paths, bytes={self.bytes})'
+
+def _name_matcher(patterns):
+	"""Returns a function that checks a file name against every pattern at once.
+	Exact names are a set lookup and all the globs are combined into a single regex."""
+
+	exact_names = set()
+	glob_regexes = []
+	for pattern in patterns:
+		if any(char in pattern for char in '*?['):
+			glob_regexes.append(fnmatch.translate(pattern))
+		else:
+			exact_names.add(pattern)
+
+	if glob_regexes == []:
+		return exact_names.__contains__
+	glob_match = re.compile('|'.join(glob_regexes)).match
+
+	def is_match(name):
+		return name in exact_names or glob_match(name) is not None
+	return is_match
+
+def _sweep_dir(sweep_dir, is_junk, emit, stop=None):
+	"""Walk sweep_dir once with os.scandir and emit (path, size) for every file is_junk matches.\n
+	Nothing is deleted here, the files are deleted as they're taken from the stream so a sweep that's
+	stopped early never deletes a file it didn't report. Once the stop event is set the walk ends."""
+
+	dir_stack = [sweep_dir]
+	while dir_stack:
+		if stop is not None and stop.is_set():
+			return
+		cur_dir = dir_stack.pop()
+		try:
+			with os.scandir(cur_dir) as dir_entries:
+				for entry in dir_entries:
+					if entry.is_dir(follow_symlinks=False):
+						dir_stack.append(entry.path)
+					elif is_junk(entry.name):
+						try:
+							size = _entry_stat(entry, follow_symlinks=False).st_size
+						except FileNotFoundError:
+							# Something else already deleted it.
+							continue
+						emit((entry.path, size))
+		except FileNotFoundError:
+			# The folder was removed while it was being swept.
+			continue
+
+class _StopStream(Exception):
+	pass
+
+def _stream_from_workers(work_func, work_items, workers):
+	"""This generator runs work_func(item, emit, stop) for every item in work_items on up to workers threads
+	and yields whatever the workers pass to emit as soon as it arrives.\n
+	If the generator is closed early the stop event is set, so the workers stop at their next emit
+	(or sooner if they check stop), and the items that haven't started are cancelled."""
+
+	out_queue = queue.Queue()
+	stop = threading.Event()
+	# Put on the queue when a work item is finished.
+	item_done = object()
+
+	def emit(out_item):
+		if stop.is_set():
+			raise _StopStream()
+		out_queue.put(out_item)
+
+	def run_item(work_item):
+		try:
+			work_func(work_item, emit, stop)
+		except _StopStream:
+			pass
+		finally:
+			out_queue.put(item_done)
+
+	pool = futures.ThreadPoolExecutor(max_workers=workers)
+	try:
+		work_futures = [pool.submit(run_item, work_item) for work_item in work_items]
+		remaining = len(work_futures)
+		while remaining > 0:
+			out_item = out_queue.get()
+			if out_item is item_done:
+				remaining -= 1
+			else:
+				yield out_item
+		# Raise any error a worker hit.
+		for work_future in work_futures:
+			work_future.result()
+	finally:
+		stop.set()
+		pool.shutdown(wait=True, cancel_futures=True)
+
+# How much data is copied per system call (and between progress reports).
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+# Linux ioctl request to reflink a whole file (supported by btrfs, XFS and others).
+_FICLONE = 0x40049409
+# Errors that mean a kernel copy method isn't supported for these files, so the next method should be tried.
+_COPY_UNSUPPORTED_ERRNOS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF,
+                            errno.ETXTBSY, errno.EPERM}
+
+class _CopyUnsupported(Exception):
+	"""Raised by a kernel copy method that can't be used, offset is how far it got."""
+
+	def __init__(self, offset):
+		super().__init__(offset)
+		self.offset = offset
+
+def _copy_function(resume=False, progress=None):
+	"""Returns the function used to copy each file (for shutil.copytree's copy_function too)."""
+
+	if resume is False and progress is None:
+		return _copy_file
+
+	def copy_function(src, dst):
+		return _copy_file(src, dst, resume=resume, progress=progress)
+	return copy_function
+
+def _copy_file(src, dst, resume=False, progress=None, hasher=None, exclusive=False):
+	"""Copy the file src to dst and its metadata (like shutil.copy2).\n
+	The data is copied by the fastest method available: a reflink, os.copy_file_range, os.sendfile
+	and lastly large buffered chunks.\n
+	If resume is True the data goes to "dst.part" which is renamed to dst once it's complete,
+	so if an earlier copy was interrupted it continues from the end of the existing "dst.part".
+	The size and modification time of the source it was copied from are kept in "dst.part.src",
+	if the source changed since then the part file is from another version of it so the copy starts over.
+	Otherwise a copy that stops part way (like when it's cancelled from progress) deletes dst.\n
+	progress is called with (src, copied_bytes, total_bytes) after each chunk.\n
+	If hasher (a hashlib object) is set then the data is always copied in buffered chunks that are hashed as they're
+	read, since the kernel copy methods never pass the data through Python.\n
+	If exclusive is True (and resume is False) dst is created with O_EXCL, so FileExistsError is raised instead of
+	overwriting a file that's already there (even one whose name only differs by case on a case-insensitive volume)."""
+
+	src = os.fspath(src)
+	dst = os.fspath(dst)
+	if resume is True:
+		part_path = dst + '.part'
+	else:
+		part_path = dst
+
+	with open(src, 'rb') as src_file:
+		src_stat = _fstat(src_file.fileno())
+		total = src_stat.st_size
+		offset = 0
+		if resume is True:
+			src_id_path = part_path + '.src'
+			src_id = f'{total} {src_stat.st_mtime_ns}'
+			try:
+				offset = _stat(part_path).st_size
+			except FileNotFoundError:
+				# A file the interrupted copy already finished (it has the source's size and time) is kept,
+				# 	unless it has to be hashed.
+				try:
+					dst_stat = _stat(dst)
+				except FileNotFoundError:
+					dst_stat = None
+				if hasher is None and dst_stat is not None and dst_stat.st_size == total and \
+				   dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+					return dst
+			else:
+				try:
+					with open(src_id_path, encoding='utf-8') as src_id_file:
+						part_src_id = src_id_file.read()
+				except FileNotFoundError:
+					part_src_id = None
+				# A part file of another version of the source (or of an unknown one) can't be continued.
+				if part_src_id != src_id:
+					offset = 0
+			# A part file that's bigger than the source can't be from this copy, so start over.
+			if offset > total:
+				offset = 0
+			if offset == 0:
+				# Written before any data so a part file never has data from a source that doesn't match it.
+				with open(src_id_path, 'w', encoding='utf-8') as src_id_file:
+					src_id_file.write(src_id)
+
+		if offset > 0:
+			dst_mode = 'r+b'
+		elif exclusive is True and resume is False:
+			dst_mode = 'xb'
+		else:
+			dst_mode = 'wb'
+		with open(part_path, dst_mode) as dst_file:
+			try:
+				offset = _copy_fds(src, src_file.fileno(), dst_file.fileno(), offset, total, progress, hasher)
+			except BaseException:
+				# Without resume the data goes straight to dst, so a partial copy would look like a finished one.
+				if resume is False:
+					dst_file.close()
+					os.unlink(part_path)
+				raise
+			# Cut off anything left over from an older (bigger) file.
+			dst_file.truncate(offset)
+
+	_copystat(src, part_path)
+	if resume is True:
+		os.replace(part_path, dst)
+		os.unlink(src_id_path)
+	instrumentation.count('files_copied')
+	instrumentation.count('bytes_copied', offset)
+	return dst
+
+def _copy_fds(src, src_fd, dst_fd, offset, total, progress, hasher=None):
+	"""Copy src_fd to dst_fd from offset up to total by the fastest method that works, returns the new offset."""
+
+	if hasher is not None:
+		# The part that was copied before has to be hashed too.
+		_hash_fd_range(src_fd, offset, hasher)
+		offset = _copy_chunks(src, src_fd, dst_fd, offset, total, progress, hasher)
+	elif offset == 0 and total > 0 and _reflink(src_fd, dst_fd) is True:
+		offset = total
+		if progress is not None:
+			progress(src, offset, total)
+	for copy_method in (_copy_file_range, _sendfile, _copy_chunks):
+		if offset >= total:
+			break
+		try:
+			offset = copy_method(src, src_fd, dst_fd, offset, total, progress)
+		except _CopyUnsupported as err:
+			offset = err.offset
+	return offset
+
+def _remove_partial_copy(out_path):
+	"""Delete what a copy to out_path (a file or folder) wrote before it stopped."""
+
+	try:
+		if stat.S_ISDIR(_lstat(out_path).st_mode):
+			_rmtree_scandir(os.fspath(out_path), DeleteStats())
+		else:
+			os.unlink(out_path)
+	except FileNotFoundError:
+		pass
+
+def _reflink(src_fd, dst_fd):
+	"""Try to make dst share src's data blocks (copy-on-write), returns True if it worked."""
+
+	if not sys.platform.startswith('linux'):
+		return False
+	import fcntl
+	try:
+		fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+	except OSError:
+		return False
+	return True
+
+def _copy_file_range(src, src_fd, dst_fd, offset, total, progress):
+	if hasattr(os, 'copy_file_range') is False:
+		raise _CopyUnsupported(offset)
+	while offset < total:
+		try:
+			copied = os.copy_file_range(src_fd, dst_fd, min(COPY_CHUNK_SIZE, total - offset), offset, offset)
+		except OSError as err:
+			if err.errno in _COPY_UNSUPPORTED_ERRNOS:
+				raise _CopyUnsupported(offset)
+			raise
+		if copied == 0:
+			# The source got shorter while it was being copied.
+			break
+		offset += copied
+		if progress is not None:
+			progress(src, offset, total)
+	return offset
+
+def _sendfile(src, src_fd, dst_fd, offset, total, progress):
+	# Only Linux can sendfile to a regular file.
+	if not sys.platform.startswith('linux'):
+		raise _CopyUnsupported(offset)
+	os.lseek(dst_fd, offset, os.SEEK_SET)
+	while offset < total:
+		try:
+			copied = os.sendfile(dst_fd, src_fd, offset, min(COPY_CHUNK_SIZE, total - offset))
+		except OSError as err:
+			if err.errno in _COPY_UNSUPPORTED_ERRNOS:
+				raise _CopyUnsupported(offset)
+			raise
+		if copied == 0:
+			break
+		offset += copied
+		if progress is not None:
+			progress(src, offset, total)
+	return offset
+
+def _copy_chunks(src, src_fd, dst_fd, offset, total, progress, hasher=None):
+	os.lseek(src_fd, offset, os.SEEK_SET)
+	os.lseek(dst_fd, offset, os.SEEK_SET)
+	buffer = bytearray(min(COPY_CHUNK_SIZE, max(total - offset, 1)))
+	buffer_view = memoryview(buffer)
+	with open(src_fd, 'rb', buffering=0, closefd=False) as src_file:
+		while offset < total:
+			read_size = src_file.readinto(buffer_view)
+			if read_size == 0:
+				break
+			if hasher is not None:
+				hasher.update(buffer_view[:read_size])
+			written = 0
+			while written < read_size:
+				written += os.write(dst_fd, buffer_view[written:read_size])
+			offset += read_size
+			if progress is not None:
+				progress(src, offset, total)
+	return offset
+
+def _hash_fd_range(in_fd, length, hasher):
+	"""Pass the first length bytes of the open file in_fd to hasher."""
+
+	os.lseek(in_fd, 0, os.SEEK_SET)
+	buffer_view = memoryview(bytearray(min(COPY_CHUNK_SIZE, max(length, 1))))
+	with open(in_fd, 'rb', buffering=0, closefd=False) as in_file:
+		while length > 0:
+			read_size = in_file.readinto(buffer_view[:min(length, len(buffer_view))])
+			if read_size == 0:
+				break
+			hasher.update(buffer_view[:read_size])
+			length -= read_size
+
+class SyncResult:
+	"""This class counts what a sync did."""
+
+	def __init__(self):
+		# Files that didn't exist in the destination yet.
+		self.copied = 0
+		# Files that were different in the destination and got copied again.
+		self.updated = 0
+		# Files that were already the same.
+		self.skipped = 0
+		# Files/folders in the destination that aren't in the source and were deleted.
+		self.pruned = 0
+		# Bytes copied.
+		self.bytes = 0
+		# Source files that couldn't be read (like symlinks to something that doesn't exist), as error messages.
+		self.errors = []
+
+	def __repr__(self):
+		return (f'SyncResult(copied={self.copied}, updated={self.updated}, skipped={self.skipped}, '
+		        f'pruned={self.pruned}, bytes={self.bytes}, errors={len(self.errors)})')
+
+def _hash_file(file_path, algorithm='sha256'):
+	"""Returns the hex digest of the file's contents."""
+
+	file_hash = hashlib.new(algorithm)
+	buffer = bytearray(COPY_CHUNK_SIZE)
+	buffer_view = memoryview(buffer)
+	with open(file_path, 'rb', buffering=0) as in_file:
+		while True:
+			read_size = in_file.readinto(buffer_view)
+			if read_size == 0:
+				break
+			file_hash.update(buffer_view[:read_size])
+	return file_hash.hexdigest()
+
+def _hash_text(text):
+	return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).digest()
+
+def _load_sync_manifest(manifest_path, src_root, dst_root):
+	"""Returns the folders recorded by the last sync from src_root to dst_root, or {} if there isn't a usable one."""
+
+	try:
+		with open(manifest_path, encoding='utf-8') as manifest_file:
+			manifest = json.load(manifest_file)
+	except (FileNotFoundError, ValueError):
+		return {}
+	if manifest.get('src') != os.fspath(src_root) or manifest.get('dst') != os.fspath(dst_root):
+		return {}
+	return manifest.get('dirs', {})
+
+def _save_json(out_path, out_value):
+	"""Write out_value as JSON to a temporary file first so an interrupted save can't leave a broken file."""
+
+	tmp_path = os.fspath(out_path) + '.tmp'
+	with open(tmp_path, 'w', encoding='utf-8') as out_file:
+		json.dump(out_value, out_file, separators=(',', ':'))
+	os.replace(tmp_path, out_path)
+
+def _scan_dirs(root, rel_dirs, workers=8, recursive=True):
+	"""Scan the folders rel_dirs of root (and all of their sub-folders if recursive is True) on up to workers threads,
+	a thread scans each folder while the folders it finds are queued for the other threads.\n
+	Returns {relative folder path: TreeIndex record}, folders that were removed during the scan are left out."""
+
+	def scan_worker(rel_dir):
+		dir_path = os.path.join(root, *rel_dir.split('/'))
+		dir_stat = _stat(dir_path)
+		files = {}
+		sub_dirs = []
+		links = []
+		with os.scandir(dir_path) as dir_entries:
+			for entry in dir_entries:
+				try:
+					# Symlinked folders (and junctions) are recorded as links rather than followed.
+					if entry.is_dir(follow_symlinks=False) and _is_junction(entry) is False:
+						sub_dirs.append(entry.name)
+						continue
+					entry_stat = _entry_stat(entry, follow_symlinks=False)
+				except FileNotFoundError:
+					continue
+				if entry.is_symlink() or stat.S_ISDIR(entry_stat.st_mode):
+					links.append(entry.name)
+				files[entry.name] = [entry_stat.st_size, entry_stat.st_mtime_ns, entry_stat.st_ino]
+		return rel_dir, {'mtime_ns': dir_stat.st_mtime_ns, 'ino': dir_stat.st_ino, 'dev': dir_stat.st_dev,
+		                 'files': files, 'dirs': sub_dirs, 'links': links}
+
+	records = {}
+	with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+		pending = {pool.submit(scan_worker, rel_dir) for rel_dir in rel_dirs}
+		while pending:
+			done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+			for scan_future in done:
+				try:
+					rel_dir, record = scan_future.result()
+				except (FileNotFoundError, NotADirectoryError):
+					continue
+				records[rel_dir] = record
+				if recursive is True:
+					for sub_dir_name in record['dirs']:
+						pending.add(pool.submit(scan_worker, rel_dir + '/' + sub_dir_name if rel_dir != '' else sub_dir_name))
+
+	return records
+
+class TreeIndex:
+	"""This class is an index of a folder tree made by Paths.scan, so its size, file counts and modification times
+	can be looked up (and passed to the delete, copy_to_new_dir and sync_dir methods) without scanning it again.\n
+	dirs maps every folder (relative to root with "/", the root itself is "") to a record of
+	{'mtime_ns', 'ino', 'dev', 'files': {name: [size, mtime_ns, ino]}, 'dirs': [sub-folder names], 'links': [names]},
+	links are the files in files that are symlinks (or symlinked folders) and weren't followed."""
+
+	def __init__(self, root, dirs=None):
+		self.root = os.fspath(root)
+		if dirs is None:
+			dirs = {}
+		self.dirs = dirs
+
+	def __repr__(self):
+		file_count, dir_count, total_bytes = self.totals()
+		return f'TreeIndex("{self.root}", files={file_count}, dirs={dir_count}, bytes={total_bytes})'
+
+	def rel_dir(self, dir_path):
+		"""Returns dir_path relative to the root (with "/"), or None if it isn't in the root."""
+
+		rel_path = os.path.relpath(os.fspath(dir_path), self.root)
+		if rel_path == '.':
+			return ''
+		if rel_path == '..' or rel_path.startswith('..' + os.sep) or os.path.isabs(rel_path):
+			return None
+		return rel_path.replace(os.sep, '/')
+
+	def record(self, dir_path):
+		"""Returns the record of the folder dir_path, or None if it isn't in the index."""
+
+		rel_dir = self.rel_dir(dir_path)
+		if rel_dir is None:
+			return None
+		return self.dirs.get(rel_dir)
+
+	def totals(self, dir_path=None, files=True, sub_dirs=True):
+		"""Returns (files, folders, bytes) of everything in dir_path (the root by default), the folder itself
+		isn't counted.\n
+		If files is False then the files directly in dir_path are left out, and if sub_dirs is False
+		then its sub-folders (and everything in them) are.\n
+		Returns None if dir_path isn't in the index."""
+
+		rel_dir = '' if dir_path is None else self.rel_dir(dir_path)
+		if rel_dir is None or rel_dir not in self.dirs:
+			return None
+
+		file_count = 0
+		dir_count = 0
+		total_bytes = 0
+		if files is True:
+			top_files = self.dirs[rel_dir]['files']
+			file_count += len(top_files)
+			total_bytes += sum(file_record[0] for file_record in top_files.values())
+		if sub_dirs is True:
+			prefix = rel_dir + '/' if rel_dir != '' else ''
+			for cur_rel_dir, dir_record in self.dirs.items():
+				if cur_rel_dir.startswith(prefix) and cur_rel_dir != rel_dir:
+					dir_count += 1
+					file_count += len(dir_record['files'])
+					total_bytes += sum(file_record[0] for file_record in dir_record['files'].values())
+		return file_count, dir_count, total_bytes
+
+	def fresh_bytes(self, dir_path, files=True, sub_dirs=True, workers=8):
+		"""Returns (set of folder paths, bytes) of the folders in dir_path (picked like the totals method does)
+		whose modification time and inode still match the index, and the bytes of the files in them.
+		The folder paths are joined onto dir_path.\n
+		A folder that changed since it was indexed isn't in the set, so the files in it have to be stat'ed instead.
+		Returns (an empty set, 0) if dir_path isn't in the index."""
+
+		rel_dir = self.rel_dir(dir_path)
+		if rel_dir is None or rel_dir not in self.dirs:
+			return set(), 0
+		dir_path = os.fspath(dir_path)
+		prefix = rel_dir + '/' if rel_dir != '' else ''
+		check_dirs = []
+		if files is True:
+			check_dirs.append(rel_dir)
+		if sub_dirs is True:
+			check_dirs += [cur_rel_dir for cur_rel_dir in self.dirs if cur_rel_dir.startswith(prefix) and cur_rel_dir != rel_dir]
+
+		def check_worker(cur_rel_dir):
+			if cur_rel_dir == rel_dir:
+				cur_path = dir_path
+			else:
+				cur_path = os.path.join(dir_path, *cur_rel_dir[len(prefix):].split('/'))
+			try:
+				dir_stat = _stat(cur_path)
+			except (FileNotFoundError, NotADirectoryError):
+				return cur_path, None
+			dir_record = self.dirs[cur_rel_dir]
+			if (dir_stat.st_mtime_ns, dir_stat.st_ino) != (dir_record['mtime_ns'], dir_record['ino']):
+				return cur_path, None
+			return cur_path, sum(file_record[0] for file_record in dir_record['files'].values())
+
+		fresh_dirs = set()
+		total_bytes = 0
+		with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+			for cur_path, dir_bytes in pool.map(check_worker, check_dirs):
+				if dir_bytes is not None:
+					fresh_dirs.add(cur_path)
+					total_bytes += dir_bytes
+		return fresh_dirs, total_bytes
+
+	def refresh(self, workers=8):
+		"""This method re-scans only the folders whose modification time (or inode) changed since they were indexed
+		and the new folders in them, and drops the folders that were removed.\n
+		A file that's edited in place doesn't change its folder's modification time, so its size isn't updated.\n
+		Returns the number of folders that were re-scanned."""
+
+		def check_worker(rel_dir):
+			try:
+				dir_stat = _stat(os.path.join(self.root, *rel_dir.split('/')))
+			except (FileNotFoundError, NotADirectoryError):
+				return rel_dir, None
+			return rel_dir, (dir_stat.st_mtime_ns, dir_stat.st_ino)
+
+		changed_dirs = []
+		with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+			for rel_dir, dir_state in pool.map(check_worker, list(self.dirs)):
+				if dir_state is None:
+					self._drop(rel_dir)
+				elif rel_dir in self.dirs and dir_state != (self.dirs[rel_dir]['mtime_ns'], self.dirs[rel_dir]['ino']):
+					changed_dirs.append(rel_dir)
+
+		new_dirs = []
+		for rel_dir, record in _scan_dirs(self.root, changed_dirs, workers, recursive=False).items():
+			old_record = self.dirs.get(rel_dir)
+			old_sub_dirs = set(old_record['dirs']) if old_record is not None else set()
+			for sub_dir_name in old_sub_dirs.difference(record['dirs']):
+				self._drop(rel_dir + '/' + sub_dir_name if rel_dir != '' else sub_dir_name)
+			for sub_dir_name in record['dirs']:
+				if sub_dir_name not in old_sub_dirs:
+					new_dirs.append(rel_dir + '/' + sub_dir_name if rel_dir != '' else sub_dir_name)
+			self.dirs[rel_dir] = record
+		self.dirs.update(_scan_dirs(self.root, new_dirs, workers))
+		return len(changed_dirs) + len(new_dirs)
+
+	def _drop(self, rel_dir):
+		"""This method removes the folder rel_dir and everything in it from the index."""
+
+		self.dirs.pop(rel_dir, None)
+		prefix = rel_dir + '/'
+		for cur_rel_dir in [cur_rel_dir for cur_rel_dir in self.dirs if cur_rel_dir.startswith(prefix)]:
+			del self.dirs[cur_rel_dir]
+
+	def save(self, out_path):
+		"""This method writes the index to the JSON file out_path."""
+
+		_save_json(out_path, {'root': self.root, 'dirs': self.dirs})
+
+	@classmethod
+	def load(cls, in_path, root=None):
+		"""Returns the TreeIndex saved at in_path, or None if there isn't a usable one (or it's of another root)."""
+
+		try:
+			with open(in_path, encoding='utf-8') as in_file:
+				saved_index = json.load(in_file)
+		except (FileNotFoundError, ValueError):
+			return None
+		if type(saved_index) is not dict or 'dirs' not in saved_index or \
+		   root is not None and saved_index.get('root') != os.fspath(root):
+			return None
+		return cls(saved_index['root'], saved_index['dirs'])
+
+def _sync_tree(src_root, dst_root, use_hash=False, prune=False, manifest_dirs=None, workers=8, progress=None,
+               src_index=None):
+	"""Make dst_root match src_root by only copying files that are new or changed.\n
+	Files are compared by size and modification time, or by size and a hash of their contents if use_hash is True.\n
+	manifest_dirs is what the last sync recorded for each folder. A source folder whose modification time
+	hasn't changed since then is trusted to still have the same files, so only the files whose size or modification
+	time changed since (edited in place) are compared with the destination.\n
+	Source files that can't be stat'ed (like broken symlinks) are skipped and recorded in the SyncResult errors.\n
+	src_index can be a TreeIndex of src_root, the source folders whose modification time still matches it
+	take their file and sub-folder names from it instead of being scanned. Every file is still stat'ed, since a file
+	edited in place doesn't change its folder's modification time.\n
+	Returns (SyncResult, manifest dirs for the next sync)."""
+
+	if manifest_dirs is None:
+		manifest_dirs = {}
+	sync_result = SyncResult()
+	new_manifest_dirs = {}
+	# Folders that had to be created, their metadata is copied once the files in them are done.
+	created_dirs = []
+	copy_futures = []
+
+	def copy_worker(src_path, dst_path, size, is_update):
+		_copy_file(src_path, dst_path, progress=progress)
+		return size, is_update
+
+	def compare_worker(src_path, dst_path, size):
+		# Only copy when the contents actually differ.
+		if _hash_file(src_path) == _hash_file(dst_path):
+			return 0, None
+		_copy_file(src_path, dst_path, progress=progress)
+		return size, True
+
+	with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+		# Relative folder paths are stored with "/" so manifests work on every platform.
+		dir_stack = ['']
+		while dir_stack:
+			rel_dir = dir_stack.pop()
+			src_dir = os.path.join(src_root, *rel_dir.split('/'))
+			dst_dir = os.path.join(dst_root, *rel_dir.split('/'))
+			src_dir_mtime = _stat(src_dir).st_mtime_ns
+
+			src_files = {}
+			src_sub_dirs = []
+			# Source files that can't be stat'ed, they're neither copied nor pruned.
+			broken_names = set()
+			index_record = src_index.record(src_dir) if src_index is not None else None
+			# The index doesn't follow symlinks, so folders with any are scanned.
+			if index_record is not None and index_record['mtime_ns'] == src_dir_mtime and index_record['links'] == []:
+				for file_name in index_record['files']:
+					try:
+						src_stat = _stat(os.path.join(src_dir, file_name))
+					except OSError as err:
+						sync_result.errors.append(f'"{os.path.join(src_dir, file_name)}" can not be read: {err}')
+						broken_names.add(file_name)
+						continue
+					src_files[file_name] = [src_stat.st_size, src_stat.st_mtime_ns]
+				src_sub_dirs.extend(index_record['dirs'])
+			else:
+				with os.scandir(src_dir) as dir_entries:
+					for entry in dir_entries:
+						# Symlinked folders aren't followed so a link loop can't make the sync run forever.
+						if entry.is_dir(follow_symlinks=False):
+							src_sub_dirs.append(entry.name)
+						elif entry.is_dir() is False:
+							try:
+								src_stat = _entry_stat(entry)
+							except OSError as err:
+								# Like a symlink to something that doesn't exist.
+								sync_result.errors.append(f'"{entry.path}" can not be read: {err}')
+								broken_names.add(entry.name)
+								continue
+							src_files[entry.name] = [src_stat.st_size, src_stat.st_mtime_ns]
+			new_manifest_dirs[rel_dir] = {'mtime_ns': src_dir_mtime, 'files': src_files, 'dirs': src_sub_dirs}
+
+			old_record = manifest_dirs.get(rel_dir)
+			if old_record is not None and old_record['mtime_ns'] == src_dir_mtime and _is_dir(dst_dir):
+				# Nothing was added, removed or renamed in this folder since the last sync, so only the files whose
+				# 	size or modification time changed (edited in place) are compared with the destination.
+				sync_files = {file_name: file_record for file_name, file_record in src_files.items()
+				              if old_record['files'].get(file_name) != file_record}
+				sync_result.skipped += len(src_files) - len(sync_files)
+				if sync_files == {}:
+					for sub_dir_name in src_sub_dirs:
+						dir_stack.append(rel_dir + '/' + sub_dir_name if rel_dir != '' else sub_dir_name)
+					continue
+			else:
+				sync_files = src_files
+
+			dst_entries = {}
+			try:
+				with os.scandir(dst_dir) as dir_entries:
+					for entry in dir_entries:
+						dst_entries[entry.name] = entry
+			except FileNotFoundError:
+				os.mkdir(dst_dir)
+				created_dirs.append((src_dir, dst_dir))
+
+			for file_name, (size, mtime_ns) in sync_files.items():
+				src_path = os.path.join(src_dir, file_name)
+				dst_path = os.path.join(dst_dir, file_name)
+				dst_entry = dst_entries.get(file_name)
+				if dst_entry is None:
+					copy_futures.append(pool.submit(copy_worker, src_path, dst_path, size, False))
+					continue
+				if dst_entry.is_dir(follow_symlinks=False):
+					# A folder in the destination is in the way of a file.
+					_rmtree_scandir(dst_entry.path, DeleteStats())
+					copy_futures.append(pool.submit(copy_worker, src_path, dst_path, size, True))
+					continue
+				dst_stat = _entry_stat(dst_entry)
+				if dst_stat.st_size != size:
+					copy_futures.append(pool.submit(copy_worker, src_path, dst_path, size, True))
+				elif use_hash is True:
+					copy_futures.append(pool.submit(compare_worker, src_path, dst_path, size))
+				elif dst_stat.st_mtime_ns != mtime_ns:
+					copy_futures.append(pool.submit(copy_worker, src_path, dst_path, size, True))
+				else:
+					sync_result.skipped += 1
+
+			for sub_dir_name in src_sub_dirs:
+				dst_entry = dst_entries.get(sub_dir_name)
+				if dst_entry is not None and dst_entry.is_dir(follow_symlinks=False) is False:
+					# A file in the destination is in the way of a folder.
+					os.unlink(dst_entry.path)
+				dir_stack.append(rel_dir + '/' + sub_dir_name if rel_dir != '' else sub_dir_name)
+
+			if prune is True:
+				for dst_name, dst_entry in dst_entries.items():
+					if dst_name in src_files or dst_name in src_sub_dirs or dst_name in broken_names:
+						continue
+					if dst_entry.is_dir(follow_symlinks=False):
+						_rmtree_scandir(dst_entry.path, DeleteStats())
+					else:
+						os.unlink(dst_entry.path)
+					sync_result.pruned += 1
+
+		for copy_future in copy_futures:
+			size, is_update = copy_future.result()
+			if is_update is None:
+				sync_result.skipped += 1
+			elif is_update is True:
+				sync_result.updated += 1
+				sync_result.bytes += size
+			else:
+				sync_result.copied += 1
+				sync_result.bytes += size
+
+	# Deepest folders first so copying a folder's metadata isn't undone by changes inside it.
+	for src_dir, dst_dir in reversed(created_dirs):
+		_copystat(src_dir, dst_dir)
+
+	return sync_result, new_manifest_dirs
+
+class VerifyResult:
+	"""This class holds what verify_manifest found, it's truthy only if every file matched."""
+
+	def __init__(self):
+		self.matched = 0
+		# Files whose size or digest is different from the manifest.
+		self.mismatched = []
+		# Files in the manifest that don't exist.
+		self.missing = []
+		# Bytes that were hashed.
+		self.bytes = 0
+
+	def __bool__(self):
+		return self.mismatched == [] and self.missing == []
+
+	def __repr__(self):
+		return (f'VerifyResult(matched={self.matched}, mismatched={len(self.mismatched)}, '
+		        f'missing={len(self.missing)}, bytes={self.bytes})')
+
+def _load_copy_manifest(manifest_path, dst):
+	"""Returns the files recorded by the last verified copy to dst, or {} if there isn't a usable manifest."""
+
+	try:
+		with open(manifest_path, encoding='utf-8') as manifest_file:
+			manifest = json.load(manifest_file)
+	except (FileNotFoundError, ValueError):
+		return {}
+	if manifest.get('dst') != os.fspath(dst):
+		return {}
+	return manifest.get('files', {})
+
+def _copy_tree(src, dst, manifest_path=None, workers=8, resume=False, progress=None, algorithm='sha256', index=None):
+	"""Copy the file/folder src to dst on up to workers threads.\n
+	If manifest_path is set then every file is hashed in the same read pass as it's copied,
+	then a manifest of {relative path: [size, mtime_ns, digest]} is written to manifest_path.
+	The paths are relative to the folder dst is in (with "/") so the manifest can be checked with _verify_files.\n
+	If manifest_path already has a manifest of a copy to dst then the files whose source and copy both still have
+	the recorded size and modification time aren't copied again (their recorded digest is kept).\n
+	index can be a TreeIndex of src, the source folders whose modification time still matches it take their file
+	and sub-folder names from it instead of being scanned (every file is still stat'ed, in case it was edited in place).\n
+	Like a sync, symlinked folders (and symlinks to nothing) are skipped. Returns the number of files that were skipped."""
+
+	src = os.fspath(src)
+	dst = os.fspath(dst)
+	old_files = {}
+	if manifest_path is not None:
+		old_files = _load_copy_manifest(manifest_path, dst)
+	dst_name = os.path.basename(dst)
+
+	# (src file, dst file, relative path, size, mtime_ns) for every file.
+	file_jobs = []
+	dir_pairs = []
+	src_stat = _stat(src)
+	if stat.S_ISDIR(src_stat.st_mode):
+		dir_stack = [(src, dst, dst_name)]
+		while dir_stack:
+			src_dir, dst_dir, rel_dir = dir_stack.pop()
+			os.makedirs(dst_dir, exist_ok=True)
+			dir_pairs.append((src_dir, dst_dir))
+			index_record = index.record(src_dir) if index is not None else None
+			# The index doesn't follow symlinks, so folders with any are scanned.
+			if index_record is not None and index_record['links'] == [] and \
+			   index_record['mtime_ns'] == _stat(src_dir).st_mtime_ns:
+				for file_name in index_record['files']:
+					src_path = os.path.join(src_dir, file_name)
+					try:
+						file_stat = _stat(src_path)
+					except FileNotFoundError:
+						continue
+					file_jobs.append((src_path, os.path.join(dst_dir, file_name), rel_dir + '/' + file_name,
+					                  file_stat.st_size, file_stat.st_mtime_ns))
+				for sub_dir_name in index_record['dirs']:
+					dir_stack.append((os.path.join(src_dir, sub_dir_name), os.path.join(dst_dir, sub_dir_name),
+					                  rel_dir + '/' + sub_dir_name))
+				continue
+			with os.scandir(src_dir) as dir_entries:
+				for entry in dir_entries:
+					if entry.is_dir(follow_symlinks=False):
+						dir_stack.append((entry.path, os.path.join(dst_dir, entry.name), rel_dir + '/' + entry.name))
+					elif entry.is_dir() is False:
+						try:
+							entry_stat = _entry_stat(entry)
+						except FileNotFoundError:
+							# A symlink to something that doesn't exist has nothing to copy.
+							continue
+						file_jobs.append((entry.path, os.path.join(dst_dir, entry.name), rel_dir + '/' + entry.name,
+						                  entry_stat.st_size, entry_stat.st_mtime_ns))
+	else:
+		file_jobs.append((src, dst, dst_name, src_stat.st_size, src_stat.st_mtime_ns))
+
+	def copy_worker(file_job):
+		src_path, dst_path, rel_path, size, mtime_ns = file_job
+		old_record = old_files.get(rel_path)
+		if old_record is not None and old_record[0] == size and old_record[1] == mtime_ns:
+			try:
+				dst_stat = _stat(dst_path)
+			except FileNotFoundError:
+				dst_stat = None
+			if dst_stat is not None and dst_stat.st_size == size and dst_stat.st_mtime_ns == mtime_ns:
+				return rel_path, old_record, True
+		if manifest_path is None:
+			_copy_file(src_path, dst_path, resume=resume, progress=progress)
+			return rel_path, None, False
+		hasher = hashlib.new(algorithm)
+		_copy_file(src_path, dst_path, resume=resume, progress=progress, hasher=hasher)
+		return rel_path, [size, mtime_ns, hasher.hexdigest()], False
+
+	new_files = {}
+	skipped = 0
+	with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+		for rel_path, record, was_skipped in pool.map(copy_worker, file_jobs):
+			new_files[rel_path] = record
+			if was_skipped is True:
+				skipped += 1
+
+	# Deepest folders first so copying a folder's metadata isn't undone by changes inside it.
+	for src_dir, dst_dir in reversed(dir_pairs):
+		_copystat(src_dir, dst_dir)
+
+	if manifest_path is not None:
+		_save_json(manifest_path, {'algorithm': algorithm, 'src': src, 'dst': dst, 'files': new_files})
+	return skipped
+
+def _verify_files(root_dir, manifest_files, algorithm='sha256', workers=8):
+	"""Hash every file of manifest_files (relative to root_dir) on up to workers threads and returns a VerifyResult."""
+
+	def verify_worker(manifest_item):
+		rel_path, (size, mtime_ns, digest) = manifest_item
+		file_path = os.path.join(root_dir, *rel_path.split('/'))
+		try:
+			if _stat(file_path).st_size != size:
+				return file_path, False, 0
+			return file_path, _hash_file(file_path, algorithm) == digest, size
+		except FileNotFoundError:
+			return file_path, None, 0
+
+	verify_result = VerifyResult()
+	with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+		for file_path, is_match, hashed_bytes in pool.map(verify_worker, manifest_files.items()):
+			verify_result.bytes += hashed_bytes
+			if is_match is None:
+				verify_result.missing.append(paths.Path(file_path))
+			elif is_match is True:
+				verify_result.matched += 1
+			else:
+				verify_result.mismatched.append(paths.Path(file_path))
+	return verify_result
+
+def _is_cross_device(in_path, out_dir_path):
+	"""Returns True if in_path and the folder out_dir_path are on different filesystems (so a rename can't move it)."""
+
+	return _lstat(in_path).st_dev != _stat(out_dir_path).st_dev
+
+def _move_marker_path(dst):
+	dst_dir, dst_name = os.path.split(os.fspath(dst))
+	return os.path.join(dst_dir, f'.{dst_name}.moving')
+
+def _move_in_progress(src, dst):
+	"""Returns True if an interrupted _move_across_devices of src to dst left its marker file behind."""
+
+	return _load_move_marker(src, dst) is not None
+
+def _load_move_marker(src, dst):
+	"""Returns the marker an interrupted _move_across_devices of src to dst left behind, or None if there isn't one."""
+
+	try:
+		with open(_move_marker_path(dst), encoding='utf-8') as marker_file:
+			marker = json.load(marker_file)
+	except (OSError, ValueError):
+		return None
+	if type(marker) is not dict or marker.get('src') != os.fspath(src):
+		return None
+	return marker
+
+def _move_across_devices(src, dst, workers=8, verify='size', progress=None):
+	"""Move the file/folder src to dst on another filesystem by copying it, checking every copy and only then
+	deleting src.\n
+	The files are copied on up to workers threads with _copy_file(resume=True) and each copy is checked by its size,
+	or by a hash of both files if verify is "hash".\n
+	A marker file next to dst records the move and the size and modification time of every source file,
+	so running the same move again after a crash continues it: files that were already copied (same size and
+	modification time) are only checked and unfinished copies resume. A source file that changed since the
+	interrupted move has its unfinished copy discarded and its copy is checked by hash whatever verify is,
+	and a source file that changes while it's moved is an error, so src is never deleted for a copy that
+	doesn't match it.\n
+	progress is called with (src, moved_bytes, total_bytes) for the whole move.\n
+	Returns a list of error strings, src is only deleted if it's empty."""
+
+	src = os.fspath(src)
+	dst = os.fspath(dst)
+	marker_path = _move_marker_path(dst)
+	old_marker = _load_move_marker(src, dst)
+	# Source files as they were when the interrupted move copied them, {src file: [size, mtime_ns]}.
+	old_files = old_marker.get('files', {}) if old_marker is not None else None
+	# Kept until the new marker is written, in case this is interrupted before that too.
+	_save_json(marker_path, {'src': src, 'dst': dst, 'files': old_files or {}})
+
+	# (src file, dst file, size, mtime_ns) for every file to copy.
+	file_jobs = []
+	# Folders whose metadata is copied once the files in them are done.
+	dir_pairs = []
+	src_stat = _lstat(src)
+	if stat.S_ISDIR(src_stat.st_mode):
+		dir_stack = [(src, dst)]
+		while dir_stack:
+			src_dir, dst_dir = dir_stack.pop()
+			os.makedirs(dst_dir, exist_ok=True)
+			dir_pairs.append((src_dir, dst_dir))
+			with os.scandir(src_dir) as dir_entries:
+				for entry in dir_entries:
+					dst_path = os.path.join(dst_dir, entry.name)
+					# Symlinks are moved as links (like a rename would).
+					if entry.is_symlink():
+						if _lexists(dst_path) is False:
+							os.symlink(os.readlink(entry.path), dst_path)
+					elif entry.is_dir(follow_symlinks=False):
+						dir_stack.append((entry.path, dst_path))
+					else:
+						entry_stat = _entry_stat(entry, follow_symlinks=False)
+						file_jobs.append((entry.path, dst_path, entry_stat.st_size, entry_stat.st_mtime_ns))
+	elif stat.S_ISLNK(src_stat.st_mode):
+		if _lexists(dst) is False:
+			os.symlink(os.readlink(src), dst)
+	else:
+		file_jobs.append((src, dst, src_stat.st_size, src_stat.st_mtime_ns))
+
+	# Files this move already worked on whose source isn't the same as it was then (or isn't known).
+	changed_paths = set()
+	if old_files is not None:
+		changed_paths = {file_job[0] for file_job in file_jobs if old_files.get(file_job[0]) != [file_job[2], file_job[3]]}
+	_save_json(marker_path, {'src': src, 'dst': dst, 'files': {file_job[0]: [file_job[2], file_job[3]]
+	                                                           for file_job in file_jobs}})
+
+	total_bytes = sum(file_job[2] for file_job in file_jobs)
+	moved_bytes = 0
+	progress_lock = threading.Lock()
+
+	def add_progress(add_bytes):
+		nonlocal moved_bytes
+		with progress_lock:
+			moved_bytes += add_bytes
+			cur_bytes = moved_bytes
+		if progress is not None and add_bytes != 0:
+			progress(src, cur_bytes, total_bytes)
+
+	def move_worker(file_job):
+		src_path, dst_path, size, mtime_ns = file_job
+		src_changed = src_path in changed_paths
+		try:
+			if src_changed is True:
+				# The unfinished copy is of another version of the source.
+				for part_path in (dst_path + '.part', dst_path + '.part.src'):
+					try:
+						os.unlink(part_path)
+					except FileNotFoundError:
+						pass
+			try:
+				dst_stat = _stat(dst_path)
+			except FileNotFoundError:
+				dst_stat = None
+			if dst_stat is None or dst_stat.st_size != size or dst_stat.st_mtime_ns != mtime_ns:
+				file_offset = 0
+
+				def file_progress(progress_src, copied_bytes, file_total):
+					nonlocal file_offset
+					add_progress(copied_bytes - file_offset)
+					file_offset = copied_bytes
+				_copy_file(src_path, dst_path, resume=True, progress=file_progress)
+				add_progress(size - file_offset)
+			else:
+				# Copied before the last move was interrupted.
+				add_progress(size)
+
+			copied_size = _stat(dst_path).st_size
+			if copied_size != size:
+				os.unlink(dst_path)
+				return f'the copy of "{src_path}" is {copied_size} bytes instead of {size}'
+			src_now = _stat(src_path)
+			if src_now.st_size != size or src_now.st_mtime_ns != mtime_ns:
+				# The copy has the new modification time but maybe only some of the new data.
+				os.unlink(dst_path)
+				return f'"{src_path}" changed while it was moved'
+			if (verify == 'hash' or src_changed is True) and _hash_file(src_path) != _hash_file(dst_path):
+				os.unlink(dst_path)
+				return f'the copy of "{src_path}" has different contents'
+		except OSError as err:
+			return f'"{src_path}": {err}'
+		return None
+
+	with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+		move_errors = [move_err for move_err in pool.map(move_worker, file_jobs) if move_err is not None]
+	if move_errors != []:
+		return move_errors
+
+	# Deepest folders first so copying a folder's metadata isn't undone by changes inside it.
+	for src_dir, dst_dir in reversed(dir_pairs):
+		_copystat(src_dir, dst_dir)
+
+	# Every file was copied and checked so the source can go.
+	if stat.S_ISDIR(src_stat.st_mode):
+		del_stats = _delete_tree(src, workers, del_top=True)
+	else:
+		os.unlink(src)
+		del_stats = DeleteStats()
+		del_stats.files = 1
+		del_stats.bytes = src_stat.st_size
+	instrumentation.count('files_deleted', del_stats.files)
+	instrumentation.count('dirs_deleted', del_stats.dirs)
+	instrumentation.count('bytes_deleted', del_stats.bytes)
+	os.unlink(marker_path)
+	return []
+
+def _taken_by_other(path, owner_path):
+	"""Returns True if there's something at path that isn't owner_path.\n
+	On a case-insensitive volume that includes a name that only differs by case,
+	and a rename of owner_path that only changes the case of its name finds owner_path itself."""
+
+	try:
+		path_stat = _lstat(path)
+	except FileNotFoundError:
+		return False
+	owner_stat = _lstat(owner_path)
+	return (path_stat.st_dev, path_stat.st_ino) != (owner_stat.st_dev, owner_stat.st_ino)
+
+def _is_case_insensitive(dir_path):
+	"""Returns True if the folder dir_path is on a case-insensitive volume (it can be found by its name in another case)."""
+
+	dir_path = os.fspath(dir_path)
+	parent_dir, dir_name = os.path.split(dir_path)
+	swapped_path = os.path.join(parent_dir, dir_name.swapcase())
+	if swapped_path == dir_path:
+		# The name has no letters so it can't tell.
+		return False
+	try:
+		swapped_stat = _lstat(swapped_path)
+	except FileNotFoundError:
+		return False
+	dir_stat = _lstat(dir_path)
+	return (swapped_stat.st_dev, swapped_stat.st_ino) == (dir_stat.st_dev, dir_stat.st_ino)
+
+def _rename_or_move(src, dst):
+	"""Rename src to dst, or move it with _move_across_devices if dst is on another filesystem.\n
+	Raises FileExistsError if dst already exists, since os.rename would replace it
+	(on a case-insensitive volume that includes a name that only differs by case).\n
+	Returns a list of error strings."""
+
+	if _taken_by_other(dst, src):
+		raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), os.fspath(dst))
+	try:
+		os.rename(src, dst)
+	except OSError as err:
+		if err.errno != errno.EXDEV:
+			raise
+		return _move_across_devices(src, dst)
+	return []
+
+class _DateDirs:
+	"""This class makes the "YYYY/MM Month" folders in root_dir_path and remembers which ones exist,
+	so each folder is only checked (or created) once."""
+
+	def __init__(self, root_dir_path):
+		self.root_dir_path = root_dir_path
+		# (year, month) to the month folder, for every month folder that exists.
+		self.month_dirs = {}
+		self._year_dirs = set()
+
+	def make_dirs(self, year_months):
+		"""Make the month folders of year_months (an iterable of (year, month)) that weren't made yet,
+		returns the folders that had to be created."""
+
+		created_dirs = []
+		for year, month in sorted(set(year_months) - self.month_dirs.keys()):
+			month_date = dates.date(year, month, 1)
+			year_dir = self.root_dir_path.joinpath(month_date.strftime('%Y'))
+			month_dir = year_dir.joinpath(month_date.strftime('%m %B'))
+			for new_dir in (year_dir, month_dir):
+				if new_dir in self._year_dirs:
+					continue
+				try:
+					os.mkdir(new_dir)
+				except FileExistsError:
+					pass
+				else:
+					created_dirs.append(new_dir)
+			self._year_dirs.add(year_dir)
+			self.month_dirs[(year, month)] = month_dir
+		return created_dirs
+
+class SpawnClipboard:
+	"""This clipboard backend runs a command for every copy (with the text as its input) and paste (reading its output),
+	for example pbcopy/pbpaste, xclip, xsel or wl-copy/wl-paste.\n
+	change_cmd (or change_func) can be set to something cheap whose output changes whenever the clipboard does."""
+
+	def __init__(self, copy_cmd, paste_cmd, change_cmd=None, change_func=None):
+		self.copy_cmd = copy_cmd
+		self.paste_cmd = paste_cmd
+		self.change_cmd = change_cmd
+		self.change_func = change_func
+
+	def copy(self, new_clip_value):
+		instrumentation.count('subprocesses')
+		sub.run(self.copy_cmd, universal_newlines=True, input=new_clip_value, check=True)
+
+	def paste(self, max_size=None):
+		"""Returns the clipboard text. If max_size is set then reading stops one character past it,
+		so a longer value comes back cut off at max_size + 1 characters without the rest being read."""
+
+		instrumentation.count('subprocesses')
+		if max_size is None:
+			return sub.run(self.paste_cmd, universal_newlines=True, capture_output=True, check=True).stdout
+
+		killed = False
+		with sub.Popen(self.paste_cmd, universal_newlines=True, stdout=sub.PIPE, stderr=sub.DEVNULL) as paste_process:
+			clip_value = paste_process.stdout.read(max_size + 1)
+			if len(clip_value) > max_size:
+				paste_process.kill()
+				killed = True
+		if killed is False and paste_process.returncode != 0:
+			raise sub.CalledProcessError(paste_process.returncode, self.paste_cmd)
+		return clip_value
+
+	def change_token(self):
+		"""Returns a value that changes whenever the clipboard does, or None if there's no cheap way to tell."""
+
+		if self.change_func is not None:
+			return self.change_func()
+		if self.change_cmd is not None:
+			instrumentation.count('subprocesses')
+			change_process = sub.run(self.change_cmd, universal_newlines=True, capture_output=True)
+			if change_process.returncode == 0 and change_process.stdout != '':
+				return change_process.stdout
+		return None
+
+	def close(self):
+		pass
+
+class SessionClipboard:
+	"""This clipboard backend starts helper_cmd once and keeps it running, so each copy/paste is just a request
+	over its stdin/stdout instead of a new process.\n
+	The helper reads one request per line, either "copy <base64 text>" or "paste", and answers each with one line,
+	"ok <base64 text>" (the text is empty for a copy) or "err <message>". All text is UTF-8."""
+
+	def __init__(self, helper_cmd, change_func=None):
+		self.helper_cmd = helper_cmd
+		self.change_func = change_func
+		self._helper = None
+		# Requests and their answers can't be interleaved between threads.
+		self._lock = threading.Lock()
+
+	def copy(self, new_clip_value):
+		self._request('copy ' + base64.b64encode(new_clip_value.encode('utf-8')).decode('ascii'))
+
+	def paste(self, max_size=None):
+		"""Returns the clipboard text, cut off at max_size + 1 characters if max_size is set
+		(the helper still sends all of it)."""
+
+		clip_value = base64.b64decode(self._request('paste')).decode('utf-8')
+		if max_size is not None:
+			return clip_value[:max_size + 1]
+		return clip_value
+
+	def change_token(self):
+		"""Returns a value that changes whenever the clipboard does, or None if there's no cheap way to tell."""
+
+		if self.change_func is not None:
+			return self.change_func()
+		return None
+
+	def close(self):
+		with self._lock:
+			if self._helper is not None:
+				# The helper exits once its input is closed.
+				self._helper.stdin.close()
+				try:
+					self._helper.wait(timeout=5)
+				except sub.TimeoutExpired:
+					self._helper.kill()
+				self._helper.stdout.close()
+				self._helper = None
+
+	def _request(self, request_line):
+		with self._lock:
+			# If the helper stopped since the last request then start a new one and retry once.
+			for attempt in range(2):
+				if self._helper is None or self._helper.poll() is not None:
+					instrumentation.count('subprocesses')
+					self._helper = sub.Popen(self.helper_cmd, stdin=sub.PIPE, stdout=sub.PIPE, bufsize=0)
+				try:
+					self._helper.stdin.write(request_line.encode('ascii') + b'\n')
+					answer = self._helper.stdout.readline().decode('ascii').rstrip('\r\n')
+				except (BrokenPipeError, OSError):
+					answer = ''
+				if answer != '':
+					break
+				self._helper = None
+		if answer.startswith('ok'):
+			return answer[3:]
+		raise OSError(f'The clipboard helper {self.helper_cmd} failed: "{answer[4:] if answer else "it stopped"}"')
+
+# The PowerShell side of SessionClipboard, so PowerShell only has to start once instead of for every paste.
+_POWERSHELL_CLIPBOARD_HELPER = '''
+Add-Type -AssemblyName System.Windows.Forms
+$utf8 = [Text.Encoding]::UTF8
+while (($line = [Console]::In.ReadLine()) -ne $null) {
+	try {
+		if ($line.StartsWith('copy')) {
+			$text = $utf8.GetString([Convert]::FromBase64String($line.Substring(5)))
+			if ($text.Length -eq 0) { [Windows.Forms.Clipboard]::Clear() } else { [Windows.Forms.Clipboard]::SetText($text) }
+			[Console]::Out.WriteLine('ok ')
+		} elseif ($line -eq 'paste') {
+			[Console]::Out.WriteLine('ok ' + [Convert]::ToBase64String($utf8.GetBytes([Windows.Forms.Clipboard]::GetText())))
+		} else {
+			[Console]::Out.WriteLine('err unknown request')
+		}
+	} catch {
+		[Console]::Out.WriteLine('err ' + $_.Exception.Message.Replace("`n", ' '))
+	}
+	[Console]::Out.Flush()
+}
+'''
+
+def _darwin_change_count():
+	"""Returns a function for the macOS pasteboard change count if PyObjC is installed (otherwise None)."""
+
+	try:
+		from AppKit import NSPasteboard
+	except ImportError:
+		return None
+	return lambda: NSPasteboard.generalPasteboard().changeCount()
+
+def _windows_change_count():
+	"""Returns a function for the Windows clipboard sequence number (otherwise None)."""
+
+	try:
+		import ctypes
+		get_sequence_number = ctypes.windll.user32.GetClipboardSequenceNumber
+	except (ImportError, AttributeError):
+		return None
+	return lambda: get_sequence_number()
+
+class AppResult:
+	"""This class holds what happened to one application in a fq_apps/hide_apps call."""
+
+	def __init__(self, name, ok=False, err='', pids=None):
+		self.name = name
+		self.ok = ok
+		self.err = err
+		# The process ids that were signalled (only on Linux).
+		self.pids = pids if pids is not None else []
+
+	def __repr__(self):
+		if self.ok is True:
+			return f'AppResult(ok, "{self.name}")'
+		return f'AppResult(failed, "{self.name}": {self.err})'
+
+class PlatformBackend:
+	"""This is the base of the operating system strategies Operations uses for the clipboard and to open, quit and hide
+	applications. It's picked once by get_platform_backend.\n
+	The *_cmd methods return the single command to run for every application at once (or None if it isn't supported)
+	and the parse_* methods turn that command's output into a dict of app name to AppResult.
+	quit_apps/hide_apps run those commands unless a backend can do it without a command."""
+
+	name = 'unsupported'
+
+	def __init__(self):
+		self._clipboard = None
+
+	def clipboard(self):
+		"""Returns the clipboard backend (created the first time), or None if there isn't one."""
+		if self._clipboard is None:
+			self._clipboard = self._make_clipboard()
+		return self._clipboard
+
+	def _make_clipboard(self):
+		return None
+
+	def open_cmd(self, open_this, custom_app=None):
+		return None
+
+	def quit_apps_cmd(self, app_names, force=False):
+		return None
+
+	def hide_apps_cmd(self, app_names):
+		return None
+
+	def parse_quit_output(self, app_names, returncode, out_str):
+		return _parse_app_lines(app_names, returncode, out_str)
+
+	def parse_hide_output(self, app_names, returncode, out_str):
+		return _parse_app_lines(app_names, returncode, out_str)
+
+	def quit_apps(self, app_names, force=False, timeout=10.0):
+		"""Quit every application in app_names with one command, returns a dict of app name to AppResult."""
+		return self._run_apps_cmd(app_names, self.quit_apps_cmd(app_names, force), self.parse_quit_output, timeout)
+
+	def hide_apps(self, app_names, timeout=10.0):
+		"""Hide every application in app_names with one command, returns a dict of app name to AppResult."""
+		return self._run_apps_cmd(app_names, self.hide_apps_cmd(app_names), self.parse_hide_output, timeout)
+
+	def _run_apps_cmd(self, app_names, apps_cmd, parse_output, timeout):
+		if apps_cmd is None:
+			return _all_failed(app_names, f'this is not supported on "{self.name}"')
+		instrumentation.count('subprocesses')
+		try:
+			apps_process = sub.run(apps_cmd, universal_newlines=True, capture_output=True, timeout=timeout)
+		except sub.TimeoutExpired:
+			return _all_failed(app_names, f'it was still running after {timeout} seconds')
+		return parse_output(app_names, apps_process.returncode, apps_process.stdout + apps_process.stderr)
+
+def _all_failed(app_names, err):
+	return {app_name: AppResult(app_name, err=err) for app_name in app_names}
+
+def _parse_app_lines(app_names, returncode, out_str):
+	"""Parse the output of a batched script that prints "<index><tab>ok" or "<index><tab>err <message>"
+	for each application (in the order of app_names)."""
+
+	app_results = _all_failed(app_names, f'no result (exit code {returncode}): {out_str.strip()}')
+	for out_line in out_str.splitlines():
+		index_str, tab, status = out_line.partition('\t')
+		if tab == '' or index_str.isdigit() is False or int(index_str) >= len(app_names):
+			continue
+		app_name = app_names[int(index_str)]
+		if status == 'ok':
+			app_results[app_name] = AppResult(app_name, ok=True)
+		else:
+			app_results[app_name] = AppResult(app_name, err=status[4:])
+	return app_results
+
+class DarwinBackend(PlatformBackend):
+	name = 'Darwin'
+
+	def _make_clipboard(self):
+		return SpawnClipboard(['pbcopy'], ['pbpaste'], change_func=_darwin_change_count())
+
+	def open_cmd(self, open_this, custom_app=None):
+		if custom_app is not None:
+			return ['open', '-a', custom_app, os.fspath(open_this)]
+		elif type(open_this) is str:
+			return ['open', '-a', open_this]
+		return ['open', os.fspath(open_this)]
+
+	def quit_apps_cmd(self, app_names, force=False, timeout=10.0):
+		return _applescript_batch_cmd(app_names, 'quit app "{}"', timeout)
+
+	def hide_apps_cmd(self, app_names, timeout=10.0):
+		return _applescript_batch_cmd(app_names, 'tell application "System Events" to set visible of process "{}" to false',
+		                              timeout)
+
+	def quit_apps(self, app_names, force=False, timeout=10.0):
+		app_results = self._run_apps_cmd(app_names, self.quit_apps_cmd(app_names, force, timeout), self.parse_quit_output,
+		                                 _applescript_batch_timeout(app_names, timeout))
+		if force is True:
+			# Kill anything that didn't quit (like an app waiting on a save dialog),
+			# 	one killall per app so its exit code tells if that app was killed.
+			not_quit = [app_name for app_name, app_result in app_results.items() if app_result.ok is False]
+			for app_name in not_quit:
+				instrumentation.count('subprocesses')
+				kill_process = sub.run(['killall', '-KILL', app_name], universal_newlines=True, capture_output=True)
+				if kill_process.returncode == 0:
+					app_results[app_name] = AppResult(app_name, ok=True)
+				else:
+					kill_err = kill_process.stderr.strip() or f'killall exited with {kill_process.returncode}'
+					app_results[app_name] = AppResult(app_name, err=f'{app_results[app_name].err}; {kill_err}')
+		return app_results
+
+	def hide_apps(self, app_names, timeout=10.0):
+		return self._run_apps_cmd(app_names, self.hide_apps_cmd(app_names, timeout), self.parse_hide_output,
+		                          _applescript_batch_timeout(app_names, timeout))
+
+class WindowsBackend(PlatformBackend):
+	name = 'Windows'
+
+	def _make_clipboard(self):
+		encoded_helper = base64.b64encode(_POWERSHELL_CLIPBOARD_HELPER.encode('utf-16-le')).decode('ascii')
+		return SessionClipboard(['powershell.exe', '-NoLogo', '-NoProfile', '-NonInteractive', '-STA',
+		                         '-EncodedCommand', encoded_helper], change_func=_windows_change_count())
+
+	def open_cmd(self, open_this, custom_app=None):
+		# "start" is built into cmd, the empty argument is the window title so a quoted path isn't taken as one.
+		if custom_app is not None:
+			return ['cmd', '/c', 'start', '', custom_app, os.fspath(open_this)]
+		return ['cmd', '/c', 'start', '', os.fspath(open_this)]
+
+	def quit_apps_cmd(self, app_names, force=False):
+		taskkill_cmd = ['taskkill']
+		if force is True:
+			taskkill_cmd.append('/F')
+		for app_name in app_names:
+			taskkill_cmd += ['/IM', _exe_name(app_name)]
+		return taskkill_cmd
+
+	def parse_quit_output(self, app_names, returncode, out_str):
+		# taskkill prints a SUCCESS/ERROR line per process that has the quoted image name in it.
+		app_results = _all_failed(app_names, 'no output from taskkill')
+		for app_name in app_names:
+			quoted_name = f'"{_exe_name(app_name)}"'.lower()
+			for out_line in out_str.splitlines():
+				if quoted_name in out_line.lower():
+					if out_line.startswith('SUCCESS'):
+						app_results[app_name] = AppResult(app_name, ok=True)
+						break
+					app_results[app_name] = AppResult(app_name, err=out_line.strip())
+		return app_results
+
+class LinuxBackend(PlatformBackend):
+	name = 'Linux'
+
+	def _make_clipboard(self):
+		# Prefer the Wayland tools when running in a Wayland session, otherwise use whichever X11 tool is installed.
+		if os.environ.get('WAYLAND_DISPLAY') and shutil.which('wl-copy') and shutil.which('wl-paste'):
+			return SpawnClipboard(['wl-copy'], ['wl-paste', '--no-newline'])
+		elif shutil.which('xclip'):
+			# The TIMESTAMP target is when the current owner took the clipboard, so it changes on every copy.
+			return SpawnClipboard(['xclip', '-selection', 'clipboard'], ['xclip', '-selection', 'clipboard', '-o'],
+			                      change_cmd=['xclip', '-selection', 'clipboard', '-t', 'TIMESTAMP', '-o'])
+		elif shutil.which('xsel'):
+			return SpawnClipboard(['xsel', '--clipboard', '--input'], ['xsel', '--clipboard', '--output'])
+		return None
+
+	def open_cmd(self, open_this, custom_app=None):
+		if custom_app is None and type(open_this) is not str:
+			return ['xdg-open', os.fspath(open_this)]
+		app_cmd = [open_this] if custom_app is None else [custom_app, os.fspath(open_this)]
+		# gtk-launch starts an application from its .desktop name and returns straight away,
+		# 	otherwise run the application in the background so this doesn't wait for it to close.
+		if shutil.which('gtk-launch'):
+			return ['gtk-launch'] + app_cmd
+		return ['sh', '-c', '"$@" >/dev/null 2>&1 &', 'sh'] + app_cmd
+
+	def hide_apps(self, app_names, timeout=10.0):
+		# xdotool can only search for one window class at a time.
+		if shutil.which('xdotool') is None:
+			return _all_failed(app_names, 'xdotool is not installed')
+		app_results = {}
+		for app_name in app_names:
+			hide_cmd = ['xdotool', 'search', '--onlyvisible', '--class', app_name, 'windowminimize', '%@']
+			app_results.update(self._run_apps_cmd([app_name], hide_cmd, _parse_returncode, timeout))
+		return app_results
+
+	def quit_apps(self, app_names, force=False, timeout=10.0, proc_dir='/proc'):
+		"""Scan /proc once and send SIGTERM to every process named in app_names, then wait up to timeout seconds
+		for them to exit. If force is True then anything still running after that is sent SIGKILL."""
+
+		app_pids = _find_pids(app_names, proc_dir)
+		for pids in app_pids.values():
+			_signal_pids(pids, signal.SIGTERM)
+
+		all_pids = {pid for pids in app_pids.values() for pid in pids}
+		running = _wait_for_exit(all_pids, timeout, proc_dir)
+		if force is True and running != set():
+			_signal_pids(running, signal.SIGKILL)
+			running = _wait_for_exit(running, timeout, proc_dir)
+
+		app_results = {}
+		for app_name, pids in app_pids.items():
+			if pids == []:
+				app_results[app_name] = AppResult(app_name, err=f'there is no running process named "{app_name}"')
+			elif running.isdisjoint(pids) is False:
+				app_results[app_name] = AppResult(app_name, err=f'it was still running after {timeout} seconds', pids=pids)
+			else:
+				app_results[app_name] = AppResult(app_name, ok=True, pids=pids)
+		return app_results
+
+def _parse_returncode(app_names, returncode, out_str):
+	if returncode == 0:
+		return {app_name: AppResult(app_name, ok=True) for app_name in app_names}
+	return _all_failed(app_names, out_str.strip())
+
+def _exe_name(app_name):
+	if app_name.lower().endswith('.exe') is False:
+		return app_name + '.exe'
+	return app_name
+
+def _applescript_seconds(timeout):
+	return max(1, math.ceil(timeout))
+
+def _applescript_batch_timeout(app_names, timeout):
+	"""Returns how long the script of _applescript_batch_cmd can run, every app has its own timeout of timeout seconds."""
+	return _applescript_seconds(timeout) * len(app_names) + 5
+
+def _applescript_batch_cmd(app_names, statement, timeout=10.0):
+	"""Returns one osascript command that runs statement for every app name and prints a status line for each,
+	so one failing app doesn't stop the rest.\n
+	Each statement has its own timeout of timeout seconds, so an app that doesn't answer (like one waiting on
+	a save dialog) gets an error line instead of stopping the whole script before it prints the others."""
+
+	timeout_line = f'\twith timeout of {_applescript_seconds(timeout)} seconds'
+	script_lines = ['set output to ""']
+	for index, app_name in enumerate(app_names):
+		script_lines += [
+			'try',
+			timeout_line,
+			'\t\t' + statement.format(_applescript_str(app_name)),
+			'\tend timeout',
+			f'\tset output to output & "{index}" & tab & "ok" & linefeed',
+			'on error errMsg',
+			f'\tset output to output & "{index}" & tab & "err " & errMsg & linefeed',
+			'end try',
+		]
+	script_lines.append('return output')
+	return ['osascript', '-e', '\n'.join(script_lines)]
+
+def _signal_pids(pids, signal_num):
+	for pid in pids:
+		try:
+			os.kill(pid, signal_num)
+		except ProcessLookupError:
+			pass
+
+def _wait_for_exit(pids, timeout, proc_dir='/proc'):
+	"""Wait up to timeout seconds for the processes to exit, returns the set of pids that are still running."""
+
+	running = set(pids)
+	deadline = time.monotonic() + timeout
+	while True:
+		running = {pid for pid in running if _pid_running(pid, proc_dir)}
+		if running == set() or time.monotonic() >= deadline:
+			return running
+		time.sleep(0.05)
+
+def _pid_running(pid, proc_dir='/proc'):
+	try:
+		with open(os.path.join(proc_dir, str(pid), 'stat'), encoding='utf-8', errors='replace') as stat_file:
+			# The state comes right after the command name, which is in parentheses. Zombies already exited.
+			return stat_file.read().rpartition(')')[2].split()[0] != 'Z'
+	except (OSError, IndexError):
+		return False
+
+def _applescript_str(in_str):
+	# Escape a string so it can go between double quotes in an AppleScript.
+	return in_str.replace('\\', '\\\\').replace('"', '\\"')
+
+# Programs whose first argument (that isn't an option) is the script that's actually running,
+# 	with an optional version like "python3.12".
+_INTERPRETER_REGEX = re.compile(r'(python|perl|ruby|node|bash|sh|dash|zsh)[0-9.]*')
+
+def _find_pids(app_names, proc_dir='/proc'):
+	"""Scan /proc once and return a dict of each name in app_names to the pids of the processes with that name
+	(either their short command name or the file name of the program they're running, case insensitive)."""
+
+	wanted = {}
+	for app_name in app_names:
+		wanted.setdefault(app_name.casefold(), []).append(app_name)
+	found = {app_name: [] for app_name in app_names}
+	own_pid = os.getpid()
+
+	with os.scandir(proc_dir) as proc_entries:
+		for entry in proc_entries:
+			if entry.name.isdigit() is False or int(entry.name) == own_pid:
+				continue
+			try:
+				with open(os.path.join(entry.path, 'comm'), encoding='utf-8', errors='replace') as comm_file:
+					comm = comm_file.read().rstrip('\n')
+				with open(os.path.join(entry.path, 'cmdline'), 'rb') as cmdline_file:
+					cmdline = cmdline_file.read().decode('utf-8', 'replace').split('\0')
+			except OSError:
+				# The process exited while it was being read.
+				continue
+			proc_names = {comm.casefold(), os.path.basename(cmdline[0]).casefold()}
+			# For scripts the program is the interpreter, so the script's name is what it's known by.
+			if _INTERPRETER_REGEX.fullmatch(os.path.basename(cmdline[0])) is not None:
+				script_args = [arg for arg in cmdline[1:] if arg != '' and arg.startswith('-') is False]
+				if script_args != []:
+					proc_names.add(os.path.basename(script_args[0]).casefold())
+			for proc_name in proc_names:
+				for app_name in wanted.get(proc_name, []):
+					found[app_name].append(int(entry.name))
+			# comm is cut off at 15 characters, so also match longer names on their first 15.
+			if len(comm) == 15:
+				for wanted_name, matching_names in wanted.items():
+					if len(wanted_name) > 15 and wanted_name[:15] == comm.casefold() and wanted_name not in proc_names:
+						for app_name in matching_names:
+							found[app_name].append(int(entry.name))
+	return found
+
+# Backend class for each sys.platform.
+PLATFORM_BACKENDS = {'darwin': DarwinBackend, 'win32': WindowsBackend, 'linux': LinuxBackend}
+_platform_backend = None
+
+def get_platform_backend():
+	"""Returns the PlatformBackend for the current operating system, it's only created the first time."""
+
+	global _platform_backend
+	if _platform_backend is None:
+		_platform_backend = PLATFORM_BACKENDS.get(sys.platform, PlatformBackend)()
+	return _platform_backend
+
+class _ClipboardWatcher:
+	"""This class remembers what the clipboard was so each poll can tell if it changed (used by watch_clipboard)."""
+
+	def __init__(self, clipboard, debounce=0.0, max_size=None):
+		self.clipboard = clipboard
+		self.debounce = debounce
+		self.max_size = max_size
+		self.last_token = clipboard.change_token()
+		# Only the hash of the last contents is kept so big values aren't compared character by character.
+		self.last_digest = _hash_text(clipboard.paste(max_size))
+		# The (change signal, time it was first seen) of a change that's waiting to settle for debounce seconds.
+		self.pending = None
+
+	def poll(self):
+		"""Check the clipboard once, returns the new contents if they changed (and settled) otherwise None."""
+
+		if self.last_token is not None:
+			token = self.clipboard.change_token()
+			if token == self.last_token:
+				self.pending = None
+				return None
+			change_signal = token
+		else:
+			# Without a change signal the contents (up to max_size) are read and hashed on every poll.
+			clip_value = self.clipboard.paste(self.max_size)
+			change_signal = _hash_text(clip_value)
+			if change_signal == self.last_digest:
+				self.pending = None
+				return None
+
+		if self.debounce > 0:
+			now = time.monotonic()
+			if self.pending is None or self.pending[0] != change_signal:
+				self.pending = (change_signal, now)
+				return None
+			elif now - self.pending[1] < self.debounce:
+				return None
+		self.pending = None
+
+		if self.last_token is not None:
+			self.last_token = token
+			clip_value = self.clipboard.paste(self.max_size)
+			digest = _hash_text(clip_value)
+			# The same value copied again still changes the signal.
+			if digest == self.last_digest:
+				return None
+		else:
+			digest = change_signal
+		self.last_digest = digest
+
+		if self.max_size is not None and len(clip_value) > self.max_size:
+			return None
+		return clip_value
+
+class RenameResult:
+	"""This class holds the plan of a rename_many call and what happened when it was applied."""
+
+	def __init__(self):
+		# Every (from path, to path) rename in the order they're done, including the temporary ones to break cycles.
+		self.steps = []
+		# (original path, new path) of each input that was renamed.
+		self.renamed = []
+		# Why the renames couldn't be done, nothing is renamed if there are any.
+		self.conflicts = []
+
+	def __repr__(self):
+		return f'RenameResult(renamed={len(self.renamed)}, steps={len(self.steps)}, conflicts={len(self.conflicts)})'
+
+def _plan_renames(rename_pairs):
+	"""Returns a RenameResult with the steps to rename every (path, new name) in rename_pairs or the conflicts
+	that stop that from happening.\n
+	Each folder is listed once with os.scandir and every check is done against those listings, so renames that
+	swap names (A->B, B->A) or chain (A->B, B->C) are put in an order that never overwrites anything,
+	using a temporary name to break each cycle.\n
+	The listings are compared by exact name, so a target that isn't in them is also lstat'ed in case something
+	whose name only differs by case is already there on a case-insensitive volume."""
+
+	rename_result = RenameResult()
+	# Names in each folder, listed once.
+	dir_names = {}
+	# Final path of each input path.
+	targets = {}
+	target_owners = {}
+	for in_path, new_name in rename_pairs:
+		in_path = os.fspath(in_path)
+		parent_dir, in_name = os.path.split(in_path)
+		if parent_dir not in dir_names:
+			try:
+				with os.scandir(parent_dir or '.') as dir_entries:
+					dir_names[parent_dir] = {entry.name for entry in dir_entries}
+			except FileNotFoundError:
+				dir_names[parent_dir] = set()
+
+		if type(new_name) is not str or new_name in ('', '.', '..') or os.sep in new_name or \
+				(os.altsep is not None and os.altsep in new_name):
+			rename_result.conflicts.append(f'"{new_name}" is not a valid new name for "{in_path}"')
+			continue
+
+		out_path = os.path.join(parent_dir, new_name)
+		if in_name not in dir_names[parent_dir]:
+			rename_result.conflicts.append(f'''the input "{in_path}" doesn't exist''')
+		elif in_path in targets:
+			rename_result.conflicts.append(f'the input "{in_path}" is in the list more than once')
+		elif out_path in target_owners:
+			rename_result.conflicts.append(f'"{in_path}" and "{target_owners[out_path]}" would both be renamed to "{out_path}"')
+		elif out_path != in_path:
+			targets[in_path] = out_path
+			target_owners[out_path] = in_path
+
+	# A target that already exists is only ok if it's one of the inputs (so it will have moved out of the way).
+	for in_path, out_path in targets.items():
+		out_dir, out_name = os.path.split(out_path)
+		if out_name in dir_names[out_dir]:
+			if out_path not in targets:
+				rename_result.conflicts.append(f'the target rename output "{out_path}" already exists')
+		elif _taken_by_other(out_path, in_path):
+			rename_result.conflicts.append(f'the target rename output "{out_path}" already exists')
+	if rename_result.conflicts != []:
+		return rename_result
+
+	# Every input has one target and every target one input, so the inputs form chains and cycles.
+	# 	An input is ready once nothing else is still at its target, and renaming it frees its own path.
+	pending = dict(targets)
+	ready = [in_path for in_path, out_path in pending.items() if out_path not in pending]
+	while pending:
+		if ready == []:
+			# Only cycles are left, move one input of a cycle to a temporary name to break it.
+			cycle_path = next(iter(pending))
+			cycle_dir = os.path.dirname(cycle_path)
+			temp_number = 0
+			while True:
+				temp_name = f'.rename-{os.getpid()}-{temp_number}.tmp'
+				if temp_name not in dir_names[cycle_dir]:
+					break
+				temp_number += 1
+			temp_path = os.path.join(cycle_dir, temp_name)
+			dir_names[cycle_dir].add(temp_name)
+			rename_result.steps.append((cycle_path, temp_path))
+			pending[temp_path] = pending.pop(cycle_path)
+			target_owners[pending[temp_path]] = temp_path
+			# Whatever was waiting on the input's old path can go now.
+			ready.append(target_owners[cycle_path])
+			continue
+
+		in_path = ready.pop()
+		out_path = pending.pop(in_path)
+		rename_result.steps.append((in_path, out_path))
+		waiting_path = target_owners.get(in_path)
+		if waiting_path is not None and waiting_path in pending:
+			ready.append(waiting_path)
+
+	rename_result.renamed = list(targets.items())
+	return rename_result
+
+def _apply_rename_steps(steps, journal_path=None, done_steps=None):
+	"""Do every rename in steps that isn't in done_steps, if journal_path is set then every finished step is written
+	to that journal file as it's done.\n
+	Without done_steps this is a new batch, so the journal is created with the steps
+	(and FileExistsError is raised if it already exists), otherwise the journal of the batch is appended to.\n
+	Every target is checked right before its rename and FileExistsError is raised instead of replacing something
+	that's there (like a name that only differs by case from another target on a case-insensitive volume)."""
+
+	journal_file = None
+	if journal_path is not None:
+		if done_steps is None:
+			journal_file = open(journal_path, 'x', encoding='utf-8')
+			journal_file.write(json.dumps({'steps': steps}) + '\n')
+			journal_file.flush()
+		else:
+			journal_file = open(journal_path, 'a', encoding='utf-8')
+	if done_steps is None:
+		done_steps = set()
+	try:
+		for step_index, (from_path, to_path) in enumerate(steps):
+			if step_index in done_steps:
+				continue
+			if _taken_by_other(to_path, from_path):
+				raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), to_path)
+			os.rename(from_path, to_path)
+			if journal_file is not None:
+				journal_file.write(json.dumps({'done': step_index}) + '\n')
+				journal_file.flush()
+	finally:
+		if journal_file is not None:
+			journal_file.close()
+
+def _read_rename_journal(journal_path):
+	"""Returns (steps, set of indexes of the steps that are done) from a rename journal."""
+
+	steps = None
+	done_steps = set()
+	with open(journal_path, encoding='utf-8') as journal_file:
+		for journal_line in journal_file:
+			try:
+				journal_entry = json.loads(journal_line)
+			except ValueError:
+				# The last line can be cut off if the process was killed while writing it.
+				continue
+			if 'steps' in journal_entry:
+				steps = [tuple(step) for step in journal_entry['steps']]
+			elif 'done' in journal_entry:
+				done_steps.add(journal_entry['done'])
+			elif 'undone' in journal_entry:
+				done_steps.discard(journal_entry['undone'])
+	return steps, done_steps
 
 class Operations:
-	def __init__(self, print_success=True, print_err=True):
+	def __init__(self, print_success=True, print_err=True, clipboard=None, backend=None):
 		self.print_success = print_success
 		self.print_err = print_err
+		# The PlatformBackend, if it's None then the one for the current operating system is used.
+		if backend is None:
+			backend = get_platform_backend()
+		self.backend = backend
+		# A SpawnClipboard/SessionClipboard, if it's None then the backend's clipboard is used.
+		self.clipboard = clipboard
 	
+	@_instrumented
 	def copy_to_clipboard(self, new_clip_value):
 		"""This method copies new_clip_value to the clipboard."""
-		# Check which operating system is running to get the correct copying keyword.
-		if plat.system() == 'Darwin':
-			copy_keyword = 'pbcopy'
-		elif plat.system() == 'Windows':
-			copy_keyword = 'clip'
-		else:
-			print(f'Error, the copy_to_clipboard function does not have the copy ', end='')
-			print(f'keyword for the current operating system: "{plat.system()}"')
-			quit()
 
-		sub.run(copy_keyword, universal_newlines=True, input=new_clip_value)
-		
+		self._clipboard_backend().copy(new_clip_value)
+
 		if self.print_success is True:
 			print(f'"{new_clip_value}" was copied to the clipboard!')
-	
+
+	@_instrumented
 	def get_clipboard(self):
 		"""This method gets the contents of the clipboard."""
-		
-		# Check which operating system is running to get the correct clipboard retrival keyword.
-		if plat.system() == 'Darwin':
-			paste_keyword_list = ['pbpaste']
-		elif plat.system() == 'Windows':
-			# TODO find a different command that doesn't open another application momentarily.
-			paste_keyword_list = ['powershell.exe', '-command', "Get-Clipboard"]
-		else:
-			print(f'Error, the copy_to_clipboard function does not have the copy ', end='')
-			print(f'keyword for the current operating system: "{plat.system()}"')
-			quit()
 
-		# Run command to get clipboard contents.
-		clipboard_value = sub.run(paste_keyword_list, universal_newlines=True, capture_output=True)
-		
+		clipboard_value = self._clipboard_backend().paste()
+
 		if self.print_success is True:
-			print(f'The clipboard has the value: "{clipboard_value.stdout}"')
-		return clipboard_value.stdout
-	
+			print(f'The clipboard has the value: "{clipboard_value}"')
+		return clipboard_value
+
+	def watch_clipboard(self, interval=0.5, debounce=0.0, max_size=1024 * 1024):
+		"""This generator checks the clipboard every interval seconds and yields its contents only when they change.\n
+		If the clipboard backend has a cheap change signal (like the macOS change count or the Windows sequence
+		number) the contents are only read after a change, otherwise each check reads them and compares a hash.\n
+		If debounce is more than 0 then a change is only yielded once the clipboard stayed the same for that many
+		seconds, and new contents longer than max_size characters are skipped (max_size=None yields everything).\n
+		Reading stops one character past max_size, so a huge value is never read in full. Without a change signal
+		(pbpaste without PyObjC, wl-paste and xsel) every check still reads up to max_size characters and hashes them,
+		so a big max_size makes each check slower."""
+
+		clipboard_watcher = _ClipboardWatcher(self._clipboard_backend(), debounce, max_size)
+		while True:
+			time.sleep(interval)
+			clip_value = clipboard_watcher.poll()
+			if clip_value is not None:
+				if self.print_success is True:
+					print(f'The clipboard changed to: "{clip_value}"')
+				yield clip_value
+
+	def close(self):
+		"""This method stops the clipboard helper process (if there is one)."""
+
+		if self.clipboard is not None:
+			self.clipboard.close()
+
+	def _clipboard_backend(self):
+		"""Returns the clipboard backend, it's picked for the current operating system the first time it's needed."""
+
+		if self.clipboard is None:
+			self.clipboard = self.backend.clipboard()
+			if self.clipboard is None:
+				raise UnsupportedPlatformError(f'there is no clipboard command for the current operating system: '
+				                               f'"{self.backend.name}"')
+		return self.clipboard
+
+	@_instrumented
 	def open_path_or_app(self, open_this, custom_app=None):
 		"""This method uses the Terminal to open the input open_this.
 		open_this can be a string of an application to open or a path to open.
@@ -79,271 +2312,892 @@ class Operations:
 
 		# Confirm open_this is a string or paths.Path().
 		if type(open_this) is not str and type(open_this) is not paths.PosixPath and type(open_this) is not paths.WindowsPath:
-			print(f'Error, open_this must a string of an application name or a pathlib path,'
-			      f'not {type(open_this)}, "{open_this}"')
-			quit()
-		
-		# Determine which terminal keyword to use based on the system this is running on.
-		if plat.system() == 'Darwin':
-			open_keyword = 'open'
-		# If the output path is a WindowsPath then the keyword to open the input is "start" in the terminal.
-		elif plat.system() == 'Windows':
-			open_keyword = 'start'
-		
-		# A custom application was specified to the Mac/Linux terminal to add that string to the command.
+			raise InvalidInputError(f'open_this must a string of an application name or a pathlib path, '
+			                        f'not {type(open_this)}, "{open_this}"')
+
+		# A custom application was specified so add that to the command.
 		if custom_app is not None:
 			if type(open_this) is not paths.PosixPath and type(open_this) is not paths.WindowsPath:
-				print(f'Error, if custom_app is specified then open_this must be type paths.Path(),'
-				      f'not {type(open_this)}, "{open_this}"')
-				# print(f'Error, in order to open the file/folder open_this custom_app must be a string of
-				#   an application name, ', end='')
-				# print(f'not open_this = {type(open_this)}, "{open_this}" and
-				#   custom_app = {type(custom_app)}, "{custom_app}"')
-				quit()
+				raise InvalidInputError(f'if custom_app is specified then open_this must be type paths.Path(), '
+				                        f'not {type(open_this)}, "{open_this}"')
 			elif type(custom_app) is not str:
-				print(f'Error, custom_app must me a string of an app name, not {type(custom_app)}, "{custom_app}"')
-				quit()
+				raise InvalidInputError(f'custom_app must me a string of an app name, not {type(custom_app)}, "{custom_app}"')
 			else:
 				# Open the file/folder open_this with str(custom_app).
-				open_cmd = [open_keyword, '-a', custom_app, open_this]
-				if self.print_success is True:
+				open_cmd = self.backend.open_cmd(open_this, custom_app)
+				if open_cmd is not None and self.print_success is True:
 					print(f'Opened file/folder: "{open_this}" with custom application: "{custom_app}"')
 		
 		# No specific application was specified so just open with the default application.
 		else:
-			# Open the application: str(open_this).
-			if type(open_this) is str:
-				open_cmd = [open_keyword, '-a', open_this]
-				if self.print_success is True:
-					print(f'Opened application: "{open_this}"')
-			# open_this is a paths.Path() so open the file/folder.
-			else:
-				open_cmd = [open_keyword, open_this]
-				if self.print_success is True:
-					print(f'Opened file/folder: "{open_this}" with the default application.')
-		
-		# Run terminal command to open the output file.
-		sub.run(open_cmd)
+			# Open the application: str(open_this).
+			if type(open_this) is str:
+				open_cmd = self.backend.open_cmd(open_this)
+				if open_cmd is not None and self.print_success is True:
+					print(f'Opened application: "{open_this}"')
+			# open_this is a paths.Path() so open the file/folder.
+			else:
+				open_cmd = self.backend.open_cmd(open_this)
+				if open_cmd is not None and self.print_success is True:
+					print(f'Opened file/folder: "{open_this}" with the default application.')
+
+		if open_cmd is None:
+			raise UnsupportedPlatformError(f'there is no open command for the current operating system: "{self.backend.name}"')
+
+		# Run terminal command to open the output file.
+		instrumentation.count('subprocesses')
+		sub.run(open_cmd)
+
+	@_instrumented
+	def fq_app(self, kill_app_name):
+		"""This method runs a command in the Terminal (without opening it) to force-quit an application."""
+
+		_is_type_or_raise(type(kill_app_name), str, 'kill_app_name')
+
+		return self.fq_apps([kill_app_name])[kill_app_name].ok
+
+	@_instrumented
+	def fq_apps(self, kill_app_names, force=False, timeout=10.0):
+		"""This method quits every application in kill_app_names with a single command (one osascript/taskkill,
+		on Linux one scan of /proc).\n
+		If force is True then applications that are still running after timeout seconds are killed.\n
+		Returns a dict of each app name to an AppResult."""
+
+		self._check_app_names(kill_app_names, 'kill_app_names')
+		_is_type_or_raise(type(force), bool, 'force')
+
+		app_results = self.backend.quit_apps(list(kill_app_names), force=force, timeout=timeout)
+		for app_name, app_result in app_results.items():
+			if app_result.ok is True:
+				if self.print_success is True:
+					print(f'Successfully force-quit application: "{app_name}"')
+			elif self.print_err is True:
+				print(f'''Error, it didn't work to quit "{app_name}": {app_result.err}''')
+		return app_results
+
+	@_instrumented
+	def hide_app(self, hide_app_name):
+		"""This method will hide the input application. So it will still be open, just not visible."""
+		_is_type_or_raise(type(hide_app_name), str, 'hide_app_name')
+
+		return self.hide_apps([hide_app_name])[hide_app_name].ok
+
+	@_instrumented
+	def hide_apps(self, hide_app_names):
+		"""This method hides every application in hide_app_names with a single command.\n
+		Returns a dict of each app name to an AppResult."""
+
+		self._check_app_names(hide_app_names, 'hide_app_names')
+
+		app_results = self.backend.hide_apps(list(hide_app_names))
+		for app_name, app_result in app_results.items():
+			if app_result.ok is True:
+				if self.print_success is True:
+					print(f'"{app_name}" was hidden.')
+			elif self.print_err is True:
+				print(f'''Error, it didn't work to hide "{app_name}": {app_result.err}''')
+		return app_results
+
+	def _check_app_names(self, app_names, app_names_str):
+		if type(app_names) is str or any(type(app_name) is not str for app_name in app_names):
+			raise InvalidInputError(f'{app_names_str} must be a list of application name strings, not "{app_names}"')
+
+class AsyncOperations:
+	"""This class has the Operations methods as coroutines for asyncio.
+	Commands run with asyncio.create_subprocess_exec and anything that can't be a command runs on a thread pool,
+	with at most max_concurrent of them running at once."""
+
+	def __init__(self, print_success=True, print_err=True, clipboard=None, backend=None, max_concurrent=16):
+		self.operations = Operations(print_success, print_err, clipboard=clipboard, backend=backend)
+		self.max_concurrent = max_concurrent
+		self._executor = futures.ThreadPoolExecutor(max_workers=max_concurrent)
+		self._limit = None
+
+	async def copy_to_clipboard(self, new_clip_value):
+		"""This method copies new_clip_value to the clipboard."""
+
+		clipboard = self.operations._clipboard_backend()
+		if type(clipboard) is SpawnClipboard:
+			returncode, out_str = await self._exec(clipboard.copy_cmd, new_clip_value)
+			if returncode != 0:
+				raise OSError(f'{clipboard.copy_cmd} failed: "{out_str.strip()}"')
+		else:
+			await self._in_thread(clipboard.copy, new_clip_value)
+		if self.operations.print_success is True:
+			print(f'"{new_clip_value}" was copied to the clipboard!')
+
+	async def get_clipboard(self):
+		"""This method gets the contents of the clipboard."""
+
+		clipboard = self.operations._clipboard_backend()
+		if type(clipboard) is SpawnClipboard:
+			returncode, clipboard_value = await self._exec(clipboard.paste_cmd, capture_stderr=False)
+			if returncode != 0:
+				raise OSError(f'{clipboard.paste_cmd} failed.')
+		else:
+			clipboard_value = await self._in_thread(clipboard.paste)
+		if self.operations.print_success is True:
+			print(f'The clipboard has the value: "{clipboard_value}"')
+		return clipboard_value
+
+	async def watch_clipboard(self, interval=0.5, debounce=0.0, max_size=1024 * 1024):
+		"""This async generator works like Operations.watch_clipboard."""
+
+		clipboard_watcher = await self._in_thread(_ClipboardWatcher, self.operations._clipboard_backend(), debounce,
+		                                          max_size)
+		while True:
+			await asyncio.sleep(interval)
+			clip_value = await self._in_thread(clipboard_watcher.poll)
+			if clip_value is not None:
+				if self.operations.print_success is True:
+					print(f'The clipboard changed to: "{clip_value}"')
+				yield clip_value
+
+	async def open_path_or_app(self, open_this, custom_app=None):
+		"""This method works like Operations.open_path_or_app."""
+
+		if type(open_this) is not str and type(open_this) is not paths.PosixPath and type(open_this) is not paths.WindowsPath:
+			raise InvalidInputError(f'open_this must a string of an application name or a pathlib path, '
+			                        f'not {type(open_this)}, "{open_this}"')
+		if custom_app is not None and type(custom_app) is not str:
+			raise InvalidInputError(f'custom_app must me a string of an app name, not {type(custom_app)}, "{custom_app}"')
+
+		open_cmd = self.operations.backend.open_cmd(open_this, custom_app)
+		if open_cmd is None:
+			raise UnsupportedPlatformError(f'there is no open command for the current operating system: '
+			                               f'"{self.operations.backend.name}"')
+		returncode, out_str = await self._exec(open_cmd)
+		if returncode == 0 and self.operations.print_success is True:
+			print(f'Opened "{open_this}"')
+		elif returncode != 0 and self.operations.print_err is True:
+			print(f'''Error, it didn't work to open "{open_this}": {out_str.strip()}''')
+		return returncode == 0
+
+	async def fq_app(self, kill_app_name):
+		_is_type_or_raise(type(kill_app_name), str, 'kill_app_name')
+		return (await self.fq_apps([kill_app_name]))[kill_app_name].ok
+
+	async def fq_apps(self, kill_app_names, force=False, timeout=10.0):
+		"""This method works like Operations.fq_apps."""
+
+		self.operations._check_app_names(kill_app_names, 'kill_app_names')
+		backend = self.operations.backend
+		kill_app_names = list(kill_app_names)
+		# Backends that do more than run their one command (like scanning /proc) run on the thread pool.
+		if type(backend).quit_apps is PlatformBackend.quit_apps:
+			app_results = await self._apps_cmd(kill_app_names, backend.quit_apps_cmd(kill_app_names, force),
+			                                   backend.parse_quit_output, timeout)
+		else:
+			app_results = await self._in_thread(backend.quit_apps, kill_app_names, force, timeout)
+		self._print_app_results(app_results, 'Successfully force-quit application: "{}"', 'quit')
+		return app_results
 
-	def fq_app(self, kill_app_name):
-		"""This method runs a command in the Terminal (without opening it) to force-quit an application."""
+	async def hide_app(self, hide_app_name):
+		_is_type_or_raise(type(hide_app_name), str, 'hide_app_name')
+		return (await self.hide_apps([hide_app_name]))[hide_app_name].ok
+
+	async def hide_apps(self, hide_app_names, timeout=10.0):
+		"""This method works like Operations.hide_apps."""
+
+		self.operations._check_app_names(hide_app_names, 'hide_app_names')
+		backend = self.operations.backend
+		hide_app_names = list(hide_app_names)
+		if type(backend).hide_apps is PlatformBackend.hide_apps:
+			app_results = await self._apps_cmd(hide_app_names, backend.hide_apps_cmd(hide_app_names),
+			                                   backend.parse_hide_output, timeout)
+		else:
+			app_results = await self._in_thread(backend.hide_apps, hide_app_names, timeout)
+		self._print_app_results(app_results, '"{}" was hidden.', 'hide')
+		return app_results
+
+	def close(self):
+		"""This method stops the clipboard helper process (if there is one) and the thread pool."""
 
-		_is_type_or_print_err(type(kill_app_name), str, 'kill_app_name')
+		self.operations.close()
+		self._executor.shutdown(wait=False)
 
+	def _print_app_results(self, app_results, success_str, op_str):
+		for app_name, app_result in app_results.items():
+			if app_result.ok is True:
+				if self.operations.print_success is True:
+					print(success_str.format(app_name))
+			elif self.operations.print_err is True:
+				print(f'''Error, it didn't work to {op_str} "{app_name}": {app_result.err}''')
+
+	async def _apps_cmd(self, app_names, apps_cmd, parse_output, timeout):
+		if apps_cmd is None:
+			return _all_failed(app_names, f'this is not supported on "{self.operations.backend.name}"')
 		try:
-			cmd = ['osascript', '-e', f'quit app "{kill_app_name}"']
-			qt_process = sub.run(cmd, universal_newlines=True)
-			if self.print_success is True:
-				print(f'Successfully force-quit application: "{kill_app_name}"')
-		except:
-			if self.print_err is True:
-				print(f'''Error, it didn't work. cmd="{cmd}" "{qt_process.stderr, qt_process.stdout}"''')
-	
-	def hide_app(self, hide_app_name):
-		"""This method will hide the input application. So it will still be open, just not visible."""
-		_is_type_or_print_err(type(hide_app_name), str, 'kill_app_name')
+			returncode, out_str = await asyncio.wait_for(self._exec(apps_cmd), timeout)
+		except asyncio.TimeoutError:
+			return _all_failed(app_names, f'it was still running after {timeout} seconds')
+		return parse_output(app_names, returncode, out_str)
 
-		cmd = ['osascript', '-e', f'tell application "System Events" to set visible of process "{hide_app_name}" to false']
-		qt_process = sub.run(cmd, stdout=sub.PIPE, stderr=sub.PIPE, universal_newlines=True)
-		if self.print_success is True:
-			print(f'"{hide_app_name}" was hidden.')
-		if self.print_err is True:
-			print(qt_process.stdout, qt_process.stderr)
+	async def _exec(self, cmd, input_str=None, capture_stderr=True):
+		"""Run cmd without blocking the event loop, returns (exit code, output).
+		If this is cancelled then the command is killed."""
+
+		async with self._concurrency_limit():
+			instrumentation.count('subprocesses')
+			cmd_process = await asyncio.create_subprocess_exec(
+				*cmd, stdin=sub.PIPE if input_str is not None else sub.DEVNULL, stdout=sub.PIPE,
+				stderr=sub.STDOUT if capture_stderr is True else None)
+			try:
+				out_bytes, err_bytes = await cmd_process.communicate(
+					input_str.encode('utf-8') if input_str is not None else None)
+			except BaseException:
+				if cmd_process.returncode is None:
+					cmd_process.kill()
+					await cmd_process.wait()
+				raise
+		return cmd_process.returncode, out_bytes.decode('utf-8', 'replace')
+
+	async def _in_thread(self, func, *args):
+		async with self._concurrency_limit():
+			return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: func(*args))
+
+	def _concurrency_limit(self):
+		# Created on first use so it belongs to the running event loop.
+		if self._limit is None:
+			self._limit = asyncio.Semaphore(self.max_concurrent)
+		return self._limit
 
 class Paths:
-	"""This class handles common system path operations."""
+	"""This class handles common system path operations.\n
+	The methods that move/copy/rename a single file or folder return an OpResult, and inputs that can't be used
+	raise an InvalidInputError (or PathNotFoundError) instead of quitting.\n
+	The methods that return their own stats (scan, delete, iter_delete and sync_dir) always return them,
+	an input that doesn't exist raises PathNotFoundError."""
 	
 	def __init__(self, print_success=True, print_err=True):
 		self.print_success = print_success
 		self.print_err = print_err
 	
+	@_instrumented
 	def create_dir(self, parent_dir_path, new_dir_name):
-		"""This method creates a new directory."""
+		"""This method creates a new directory, returns an OpResult (that has the new directory's path if it worked)."""
 		
-		_is_type_or_print_err(type(parent_dir_path), paths.Path, 'parent_dir_path')
-		_is_type_or_print_err(type(new_dir_name), str, 'new_dir_name')
+		_is_type_or_raise(type(parent_dir_path), paths.Path, 'parent_dir_path')
+		_is_type_or_raise(type(new_dir_name), str, 'new_dir_name')
 
 		# pathlib path to new folder from the parent path and the new directory name.
 		create_dir_path = parent_dir_path.joinpath(new_dir_name)
 		
 		# Check for errors then create new directory.
-		if create_dir_path.exists():
-			if self.print_err is True:
-				print(f'Error, target output directory, "{create_dir_path}" already exists.')
-			return False
-		elif parent_dir_path.is_dir() is False:
-			if self.print_err is True:
-				print(f'Error, "{parent_dir_path}" is not a valid parent directory.')
-			return False
+		if _exists(create_dir_path):
+			return self._op_failed('create_dir', create_dir_path,
+			                       f'target output directory, "{create_dir_path}" already exists.')
+		elif _is_dir(parent_dir_path) is False:
+			return self._op_failed('create_dir', create_dir_path, f'"{parent_dir_path}" is not a valid parent directory.')
 		else:
 			create_dir_path.mkdir()
 			if self.print_success is True:
 				print(f'New directory, "{create_dir_path}" was created!')
-			return create_dir_path
-		
-	def del_ds_store(self, del_ds_dir_or_dir_list, print_deleted=False):
-		"""Delete any .DS_Store files within the input directory(s)"""
+			return OpResult('create_dir', create_dir_path, create_dir_path, ok=True)
 		
+	@_instrumented
+	def del_ds_store(self, del_ds_dir_or_dir_list, print_deleted=False, workers=4):
+		"""Delete any .DS_Store files within the input directory(s) and all of their sub-folders."""
+
+		return self.sweep_junk(del_ds_dir_or_dir_list, patterns=('.DS_Store',), workers=workers,
+		                       print_deleted=print_deleted)
+
+	@_instrumented
+	def sweep_junk(self, sweep_dir_or_dir_list, patterns=JUNK_PATTERNS, dry_run=False, workers=4, print_deleted=False):
+		"""Recursively delete every file in the input directory(s) whose name matches one of patterns
+		(exact names or globs like "._*").\n
+		If dry_run is True then nothing is deleted.\n
+		Returns a SweepResult with the paths that were (or with dry_run would be) deleted and their total bytes."""
+
+		_is_type_or_raise(type(dry_run), bool, 'dry_run')
+		_is_type_or_raise(type(print_deleted), bool, 'print_deleted')
+
+		sweep_result = SweepResult()
+		for junk_path, size in self._iter_sweep(sweep_dir_or_dir_list, patterns, dry_run, workers):
+			sweep_result.paths.append(junk_path)
+			sweep_result.bytes += size
+			if print_deleted is True:
+				if dry_run is True:
+					print(f'{junk_path} would be deleted.')
+				else:
+					print(f'{junk_path} was deleted.')
+		return sweep_result
+
+	def iter_sweep_junk(self, sweep_dir_or_dir_list, patterns=JUNK_PATTERNS, dry_run=False, workers=4):
+		"""This generator works like the sweep_junk method, but it yields each deleted path as soon as it's deleted."""
+
+		_is_type_or_raise(type(dry_run), bool, 'dry_run')
+
+		for junk_path, size in self._iter_sweep(sweep_dir_or_dir_list, patterns, dry_run, workers):
+			yield junk_path
+
+	def _iter_sweep(self, sweep_dir_or_dir_list, patterns, dry_run, workers):
+		"""This generator spreads the input directories across workers threads and yields (path, size) for
+		every junk file as the workers find it."""
+
+		_is_type_or_raise(type(workers), int, 'workers')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+		if type(patterns) is str or len(patterns) == 0:
+			raise InvalidInputError(f'patterns must be a list or tuple of file names/globs, not "{patterns}"')
+
 		# Make input a list if it isn't already.
-		if type(del_ds_dir_or_dir_list) is not list:
-			if type(del_ds_dir_or_dir_list) is not paths.PosixPath and type(del_ds_dir_or_dir_list) is not paths.WindowsPath:
-				print(f'Error, del_ds_dir_or_dir_list must be a pathlib directory or a list,', end='')
-				print(f' not {type(del_ds_dir_or_dir_list)} "{del_ds_dir_or_dir_list}"')
-				quit()
-			elif del_ds_dir_or_dir_list.is_dir() is False:
-				print(f'''Error, the input folder "{del_ds_dir_or_dir_list}" doesn't exist.''')
-				quit()
+		if type(sweep_dir_or_dir_list) is not list:
+			if type(sweep_dir_or_dir_list) is not paths.PosixPath and type(sweep_dir_or_dir_list) is not paths.WindowsPath:
+				raise InvalidInputError(f'sweep_dir_or_dir_list must be a pathlib directory or a list, '
+				                        f'not {type(sweep_dir_or_dir_list)} "{sweep_dir_or_dir_list}"')
+			elif _is_dir(sweep_dir_or_dir_list) is False:
+				raise PathNotFoundError(f'''the input folder "{sweep_dir_or_dir_list}" doesn't exist.''')
 			else:
-				del_ds_dir_or_dir_list = [del_ds_dir_or_dir_list]
-		
-		# Delete any .DS_Store files.
-		for directory in del_ds_dir_or_dir_list:
-			if type(directory) is not paths.PosixPath:
+				sweep_dir_or_dir_list = [sweep_dir_or_dir_list]
+
+		sweep_dirs = []
+		for directory in sweep_dir_or_dir_list:
+			if type(directory) is not paths.PosixPath and type(directory) is not paths.WindowsPath:
 				if self.print_err is True:
-					print(f'Error, "{del_ds_dir_or_dir_list[0]}" is not a PosixPath.' )
-			elif directory.is_dir() is False:
+					print(f'Error, "{directory}" is not a pathlib PosixPath or WindowsPath.')
+			elif _is_dir(directory) is False:
 				if self.print_err is True:
 					print(f'Error, {directory} is not a directory.')
 			else:
-				for ds_file in directory.iterdir():
-					if ds_file.is_file() and ds_file.name == '.DS_Store':
-						ds_file.unlink()
-						if print_deleted is True:
-							print(f'{ds_file} was deleted.')
-	
+				sweep_dirs.append(directory)
+
+		is_junk = _name_matcher(patterns)
+
+		def sweep_worker(sweep_dir, emit, stop):
+			_sweep_dir(sweep_dir, is_junk, emit, stop)
+
+		for junk_path, size in _stream_from_workers(sweep_worker, sweep_dirs, workers):
+			if dry_run is False:
+				# Deleted here instead of on the workers, so closing the stream leaves every file it didn't yield.
+				try:
+					os.unlink(junk_path)
+				except FileNotFoundError:
+					# Something else already deleted it.
+					continue
+				instrumentation.count('files_deleted')
+				instrumentation.count('bytes_deleted', size)
+			yield paths.Path(junk_path), size
+
+	@_instrumented
 	def create_cur_year_month_dir(self, parent_dir_path):
 		"""Create a directory of the current month and year (if it doesn't already exist.)"""
 
-		# Get the current month and year in str numbers.
-		cur_year = dates.date.today().strftime("%Y")
-		cur_month = dates.date.today().strftime("%m %B")
-		
-		_is_type_or_print_err(type(parent_dir_path), paths.Path, 'parent_dir_path')
+		_is_type_or_raise(type(parent_dir_path), paths.Path, 'parent_dir_path')
 
-		if parent_dir_path.exists() is False:
-			if self.print_err is True:
-				print(f'''Error, the parent directory "{parent_dir_path}" doesn't exist''')
-			quit()
-		
-		# Paths to a dir for the current month and year.
-		cur_year_dir = parent_dir_path.joinpath(cur_year)
-		cur_month_dir = cur_year_dir.joinpath(cur_month)
-		
-		# Create the new directories (if the directory already exists it will print an error by default,
-		#   so toggle that off because it doesn't matter if that directory already exists).
-		if cur_year_dir.exists() is False:
-			Paths(self.print_err, self.print_success).create_dir(parent_dir_path, cur_year)
-		if cur_month_dir.exists() is False:
-			Paths(self.print_err, self.print_success).create_dir(cur_year_dir, cur_month)
-		
-		return cur_month_dir
+		if _is_dir(parent_dir_path) is False:
+			raise PathNotFoundError(f'''the parent directory "{parent_dir_path}" doesn't exist''')
+
+		# Create the folders of the current year and month (it doesn't matter if they already exist).
+		today = dates.date.today()
+		date_dirs = _DateDirs(parent_dir_path)
+		for new_dir in date_dirs.make_dirs([(today.year, today.month)]):
+			if self.print_success is True:
+				print(f'New directory, "{new_dir}" was created!')
+
+		return date_dirs.month_dirs[(today.year, today.month)]
+
+	def archive_by_date(self, inbox_dir_path, archive_root_path, date_func=None, workers=8, batch_size=1000):
+		"""This generator moves every file in inbox_dir_path into "YYYY/MM Month" folders in archive_root_path
+		(the layout create_cur_year_month_dir makes) by each file's modification time, or by what
+		date_func(file_path, stat_result) returns (a date or datetime) if it's set.\n
+		The inbox is read once, batch_size files at a time: the month folders a batch needs are created together
+		(each folder is only checked once) and its files are moved on up to workers threads.\n
+		Yields an OpResult for every file once it's placed, a file whose name is already taken in its month folder
+		(in any case if that's on a case-insensitive volume) isn't moved."""
+
+		_is_type_or_raise(type(inbox_dir_path), paths.Path, 'inbox_dir_path')
+		_is_type_or_raise(type(archive_root_path), paths.Path, 'archive_root_path')
+		_is_type_or_raise(type(workers), int, 'workers')
+		_is_type_or_raise(type(batch_size), int, 'batch_size')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+		if batch_size < 1:
+			raise InvalidInputError(f'batch_size must be at least 1, not {batch_size}')
+		if _is_dir(inbox_dir_path) is False:
+			raise PathNotFoundError(f'''the inbox folder "{inbox_dir_path}" doesn't exist.''')
+		if _is_dir(archive_root_path) is False:
+			raise PathNotFoundError(f'''the archive folder "{archive_root_path}" doesn't exist.''')
+
+		date_dirs = _DateDirs(archive_root_path)
+		# (name key function, keys of the names) in each month folder, listed the first time a file goes there.
+		# 	On a case-insensitive volume the names are compared casefolded.
+		taken_names = {}
+		with futures.ThreadPoolExecutor(max_workers=workers) as pool, os.scandir(inbox_dir_path) as inbox_entries:
+			batch = []
+			for entry in inbox_entries:
+				if entry.is_file(follow_symlinks=False) is False:
+					continue
+				batch.append(entry)
+				if len(batch) == batch_size:
+					yield from self._archive_batch(batch, date_dirs, taken_names, date_func, pool)
+					batch = []
+			if batch != []:
+				yield from self._archive_batch(batch, date_dirs, taken_names, date_func, pool)
+
+	def _archive_batch(self, batch, date_dirs, taken_names, date_func, pool):
+		"""This method dates a batch of inbox entries, makes the month folders they need and moves them on pool,
+		returns their OpResults in the same order as batch."""
+
+		dated_entries = []
+		for entry in batch:
+			try:
+				entry_stat = _entry_stat(entry, follow_symlinks=False)
+				if date_func is None:
+					file_date = dates.datetime.fromtimestamp(entry_stat.st_mtime)
+				else:
+					file_date = date_func(paths.Path(entry.path), entry_stat)
+			except OSError as err:
+				dated_entries.append((entry, None, str(err)))
+				continue
+			dated_entries.append((entry, (file_date.year, file_date.month), None))
+
+		for new_dir in date_dirs.make_dirs(year_month for entry, year_month, err in dated_entries if year_month is not None):
+			if self.print_success is True:
+				print(f'New directory, "{new_dir}" was created!')
+
+		results = []
+		moves = []
+		for entry, year_month, err in dated_entries:
+			in_path = paths.Path(entry.path)
+			if err is not None:
+				results.append(self._op_failed('archive', in_path, err))
+				continue
+			month_dir = date_dirs.month_dirs[year_month]
+			if month_dir not in taken_names:
+				name_key = str.casefold if _is_case_insensitive(month_dir) else str
+				taken_names[month_dir] = (name_key, {name_key(name) for name in os.listdir(month_dir)})
+			name_key, month_names = taken_names[month_dir]
+			if name_key(entry.name) in month_names:
+				results.append(self._op_failed('archive', in_path,
+				                               f'the target archive output "{month_dir.joinpath(entry.name)}" already exists.'))
+				continue
+			# Reserve the name so a later file in the inbox can't target it too.
+			month_names.add(name_key(entry.name))
+			result = OpResult('archive', in_path, month_dir.joinpath(entry.name))
+			results.append(result)
+			moves.append(result)
+
+		def move_worker(result):
+			try:
+				move_errors = _rename_or_move(result.in_path, result.out_path)
+			except FileExistsError:
+				# Put there since the month folder was listed.
+				move_errors = [f'the target archive output "{result.out_path}" already exists.']
+			except OSError as err:
+				move_errors = [str(err)]
+			result.err = '; '.join(move_errors)
+			result.ok = move_errors == []
+
+		for move_done in pool.map(move_worker, moves):
+			pass
+
+		for result in moves:
+			if result.ok is True:
+				if self.print_success is True:
+					print(f'"{result.in_path}" was successfully archived to "{result.out_path}"')
+			elif self.print_err is True:
+				print(f'Error, {result.err}')
+		return results
 	
+	@_instrumented
+	def scan(self, dir_path, workers=8, index_path=None):
+		"""This method indexes the folder dir_path in one pass on up to workers threads and returns a TreeIndex of the
+		size, modification time and inode of every file and the modification time, inode and device of every folder
+		(so sizes and counts of any folder in it can be looked up with its totals method).\n
+		If index_path is set then the index is saved there, and if it already has an index of dir_path then that's
+		refreshed instead so only the folders that changed since are scanned again.\n
+		The index can be passed to the delete, copy_to_new_dir and sync_dir methods so they don't list the folders
+		that haven't changed again (delete also takes the sizes of their files from it).\n
+		Raises PathNotFoundError if dir_path isn't a folder."""
+
+		_is_type_or_raise(type(dir_path), paths.Path, 'dir_path')
+		_is_type_or_raise(type(workers), int, 'workers')
+		if index_path is not None:
+			_is_type_or_raise(type(index_path), paths.Path, 'index_path')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+
+		if _is_dir(dir_path) is False:
+			raise PathNotFoundError(f'''the folder to scan "{dir_path}" doesn't exist.''')
+
+		index = None
+		if index_path is not None:
+			index = TreeIndex.load(index_path, dir_path)
+		if index is None:
+			index = TreeIndex(dir_path, _scan_dirs(os.fspath(dir_path), [''], workers))
+		else:
+			index.refresh(workers)
+		if index_path is not None:
+			index.save(index_path)
+
+		if self.print_success is True:
+			file_count, dir_count, total_bytes = index.totals()
+			print(f'"{dir_path}" was successfully scanned ({file_count} files, {dir_count} folders, {total_bytes} bytes)')
+		return index
+
+	@_instrumented
 	def delete(self, del_file_folder_path, del_dir_contents=True, del_in_dir_files=True,
-	           del_in_dir_dirs=True, print_individual_deleted=False):
+	           del_in_dir_dirs=True, print_individual_deleted=False, workers=8, index=None):
 		"""If del_file_folder_path is a file then delete that, if del_dir_contents is True then delete the contents of
-		the input directory. Otherwise if del_dir_contents is False then delete the input directory and all of its contents."""
-		
-		_is_type_or_print_err(type(del_file_folder_path), paths.Path, 'del_file_folder_path')
-		_is_type_or_print_err(type(del_dir_contents), bool, 'del_dir_contents')
-		_is_type_or_print_err(type(del_in_dir_files), bool, 'del_in_dir_files')
-		_is_type_or_print_err(type(del_in_dir_dirs), bool, 'del_in_dir_dirs')
-		_is_type_or_print_err(type(print_individual_deleted), bool, 'print_individual_deleted')
+		the input directory. Otherwise if del_dir_contents is False then delete the input directory and all of its contents.\n
+		Sibling folders are deleted in parallel on up to workers threads.\n
+		index can be a TreeIndex (from the scan method) that has the input folder, then the freed bytes of every folder
+		that hasn't changed since it was indexed are taken from it instead of stat'ing its files before they're deleted
+		(unless print_individual_deleted is True). A file edited in place doesn't change its folder's modification
+		time, so the size it had when it was indexed is used.\n
+		Returns a DeleteStats of the files, folders and bytes that were freed,
+		raises PathNotFoundError if the input doesn't exist."""
+
+		self._check_delete(del_file_folder_path, del_dir_contents, del_in_dir_files, del_in_dir_dirs,
+		                   print_individual_deleted, workers)
+
+		on_deleted = None
+		if print_individual_deleted is True:
+			on_deleted = _print_deleted
+
+		if print_individual_deleted is True:
+			# Each deleted file is printed with its size.
+			index = None
+		del_stats = self._run_delete(del_file_folder_path, del_dir_contents, del_in_dir_files, del_in_dir_dirs,
+		                             workers, on_deleted=on_deleted, index=index)
+
+		if self.print_success is True:
+			if del_stats.is_dir is False:
+				print(f'File "{del_file_folder_path}" was deleted.')
+			elif del_dir_contents is False:
+				print(f'Folder "{del_file_folder_path}" and all of its contents were deleted.')
+			elif del_in_dir_files is True and del_in_dir_dirs is True:
+				print(f'All the contents of "{del_file_folder_path}" were deleted.')
+			elif del_in_dir_dirs is True:
+				print(f'All the folders in "{del_file_folder_path}" were deleted.')
+			elif del_in_dir_files is True:
+				print(f'All the files in "{del_file_folder_path}" were deleted.')
+		return del_stats
+
+	def iter_delete(self, del_file_folder_path, del_dir_contents=True, del_in_dir_files=True,
+	                del_in_dir_dirs=True, workers=8, interval=0.5):
+		"""This generator works like the delete method, but while the delete runs it yields a DeleteStats
+		with the running totals every interval seconds (and the final totals once it's done)
+		so long deletes can be monitored.\n
+		Raises PathNotFoundError if the input doesn't exist."""
+
+		self._check_delete(del_file_folder_path, del_dir_contents, del_in_dir_files, del_in_dir_dirs, False, workers)
+
+		# Every worker registers its own DeleteStats here, so the totals can be summed without any locking.
+		live_stats = []
+		with futures.ThreadPoolExecutor(max_workers=1) as runner:
+			del_future = runner.submit(self._run_delete, del_file_folder_path, del_dir_contents,
+			                           del_in_dir_files, del_in_dir_dirs, workers, live_stats=live_stats)
+			while True:
+				try:
+					del_stats = del_future.result(timeout=interval)
+				except futures.TimeoutError:
+					yield DeleteStats.total(live_stats)
+				else:
+					yield del_stats
+					return
+
+	def _check_delete(self, del_file_folder_path, del_dir_contents, del_in_dir_files, del_in_dir_dirs,
+	                  print_individual_deleted, workers):
+		"""This method checks the delete/iter_delete inputs and raises InvalidInputError if they can't be used."""
+
+		_is_type_or_raise(type(del_file_folder_path), paths.Path, 'del_file_folder_path')
+		_is_type_or_raise(type(del_dir_contents), bool, 'del_dir_contents')
+		_is_type_or_raise(type(del_in_dir_files), bool, 'del_in_dir_files')
+		_is_type_or_raise(type(del_in_dir_dirs), bool, 'del_in_dir_dirs')
+		_is_type_or_raise(type(print_individual_deleted), bool, 'print_individual_deleted')
+		_is_type_or_raise(type(workers), int, 'workers')
 
 		if del_dir_contents is False and del_in_dir_files is True or del_dir_contents is False and del_in_dir_dirs is True:
-			print('Error, del_dir_contents is mutually exclusive, so it must be True for del_in_dir_files'
-			      f' or del_in_dir_dirs to be True, but del_dir_contents={del_dir_contents}')
-			return False
+			raise InvalidInputError('del_dir_contents is mutually exclusive, so it must be True for del_in_dir_files'
+			                        f' or del_in_dir_dirs to be True, but del_dir_contents={del_dir_contents}')
 		elif del_dir_contents is True and del_in_dir_files is False and del_in_dir_dirs is False:
-			print('Error, either del_in_dir_files or del_in_dir_dirs must be True for del_dir_contents to be True.')
-			quit()
+			raise InvalidInputError('either del_in_dir_files or del_in_dir_dirs must be True for del_dir_contents to be True.')
+
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+
+	def _run_delete(self, del_file_folder_path, del_dir_contents, del_in_dir_files, del_in_dir_dirs, workers,
+	                on_deleted=None, live_stats=None, index=None):
+		"""This method deletes the (already checked) input with _delete_tree and returns the DeleteStats,
+		raises PathNotFoundError if the input doesn't exist.\n
+		If index is a TreeIndex that has the input folder then the bytes of the folders that haven't changed since
+		they were indexed come from it instead of a stat of every file (the files of the rest are stat'ed)."""
 
-		if del_file_folder_path.exists() is False:
-			print(f'''Error, target to delete "{del_file_folder_path}" doesn't exist''')
-			return False
+		if index is not None:
+			_is_type_or_raise(type(index), TreeIndex, 'index')
 
-		if del_file_folder_path.is_dir() is False and del_file_folder_path.is_file() is False:
-			print(f'Error, "{del_file_folder_path}" is not a valid file or folder.')
+		# A single lstat tells if the input exists and if it's a file or a folder.
+		try:
+			in_stat = _lstat(del_file_folder_path)
+		except FileNotFoundError:
+			raise PathNotFoundError(f'''target to delete "{del_file_folder_path}" doesn't exist''')
+
+		if stat.S_ISDIR(in_stat.st_mode):
+			known_dirs = None
+			known_bytes = 0
+			if index is not None:
+				known_dirs, known_bytes = index.fresh_bytes(del_file_folder_path,
+				                                            files=del_in_dir_files or not del_dir_contents,
+				                                            sub_dirs=del_in_dir_dirs or not del_dir_contents, workers=workers)
+			del_stats = _delete_tree(del_file_folder_path, workers, del_files=del_in_dir_files or not del_dir_contents,
+			                         del_dirs=del_in_dir_dirs or not del_dir_contents, del_top=not del_dir_contents,
+			                         on_deleted=on_deleted, live_stats=live_stats, known_dirs=known_dirs)
+			del_stats.bytes += known_bytes
+			del_stats.is_dir = True
+		elif stat.S_ISREG(in_stat.st_mode) or stat.S_ISLNK(in_stat.st_mode):
+			os.unlink(del_file_folder_path)
+			del_stats = DeleteStats()
+			del_stats.is_dir = False
+			del_stats.files = 1
+			del_stats.bytes = in_stat.st_size
+			if on_deleted is not None:
+				on_deleted(del_file_folder_path, False, in_stat.st_size)
 		else:
-			if del_file_folder_path.is_dir() is True:
-				# For loop to delete all contents or either all files or all folders in the input directory.
-				if del_dir_contents is True:
-					for content in del_file_folder_path.iterdir():
-						if content.is_dir() and del_in_dir_dirs is True:
-							shutil.rmtree(content)
-							if print_individual_deleted is True:
-								print(f'Deleted folder "{content.name}" and all of its contents.')
-						elif content.is_file() and del_in_dir_files is True:
-							content.unlink()
-							if print_individual_deleted is True:
-								print(f'Deleted file "{content.name}"')
-				else:
-					# Delete the input directory and all of its contents.
-					shutil.rmtree(del_file_folder_path)
-					if self.print_success is True and del_dir_contents is False:
-						print(f'Folder "{del_file_folder_path}" and all of its contents were deleted.')
-				if self.print_success is True:
-					if del_dir_contents is True:
-						if del_in_dir_files is True and del_in_dir_dirs is True:
-							print(f'All the contents of "{del_file_folder_path}" were deleted.')
-						elif del_in_dir_dirs is True:
-							print(f'All the folders in "{del_file_folder_path}" were deleted.')
-						elif del_in_dir_files is True:
-							print(f'All the files in "{del_file_folder_path}" were deleted.')
-			elif del_file_folder_path.is_file() is True:
-				del_file_folder_path.unlink()
-				if self.print_success is True:
-					print(f'File "{del_file_folder_path}" was deleted.')
-	
-	def move_to_new_dir(self, move_file_folder_path, new_dir_path):
-		"""This method will move the input file/folder to the output directory."""
+			raise InvalidInputError(f'"{del_file_folder_path}" is not a valid file or folder.')
+		instrumentation.count('files_deleted', del_stats.files)
+		instrumentation.count('dirs_deleted', del_stats.dirs)
+		instrumentation.count('bytes_deleted', del_stats.bytes)
+		return del_stats
 
-		_is_type_or_print_err(type(move_file_folder_path), paths.Path, 'copy_file_folder_path')
-		_is_type_or_print_err(type(new_dir_path), paths.Path, 'new_dir_path')
+	@_instrumented
+	def move_to_new_dir(self, move_file_folder_path, new_dir_path, verify='size', workers=8, progress=None):
+		"""This method will move the input file/folder to the output directory.\n
+		If the output directory is on a different filesystem (where a rename can't work) then the input is copied
+		on up to workers threads, every copy is checked (by its size, or by hashing both files if verify is "hash")
+		and the input is only deleted once all of them match. If that's interrupted then running the same move
+		again continues it.\n
+		progress can be set to a function that's called with (move_file_folder_path, moved_bytes, total_bytes)
+		as a move to another filesystem copies."""
+
+		_is_type_or_raise(type(move_file_folder_path), paths.Path, 'copy_file_folder_path')
+		_is_type_or_raise(type(new_dir_path), paths.Path, 'new_dir_path')
+		_is_type_or_raise(type(workers), int, 'workers')
+		if verify not in ('size', 'hash'):
+			raise InvalidInputError(f'verify must be "size" or "hash", not "{verify}"')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
 
 		# List of the operation type for error messages.
 		op_type = ['move', 'moved']
 
-		self._check_depend(move_file_folder_path, op_type, new_move_out_dir=new_dir_path)
+		return self._check_depend(move_file_folder_path, op_type, new_move_out_dir=new_dir_path, verify=verify,
+		                          workers=workers, progress=progress)
 
-	def copy_to_new_dir(self, copy_file_folder_path, new_dir_path, new_basename=''):
+	@_instrumented
+	def copy_to_new_dir(self, copy_file_folder_path, new_dir_path, new_basename='', resume=False, progress=None,
+	                    sync=False, manifest_path=None, workers=8, index=None):
 		"""This method will copy the input file/folder into the output directory.\n
-		new_basename can be set to a string to change the output file/folder basename."""
+		new_basename can be set to a string to change the output file/folder basename.\n
+		If resume is True then files are copied to "name.part" first, so running the same copy again after it was
+		interrupted continues from where it stopped (for a folder, into the output folder that was left behind,
+		where the files that were already copied are kept). A file whose source changed since then is copied
+		from the start again.\n
+		progress can be set to a function that's called with (src_path, copied_bytes, total_bytes) as each file copies.\n
+		If sync is True and the input is a folder that was already copied then only new or changed files are copied
+		(see the sync_dir method).\n
+		If manifest_path is set then every file is hashed while it's copied (on up to workers threads) and the path,
+		size, modification time and sha256 digest of each copy is saved there for the verify_manifest method.
+		Copying to the same output again with that manifest only copies the files that changed since.\n
+		index can be a TreeIndex (from the scan method) of the input, then the file names of every folder that hasn't
+		changed since it was indexed are taken from it instead of listing the folder (each file is still stat'ed),
+		and they're copied on up to workers threads (like a sync, symlinked folders are skipped)."""
 
-		_is_type_or_print_err(type(copy_file_folder_path), paths.Path, 'copy_file_folder_path')
-		_is_type_or_print_err(type(new_dir_path), paths.Path, 'new_dir_path')
+		_is_type_or_raise(type(copy_file_folder_path), paths.Path, 'copy_file_folder_path')
+		_is_type_or_raise(type(new_dir_path), paths.Path, 'new_dir_path')
 
 		if new_basename is not None and type(new_basename) is not str:
-			print(f'Error, new_basename must be None or a string, not {type(new_basename)}, "{new_basename}"')
-			return False
+			raise InvalidInputError(f'new_basename must be None or a string, not {type(new_basename)}, "{new_basename}"')
+
+		_is_type_or_raise(type(sync), bool, 'sync')
+		if manifest_path is not None:
+			_is_type_or_raise(type(manifest_path), paths.Path, 'manifest_path')
+			if sync is True:
+				raise InvalidInputError('sync and manifest_path can not both be set (sync_dir has its own manifest_path).')
+		if index is not None:
+			_is_type_or_raise(type(index), TreeIndex, 'index')
+
+		if sync is True and _is_dir(copy_file_folder_path):
+			# Like any other copy a missing output folder is a failed OpResult (sync_dir raises PathNotFoundError).
+			if _is_dir(new_dir_path) is False:
+				return self._op_failed('copy', copy_file_folder_path, f'''the output folder "{new_dir_path}" doesn't exist.''')
+			if new_basename is not None and new_basename != '':
+				return self.sync_dir(copy_file_folder_path, new_dir_path.joinpath(new_basename), progress=progress,
+				                     index=index)
+			return self.sync_dir(copy_file_folder_path, new_dir_path.joinpath(copy_file_folder_path.name),
+			                     progress=progress, index=index)
 
 		# List of the operation type for error messages.
 		op_type = ['copy', 'copied']
 
-		self._check_depend(copy_file_folder_path, op_type, replace_name_with_this=new_basename,
-		                   new_move_out_dir=new_dir_path, copy=True)
+		return self._check_depend(copy_file_folder_path, op_type, replace_name_with_this=new_basename,
+		                          new_move_out_dir=new_dir_path, copy=True, resume=resume, progress=progress,
+		                          manifest_path=manifest_path, workers=workers, index=index)
+
+	@_instrumented
+	def sync_dir(self, src_dir_path, dst_dir_path, use_hash=False, prune=False, manifest_path=None, workers=8,
+	             progress=None, index=None):
+		"""This method copies the folder src_dir_path to dst_dir_path, but if dst_dir_path already exists
+		then only files that are new or changed (by size and modification time) are copied.\n
+		If use_hash is True then files that are the same size are compared by their contents instead,
+		which reads both files.\n
+		If prune is True then anything in dst_dir_path that isn't in src_dir_path is deleted.\n
+		If manifest_path is set then what was synced is saved there, and the next sync with the same manifest_path
+		only compares the files that changed size or modification time since then with the destination, and doesn't
+		scan the destination folders where nothing changed (so it mustn't be changed outside of syncs).\n
+		Source files that can't be read (like broken symlinks) are skipped and listed in the SyncResult errors.\n
+		index can be a TreeIndex (from the scan method) of src_dir_path, then the file names of every source folder
+		that hasn't changed since it was indexed are taken from it instead of listing the folder. Each file is still
+		stat'ed before it's compared, so a file edited in place since the scan is still synced.\n
+		Returns a SyncResult, raises PathNotFoundError if src_dir_path or the parent of dst_dir_path doesn't exist."""
+
+		_is_type_or_raise(type(src_dir_path), paths.Path, 'src_dir_path')
+		_is_type_or_raise(type(dst_dir_path), paths.Path, 'dst_dir_path')
+		_is_type_or_raise(type(use_hash), bool, 'use_hash')
+		_is_type_or_raise(type(prune), bool, 'prune')
+		_is_type_or_raise(type(workers), int, 'workers')
+		if manifest_path is not None:
+			_is_type_or_raise(type(manifest_path), paths.Path, 'manifest_path')
+		if index is not None:
+			_is_type_or_raise(type(index), TreeIndex, 'index')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+
+		if _is_dir(src_dir_path) is False:
+			raise PathNotFoundError(f'''the input folder to sync "{src_dir_path}" doesn't exist.''')
+		if _is_dir(dst_dir_path.parent) is False:
+			raise PathNotFoundError(f'''the output folder "{dst_dir_path.parent}" doesn't exist.''')
 
+		manifest_dirs = {}
+		if manifest_path is not None:
+			manifest_dirs = _load_sync_manifest(manifest_path, src_dir_path, dst_dir_path)
+
+		sync_result, new_manifest_dirs = _sync_tree(src_dir_path, dst_dir_path, use_hash=use_hash, prune=prune,
+		                                            manifest_dirs=manifest_dirs, workers=workers, progress=progress,
+		                                            src_index=index)
+
+		if manifest_path is not None:
+			_save_json(manifest_path, {'src': os.fspath(src_dir_path), 'dst': os.fspath(dst_dir_path),
+			                           'dirs': new_manifest_dirs})
+
+		if self.print_success is True:
+			print(f'"{src_dir_path}" was successfully synced to "{dst_dir_path}" '
+			      f'({sync_result.copied} new, {sync_result.updated} updated, {sync_result.pruned} pruned)')
+		return sync_result
+
+	@_instrumented
 	def rename(self, rename_file_folder_path, new_name):
 		"""This method will rename the input file/folder into the same directory.\n
 		new_name can't be an empty string."""
 
-		_is_type_or_print_err(type(rename_file_folder_path), paths.Path, 'rename_file_folder_path')
-		_is_type_or_print_err(type(new_name), str, 'new_name')
+		_is_type_or_raise(type(rename_file_folder_path), paths.Path, 'rename_file_folder_path')
+		_is_type_or_raise(type(new_name), str, 'new_name')
 
 		if new_name == '':
-			print("Error, new_name can't be an empty string.")
-			quit()
+			raise InvalidInputError("new_name can't be an empty string.")
 
 		# List of the operation type for error messages.
 		op_type = ['rename', 'renamed']
 
-		self._check_depend(rename_file_folder_path, op_type, replace_name_with_this=new_name)
+		return self._check_depend(rename_file_folder_path, op_type, replace_name_with_this=new_name)
+
+	@_instrumented
+	def rename_many(self, renames, template=None, pattern=None, repl='', journal_path=None, dry_run=False):
+		"""This method renames many files/folders (each in its own directory) at once.\n
+		renames is either a dict of path to the new full name (with the extension) or a list of paths whose new names
+		come from template, a str.format string that can use {name}, {stem}, {ext} and {n} (the 1 based position
+		in the list, so "{n:03}{ext}" numbers the files), and/or from replacing the regex pattern with repl.\n
+		Names that swap or chain (A->B and B->C) are fine, they're done in a safe order.\n
+		If journal_path is set then each rename is written there as it's done, so an interrupted batch can be
+		undone with rollback_renames or finished with resume_renames. journal_path must not already exist.\n
+		If dry_run is True then nothing is renamed.\n
+		Returns a RenameResult, nothing is renamed if it has any conflicts. If a target turns up while the renames are
+		being done then FileExistsError is raised instead of replacing it (the journal can undo what was done)."""
+
+		_is_type_or_raise(type(dry_run), bool, 'dry_run')
+		if journal_path is not None:
+			_is_type_or_raise(type(journal_path), paths.Path, 'journal_path')
+
+		if type(renames) is dict:
+			rename_pairs = list(renames.items())
+		else:
+			if template is None and pattern is None:
+				raise InvalidInputError('template or pattern must be set if renames is a list of paths.')
+			name_regex = re.compile(pattern) if pattern is not None else None
+			rename_pairs = []
+			for position, in_path in enumerate(renames, 1):
+				in_path = paths.Path(in_path)
+				new_name = in_path.name
+				if template is not None:
+					new_name = template.format(name=in_path.name, stem=in_path.stem, ext=in_path.suffix, n=position)
+				if name_regex is not None:
+					new_name = name_regex.sub(repl, new_name)
+				rename_pairs.append((in_path, new_name))
+
+		rename_result = _plan_renames(rename_pairs)
+		# Only resume_renames adds to an existing journal, a new batch would lose the undo steps of the one in it.
+		if journal_path is not None and dry_run is False and _exists(journal_path):
+			rename_result.conflicts.append(f'the rename journal "{journal_path}" already exists')
+		if rename_result.conflicts != []:
+			if self.print_err is True:
+				for conflict in rename_result.conflicts:
+					print(f'Error, {conflict}.')
+			return rename_result
+
+		if dry_run is False:
+			_apply_rename_steps(rename_result.steps, journal_path)
+			if self.print_success is True:
+				print(f'{len(rename_result.renamed)} files/folders were successfully renamed.')
+		return rename_result
+
+	@_instrumented
+	def rollback_renames(self, journal_path):
+		"""This method undoes the renames a rename_many call with journal_path did (even if it was interrupted),
+		returns an OpResult."""
+
+		_is_type_or_raise(type(journal_path), paths.Path, 'journal_path')
+		op = 'rollback_renames'
+
+		steps, done_steps = _read_rename_journal(journal_path)
+		if steps is None:
+			return self._op_failed(op, journal_path, f'"{journal_path}" is not a rename journal.')
+		with open(journal_path, 'a', encoding='utf-8') as journal_file:
+			for step_index in sorted(done_steps, reverse=True):
+				from_path, to_path = steps[step_index]
+				os.rename(to_path, from_path)
+				journal_file.write(json.dumps({'undone': step_index}) + '\n')
+				journal_file.flush()
+		if self.print_success is True:
+			print(f'{len(done_steps)} renames from "{journal_path}" were undone.')
+		return OpResult(op, journal_path, ok=True)
+
+	@_instrumented
+	def resume_renames(self, journal_path):
+		"""This method finishes the renames of an interrupted rename_many call with journal_path, returns an OpResult."""
+
+		_is_type_or_raise(type(journal_path), paths.Path, 'journal_path')
+		op = 'resume_renames'
+
+		steps, done_steps = _read_rename_journal(journal_path)
+		if steps is None:
+			return self._op_failed(op, journal_path, f'"{journal_path}" is not a rename journal.')
+		_apply_rename_steps(steps, journal_path, done_steps)
+		if self.print_success is True:
+			print(f'{len(steps) - len(done_steps)} remaining renames from "{journal_path}" were done.')
+		return OpResult(op, journal_path, ok=True)
 
-	def duplicate(self, copy_file_folder_path, append_str=''):
+	@_instrumented
+	def duplicate(self, copy_file_folder_path, append_str='', resume=False, progress=None, manifest_path=None,
+	              workers=8):
 		"""This method will duplicate the input file/folder into the same directory.\n
-		append_str can be set to set a custom value for what is appended to the copied file/folder basename."""
+		append_str can be set to set a custom value for what is appended to the copied file/folder basename.\n
+		resume, progress, manifest_path and workers work the same as they do for the copy_to_new_dir method."""
 		
-		_is_type_or_print_err(type(copy_file_folder_path), paths.Path, 'copy_file_folder_path')
-		_is_type_or_print_err(type(append_str), str, 'append_str')
+		_is_type_or_raise(type(copy_file_folder_path), paths.Path, 'copy_file_folder_path')
+		_is_type_or_raise(type(append_str), str, 'append_str')
+		if manifest_path is not None:
+			_is_type_or_raise(type(manifest_path), paths.Path, 'manifest_path')
 
 		if append_str == '':
 			append_this = ' copy'
@@ -353,34 +3207,73 @@ class Paths:
 		# List of the operation type for error messages.
 		op_type = ['duplicate', 'duplicated']
 
-		self._check_depend(copy_file_folder_path, op_type,
-		                   replace_name_with_this=copy_file_folder_path.stem + append_this, copy=True)
+		return self._check_depend(copy_file_folder_path, op_type,
+		                          replace_name_with_this=copy_file_folder_path.stem + append_this, copy=True,
+		                          resume=resume, progress=progress, manifest_path=manifest_path, workers=workers)
+
+	@_instrumented
+	def verify_manifest(self, manifest_path, root_dir_path=None, workers=8):
+		"""This method hashes every file in a manifest written by copy_to_new_dir/duplicate on up to workers threads
+		and checks them against their recorded size and digest.\n
+		The files are looked for in the folder the copy was made in, unless root_dir_path is set
+		(for example to check the source of the copy instead).\n
+		Returns a VerifyResult, which is truthy only if every file matched."""
+
+		_is_type_or_raise(type(manifest_path), paths.Path, 'manifest_path')
+		_is_type_or_raise(type(workers), int, 'workers')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+
+		try:
+			with open(manifest_path, encoding='utf-8') as manifest_file:
+				manifest = json.load(manifest_file)
+		except (FileNotFoundError, ValueError):
+			raise PathNotFoundError(f'"{manifest_path}" is not a copy manifest.')
+		if 'files' not in manifest or 'dst' not in manifest:
+			raise PathNotFoundError(f'"{manifest_path}" is not a copy manifest.')
+
+		if root_dir_path is None:
+			root_dir_path = paths.Path(manifest['dst']).parent
+		else:
+			_is_type_or_raise(type(root_dir_path), paths.Path, 'root_dir_path')
+
+		verify_result = _verify_files(root_dir_path, manifest['files'], manifest.get('algorithm', 'sha256'), workers)
+		if verify_result:
+			if self.print_success is True:
+				print(f'All {verify_result.matched} files in "{manifest_path}" match.')
+		elif self.print_err is True:
+			for file_path in verify_result.mismatched:
+				print(f'Error, "{file_path}" is different from the manifest.')
+			for file_path in verify_result.missing:
+				print(f'''Error, "{file_path}" doesn't exist.''')
+		return verify_result
 	
-	def change_ext(self, change_ext_file_path, new_ext, keep_orig_file=True, new_out_path=None):
+	@_instrumented
+	def change_ext(self, change_ext_file_path, new_ext, keep_orig_file=True, new_out_path=None, resume=False,
+	               progress=None):
 		"""This method will change the extension for the input file/folder\n
 		new_ext must be in the ".ext" format.\n
 		if keep_orig_file is True then the input file will be duplicated with a different extensions instead of
 		overwriting the input.\n
-		If new_out_path is a path.Path then the output with the new extension will be in a different directory."""
+		If new_out_path is a path.Path then the output with the new extension will be in a different directory.\n
+		resume and progress work the same as they do for the copy_to_new_dir method (when keep_orig_file is True)."""
 
-		_is_type_or_print_err(type(change_ext_file_path), paths.Path, 'change_ext_file_path')
-		_is_type_or_print_err(type(new_ext), str, 'new_ext')
-		_is_type_or_print_err(type(keep_orig_file), bool, 'keep_orig_file')
+		_is_type_or_raise(type(change_ext_file_path), paths.Path, 'change_ext_file_path')
+		_is_type_or_raise(type(new_ext), str, 'new_ext')
+		_is_type_or_raise(type(keep_orig_file), bool, 'keep_orig_file')
 
-		if new_out_path is not None and type(new_out_path) is not paths.PosixPath and paths.WindowsPath:
-			print(f'Error, new_out_path must be None or a pathlib.Path, not {type(new_out_path)}, "{new_out_path}"')
-			return False
+		if new_out_path is not None and type(new_out_path) is not paths.PosixPath and type(new_out_path) is not paths.WindowsPath:
+			raise InvalidInputError(f'new_out_path must be None or a pathlib.Path, not {type(new_out_path)}, "{new_out_path}"')
 
 		# Set out_ext to new_ext because the input is a file.
-		if change_ext_file_path.is_file():
+		if _is_file(change_ext_file_path):
 			if change_ext_file_path.suffix == new_ext:
-				print(f'Error, the target output extension "{new_ext}" is the same as the input extension so nothing happened.')
-				print('\nPlease use the duplicate method if you want to copy a file.')
-				return False
+				return self._op_failed('new extension', change_ext_file_path,
+				                       f'the target output extension "{new_ext}" is the same as the input extension so '
+				                       f'nothing happened.\nPlease use the duplicate method if you want to copy a file.')
 			
 			if new_ext[0] != '.':
-				print(f'Error, the new_ext "{new_ext}" must begin with a period.')
-				quit()
+				raise InvalidInputError(f'the new_ext "{new_ext}" must begin with a period.')
 
 			if keep_orig_file is True:
 				copy_bool = True
@@ -393,45 +3286,163 @@ class Paths:
 			else:
 				op_type.append('changed')
 
-			self._check_depend(change_ext_file_path, op_type, new_ext=new_ext,
-			                   new_move_out_dir=new_out_path, copy=copy_bool)
+			return self._check_depend(change_ext_file_path, op_type, new_ext=new_ext,
+			                          new_move_out_dir=new_out_path, copy=copy_bool, resume=resume, progress=progress)
 
-		elif change_ext_file_path.is_dir():
-			if self.print_err is True:
-				print(f'Error, aborted changing the extension because new_ext was specified but'
-				      f' the input "{change_ext_file_path}" is a folder.')
-			return False
+		elif _is_dir(change_ext_file_path):
+			return self._op_failed('new extension', change_ext_file_path,
+			                       f'aborted changing the extension because new_ext was specified but'
+			                       f' the input "{change_ext_file_path}" is a folder.')
 		else:
-			if self.print_err is True:
-				print(f'''Error, the input file "{change_ext_file_path}" doesn't exist.''')
-			return False
-		
+			return self._op_failed('new extension', change_ext_file_path,
+			                       f'''the input file "{change_ext_file_path}" doesn't exist.''')
+
+	@_instrumented
+	def copy_many(self, jobs, workers=8):
+		"""This method copies many files/folders at once.\n
+		jobs is an iterable of (copy_file_folder_path, new_dir_path) or
+		(copy_file_folder_path, new_dir_path, new_basename) tuples that are copied on at most workers threads.\n
+		Returns a list of OpResult (in the same order as jobs) instead of printing anything."""
+
+		return self._run_many(jobs, workers, copy=True)
+
+	@_instrumented
+	def move_many(self, jobs, workers=8):
+		"""This method moves many files/folders at once.\n
+		jobs is an iterable of (move_file_folder_path, new_dir_path) or
+		(move_file_folder_path, new_dir_path, new_basename) tuples that are moved on at most workers threads.\n
+		Returns a list of OpResult (in the same order as jobs) instead of printing anything."""
+
+		return self._run_many(jobs, workers, copy=False)
+
+	def _run_many(self, jobs, workers, copy):
+		"""This method plans every job up front (so each output directory is only listed once and
+		jobs can't collide with each other) then runs the copies/moves on a thread pool.\n
+		The planned names are compared exactly, so on a case-insensitive volume "Report.txt" doesn't collide with
+		"report.txt" until it's written. That's why file copies create their target with O_EXCL and moves check
+		the target right before the rename, either way the job fails instead of replacing the existing file."""
+
+		_is_type_or_raise(type(workers), int, 'workers')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+
+		op = 'copy' if copy is True else 'move'
+		results = []
+		planned = []
+		# Names in each output directory, listed once and shared by every job that targets that directory.
+		# 	A directory that doesn't exist is stored as None.
+		dir_names = {}
+
+		for job in jobs:
+			if type(job) is not tuple and type(job) is not list or len(job) not in (2, 3):
+				result = OpResult(op, job)
+				result.err = 'a job must be a (path, new_dir_path) or (path, new_dir_path, new_basename) tuple'
+				results.append(result)
+				continue
+
+			in_path, new_dir_path = job[0], job[1]
+			new_name = job[2] if len(job) == 3 else None
+			result = OpResult(op, in_path)
+			results.append(result)
+
+			if type(in_path) is not paths.PosixPath and type(in_path) is not paths.WindowsPath:
+				result.err = f'the input must be a pathlib PosixPath or WindowsPath, not "{type(in_path)}"'
+				continue
+			if type(new_dir_path) is not paths.PosixPath and type(new_dir_path) is not paths.WindowsPath:
+				result.err = f'the output folder must be a pathlib PosixPath or WindowsPath, not "{type(new_dir_path)}"'
+				continue
+			if new_name is not None and type(new_name) is not str:
+				result.err = f'new_basename must be None or a string, not "{type(new_name)}"'
+				continue
+			if new_name is not None and new_name.startswith('.'):
+				result.err = f'new_basename "{new_name}" can not start with a "." (those are reserved for hidden files).'
+				continue
+
+			# Same naming rule as _check_depend: the new basename (or the input stem) plus the input extension.
+			if new_name is not None and new_name != '':
+				out_name = new_name + in_path.suffix
+			else:
+				out_name = in_path.name
+
+			if new_dir_path not in dir_names:
+				try:
+					with os.scandir(new_dir_path) as dir_entries:
+						dir_names[new_dir_path] = {entry.name for entry in dir_entries}
+				except (FileNotFoundError, NotADirectoryError):
+					dir_names[new_dir_path] = None
+			taken_names = dir_names[new_dir_path]
+
+			if taken_names is None:
+				result.err = f'''the output folder "{new_dir_path}" doesn't exist.'''
+			elif out_name in taken_names:
+				result.err = f'the target output "{new_dir_path.joinpath(out_name)}" already exists.'
+			else:
+				# Reserve the name so a later job in this batch can't target it too.
+				taken_names.add(out_name)
+				planned.append((result, new_dir_path.joinpath(out_name)))
+
+		def run_job(result, out_path):
+			try:
+				if copy is True:
+					# One stat per job, which also raises FileNotFoundError if the input is missing.
+					if stat.S_ISDIR(_stat(result.in_path).st_mode):
+						shutil.copytree(result.in_path, out_path, copy_function=_copy_file, ignore=_count_copytree_dir)
+					else:
+						# Without O_EXCL a file whose name only differs by case (on a case-insensitive volume) is overwritten.
+						_copy_file(result.in_path, out_path, exclusive=True)
+				else:
+					move_errors = _rename_or_move(result.in_path, out_path)
+					if move_errors != []:
+						result.err = '; '.join(move_errors)
+						return
+			except FileNotFoundError:
+				result.err = f'''the input "{result.in_path}" doesn't exist.'''
+			except FileExistsError:
+				result.err = f'the target output "{out_path}" already exists.'
+			except OSError as err:
+				result.err = str(err)
+			else:
+				result.out_path = out_path
+				result.ok = True
+
+		with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+			for job_future in [pool.submit(run_job, result, out_path) for result, out_path in planned]:
+				job_future.result()
+
+		return results
+
 	def _check_depend(self, in_file_or_dir_path, operation_type_list, replace_name_with_this='',
-	                  new_ext='', append_this='', new_move_out_dir=None, copy=False):
+	                  new_ext='', append_this='', new_move_out_dir=None, copy=False, resume=False, progress=None,
+	                  verify='size', workers=8, manifest_path=None, index=None):
 		"""This method renames the input, but if the path is changed then it will move the input.\n
 		If find_this is specified then it will only rename a file from within the input folder if they have the same
 		name and extension (name.ext).\n
 		new_move_out_dir can be set for the move, copy, and change_ext methods.\n
-		the copy_to_new_dir and duplicate methods have copy set to True so it copies the file instead of moving it.
+		the copy_to_new_dir and duplicate methods have copy set to True so it copies the file instead of moving it
+		(with _copy_file, resume and progress are passed on to that).\n
+		Moves to another filesystem are done by _move_across_devices (with verify, workers and progress).\n
+		If manifest_path or index is set then the copy is done by _copy_tree instead.\n
+		Returns an OpResult (that has the output path if the operation succeeded).
 		"""
 		
-		_is_type_or_print_err(type(in_file_or_dir_path), paths.Path, 'in_file_or_dir_path')
-		_is_type_or_print_err(type(operation_type_list), list, 'operation_type_list')
-		_is_type_or_print_err(type(replace_name_with_this), str, 'replace_name_with_this')
-		_is_type_or_print_err(type(copy), bool, 'copy')
-		_is_type_or_print_err(type(append_this), str, 'append_this')
-		_is_type_or_print_err(type(new_ext), str, 'new_ext')
-
-		# If the input doesn't exist then print an error message and return False (the file doesn't exist)
-		if in_file_or_dir_path.exists() is False:
+		_is_type_or_raise(type(in_file_or_dir_path), paths.Path, 'in_file_or_dir_path')
+		_is_type_or_raise(type(operation_type_list), list, 'operation_type_list')
+		_is_type_or_raise(type(replace_name_with_this), str, 'replace_name_with_this')
+		_is_type_or_raise(type(copy), bool, 'copy')
+		_is_type_or_raise(type(resume), bool, 'resume')
+		_is_type_or_raise(type(append_this), str, 'append_this')
+		_is_type_or_raise(type(new_ext), str, 'new_ext')
+
+		op = operation_type_list[0]
+
+		# If the input doesn't exist then return a failed OpResult (the file doesn't exist)
+		if _exists(in_file_or_dir_path) is False:
 			if in_file_or_dir_path.suffix != '':
-				if self.print_err is True:
-					print(f'''Error, the input file to {operation_type_list[0]} "{in_file_or_dir_path}" doesn't exist.''')
-				return False
+				return self._op_failed(op, in_file_or_dir_path,
+				                       f'''the input file to {op} "{in_file_or_dir_path}" doesn't exist.''')
 			else:
-				if self.print_err is True:
-					print(f'''Error, the input folder to {operation_type_list[0]} "{in_file_or_dir_path}" doesn't exist.''')
-				return False
+				return self._op_failed(op, in_file_or_dir_path,
+				                       f'''the input folder to {op} "{in_file_or_dir_path}" doesn't exist.''')
 
 		# Set out_ext to new_ext if it's specified.
 		if new_ext != '':
@@ -439,11 +3450,10 @@ class Paths:
 		else:
 			out_ext = in_file_or_dir_path.suffix
 
-		# The new name for the output is formatted using system names so print an error.
+		# The new name for the output is formatted using system names so raise an error.
 		if replace_name_with_this.startswith('.'):
-			print(f'Error, replace_name_with_this "{replace_name_with_this}" can not start with a "."'
-			      f' (those are reserved for hidden files).')
-			return False
+			raise InvalidInputError(f'replace_name_with_this "{replace_name_with_this}" can not start with a "."'
+			                        f' (those are reserved for hidden files).')
 		elif replace_name_with_this != '':
 			out_name = replace_name_with_this + append_this + out_ext
 		else:
@@ -452,10 +3462,9 @@ class Paths:
 		# If a "new_move_out_dir" is specified in the initial input
 		# 	then create a path object pointing to the new output directory "new_move_out_dir".
 		if new_move_out_dir is not None:
-			_is_type_or_print_err(type(new_move_out_dir), paths.Path, 'new_move_out_dir')
-			if new_move_out_dir.is_dir() is False:
-				print(f'''Error, the output folder "{new_move_out_dir}" doesn't exist.''')
-				return False
+			_is_type_or_raise(type(new_move_out_dir), paths.Path, 'new_move_out_dir')
+			if _is_dir(new_move_out_dir) is False:
+				return self._op_failed(op, in_file_or_dir_path, f'''the output folder "{new_move_out_dir}" doesn't exist.''')
 			else:
 				# If the input is a file it will append the appropriate extension,
 				# 	otherwise if the input is a folder it will append an empty string which won't do anything.
@@ -463,19 +3472,672 @@ class Paths:
 		else:
 			out_path = in_file_or_dir_path.with_name(out_name)
 
-		# Check if output already exists.
-		if out_path.exists():
-				print(f'Error, the target {operation_type_list[0]} output "{out_path}" already exists.')
-				return False
+		cross_device = copy is False and _is_cross_device(in_file_or_dir_path, out_path.parent)
+		# An output that has a manifest of an earlier verified copy is updated.
+		update_copy = manifest_path is not None and _load_copy_manifest(manifest_path, out_path) != {}
+
+		# A folder copy with resume continues in the output folder an interrupted copy left behind.
+		resume_dir = copy is True and resume is True and _is_dir(in_file_or_dir_path) and _is_dir(out_path)
+
+		# Check if output already exists (unless it's from a move to another filesystem that was interrupted).
+		if _exists(out_path) and update_copy is False and resume_dir is False and \
+		   (cross_device is False or _move_in_progress(in_file_or_dir_path, out_path) is False):
+			return self._op_failed(op, in_file_or_dir_path, f'the target {op} output "{out_path}" already exists.')
 		else:
 			# No issues were encountered so perform the operation.
 			if copy is True:
-				if in_file_or_dir_path.is_dir():
-					shutil.copytree(in_file_or_dir_path, out_path)
-				else:
-					shutil.copy2(in_file_or_dir_path, out_path)
+				try:
+					if manifest_path is not None or index is not None:
+						_copy_tree(in_file_or_dir_path, out_path, manifest_path, workers, resume, progress, index=index)
+					elif _is_dir(in_file_or_dir_path):
+						shutil.copytree(in_file_or_dir_path, out_path, copy_function=_copy_function(resume, progress),
+						                ignore=_count_copytree_dir, dirs_exist_ok=resume_dir)
+					else:
+						_copy_file(in_file_or_dir_path, out_path, resume=resume, progress=progress, exclusive=True)
+				except OperationCancelled:
+					# A cancelled copy that can't be resumed would leave an output that looks finished but isn't.
+					if resume is False and update_copy is False:
+						_remove_partial_copy(out_path)
+					raise
 			else:
-				in_file_or_dir_path.rename(out_path)
+				if cross_device is False:
+					try:
+						in_file_or_dir_path.rename(out_path)
+					except OSError as err:
+						# Some mounts share a device but still can't be renamed across.
+						if err.errno != errno.EXDEV:
+							raise
+						cross_device = True
+				if cross_device is True:
+					move_errors = _move_across_devices(in_file_or_dir_path, out_path, workers, verify, progress)
+					if move_errors != []:
+						return self._op_failed(op, in_file_or_dir_path,
+						                       f'the {op} to "{out_path}" stopped (running it again continues it), '
+						                       + '; '.join(move_errors))
 			if self.print_success is True:
 				# If operation_type_list is copy then set copy_plural to the plural copy (copied)
 				print(f'"{in_file_or_dir_path}" was successfully {operation_type_list[1]} to "{out_path}"')
+			return OpResult(op, in_file_or_dir_path, out_path, ok=True)
+
+	def _op_failed(self, op, in_path, err):
+		"""This method prints err (if print_err is True) and returns it as a failed OpResult."""
+
+		if self.print_err is True:
+			print(f'Error, {err}')
+		return OpResult(op, in_path, err=err)
+
+class AsyncPaths:
+	"""This class has the Paths methods as coroutines for asyncio. The file work runs on a thread pool of at most
+	max_concurrent threads so hundreds of operations can be awaited at once without blocking the event loop.\n
+	If one of the coroutines is cancelled then the copy/delete it's running stops at the next file (or chunk of a
+	big file) by raising OperationCancelled in its thread."""
+
+	def __init__(self, print_success=True, print_err=True, max_concurrent=32):
+		self.paths = Paths(print_success, print_err)
+		self.max_concurrent = max_concurrent
+		self._executor = futures.ThreadPoolExecutor(max_workers=max_concurrent)
+		self._limit = None
+
+	async def create_dir(self, parent_dir_path, new_dir_name):
+		return await self._run(self.paths.create_dir, parent_dir_path, new_dir_name)
+
+	async def create_cur_year_month_dir(self, parent_dir_path):
+		return await self._run(self.paths.create_cur_year_month_dir, parent_dir_path)
+
+	async def del_ds_store(self, del_ds_dir_or_dir_list, **kwargs):
+		return await self._run(self.paths.del_ds_store, del_ds_dir_or_dir_list, **kwargs)
+
+	async def sweep_junk(self, sweep_dir_or_dir_list, **kwargs):
+		return await self._run(self.paths.sweep_junk, sweep_dir_or_dir_list, **kwargs)
+
+	async def delete(self, del_file_folder_path, del_dir_contents=True, del_in_dir_files=True, del_in_dir_dirs=True,
+	                 workers=8, index=None):
+		"""This method works like Paths.delete (without printing each deleted file)."""
+
+		def run_delete(check_cancelled):
+			self.paths._check_delete(del_file_folder_path, del_dir_contents, del_in_dir_files, del_in_dir_dirs,
+			                         False, workers)
+			return self.paths._run_delete(del_file_folder_path, del_dir_contents, del_in_dir_files, del_in_dir_dirs,
+			                              workers, on_deleted=lambda *deleted: check_cancelled(), index=index)
+		return await self._run_cancellable(run_delete)
+
+	async def move_to_new_dir(self, move_file_folder_path, new_dir_path, verify='size', workers=8, progress=None):
+		return await self._run_with_progress(self.paths.move_to_new_dir, progress, move_file_folder_path, new_dir_path,
+		                                     verify, workers)
+
+	async def rename(self, rename_file_folder_path, new_name):
+		return await self._run(self.paths.rename, rename_file_folder_path, new_name)
+
+	async def copy_to_new_dir(self, copy_file_folder_path, new_dir_path, new_basename='', resume=False, progress=None,
+	                          sync=False, manifest_path=None, workers=8, index=None):
+		return await self._run_with_progress(self.paths.copy_to_new_dir, progress, copy_file_folder_path, new_dir_path,
+		                                     new_basename, resume, sync=sync, manifest_path=manifest_path,
+		                                     workers=workers, index=index)
+
+	async def duplicate(self, copy_file_folder_path, append_str='', resume=False, progress=None, manifest_path=None,
+	                    workers=8):
+		return await self._run_with_progress(self.paths.duplicate, progress, copy_file_folder_path, append_str, resume,
+		                                     manifest_path=manifest_path, workers=workers)
+
+	async def verify_manifest(self, manifest_path, root_dir_path=None, workers=8):
+		return await self._run(self.paths.verify_manifest, manifest_path, root_dir_path, workers)
+
+	async def scan(self, dir_path, workers=8, index_path=None):
+		return await self._run(self.paths.scan, dir_path, workers, index_path)
+
+	async def change_ext(self, change_ext_file_path, new_ext, keep_orig_file=True, new_out_path=None, resume=False,
+	                     progress=None):
+		return await self._run_with_progress(self.paths.change_ext, progress, change_ext_file_path, new_ext,
+		                                     keep_orig_file, new_out_path, resume)
+
+	async def sync_dir(self, src_dir_path, dst_dir_path, progress=None, **kwargs):
+		return await self._run_with_progress(self.paths.sync_dir, progress, src_dir_path, dst_dir_path, **kwargs)
+
+	async def copy_many(self, jobs, workers=8):
+		return await self._run(self.paths.copy_many, jobs, workers)
+
+	async def move_many(self, jobs, workers=8):
+		return await self._run(self.paths.move_many, jobs, workers)
+
+	def close(self):
+		"""This method stops the thread pool."""
+		self._executor.shutdown(wait=False)
+
+	async def _run(self, method, *args, **kwargs):
+		async with self._concurrency_limit():
+			return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: method(*args, **kwargs))
+
+	async def _run_with_progress(self, method, progress, *args, **kwargs):
+		# Checking for cancellation from the progress function stops a copy between chunks.
+		def run_method(check_cancelled):
+			def cancellable_progress(src_path, copied_bytes, total_bytes):
+				check_cancelled()
+				if progress is not None:
+					progress(src_path, copied_bytes, total_bytes)
+			return method(*args, progress=cancellable_progress, **kwargs)
+		return await self._run_cancellable(run_method)
+
+	async def _run_cancellable(self, run_func):
+		"""Run run_func(check_cancelled) on the thread pool, check_cancelled raises OperationCancelled once the
+		awaiting coroutine has been cancelled."""
+
+		cancelled = threading.Event()
+
+		def check_cancelled():
+			if cancelled.is_set():
+				raise OperationCancelled()
+
+		async with self._concurrency_limit():
+			run_future = asyncio.get_running_loop().run_in_executor(self._executor, run_func, check_cancelled)
+			try:
+				return await asyncio.shield(run_future)
+			except asyncio.CancelledError:
+				cancelled.set()
+				# Wait for the thread to stop so the concurrency limit stays accurate.
+				try:
+					await run_future
+				except OperationCancelled:
+					pass
+				raise
+
+	def _concurrency_limit(self):
+		# Created on first use so it belongs to the running event loop.
+		if self._limit is None:
+			self._limit = asyncio.Semaphore(self.max_concurrent)
+		return self._limit
+
+# inotify flags from <sys/inotify.h>.
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+def _walk_files(dir_path, recursive=True):
+	"""Yields (path, stat_result) for every file in dir_path (and its sub-folders if recursive is True),
+	symlinked folders aren't followed."""
+
+	dir_stack = [dir_path]
+	while dir_stack:
+		cur_dir = dir_stack.pop()
+		try:
+			with os.scandir(cur_dir) as dir_entries:
+				for entry in dir_entries:
+					try:
+						if entry.is_dir(follow_symlinks=False):
+							if recursive is True:
+								dir_stack.append(entry.path)
+						else:
+							yield entry.path, _entry_stat(entry, follow_symlinks=False)
+					except FileNotFoundError:
+						continue
+		except (FileNotFoundError, NotADirectoryError):
+			continue
+
+class _InotifyWatcher:
+	"""This class reads the paths of files that were written or moved into the watched folders from inotify
+	(Linux only), new sub-folders are watched as they appear."""
+
+	def __init__(self, watch_dirs, recursive=True):
+		import ctypes
+		self._ctypes = ctypes
+		libc = ctypes.CDLL(None, use_errno=True)
+		self._add_watch = libc.inotify_add_watch
+		self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+		self._add_watch.restype = ctypes.c_int
+		self.fd = libc.inotify_init1(_IN_CLOEXEC)
+		if self.fd < 0:
+			err_num = ctypes.get_errno()
+			raise OSError(err_num, os.strerror(err_num))
+		self.recursive = recursive
+		# Watch descriptor to the folder it watches.
+		self._wd_dirs = {}
+		# Set when the kernel's event queue overflowed, so changes were lost.
+		self.overflowed = False
+		for watch_dir in watch_dirs:
+			self._watch_tree(os.fspath(watch_dir))
+
+	def _watch_tree(self, dir_path):
+		"""Watch dir_path (and its sub-folders if recursive), returns the files already in the folders
+		(they could have been written before the watch was added)."""
+
+		found_files = []
+		dir_stack = [dir_path]
+		while dir_stack:
+			cur_dir = dir_stack.pop()
+			wd = self._add_watch(self.fd, os.fsencode(cur_dir), _INOTIFY_MASK)
+			if wd < 0:
+				err_num = self._ctypes.get_errno()
+				# The folder is already gone.
+				if err_num in (errno.ENOENT, errno.ENOTDIR):
+					continue
+				raise OSError(err_num, f'{os.strerror(err_num)}: "{cur_dir}"')
+			self._wd_dirs[wd] = cur_dir
+			try:
+				with os.scandir(cur_dir) as dir_entries:
+					for entry in dir_entries:
+						if entry.is_dir(follow_symlinks=False):
+							if self.recursive is True:
+								dir_stack.append(entry.path)
+						else:
+							found_files.append(entry.path)
+			except (FileNotFoundError, NotADirectoryError):
+				continue
+		return found_files
+
+	def read(self, timeout):
+		"""Wait up to timeout seconds for events, returns the paths of the changed files."""
+
+		import select
+		changed_paths = []
+		ready, _, _ = select.select([self.fd], [], [], timeout)
+		if ready == []:
+			return changed_paths
+		event_bytes = os.read(self.fd, 64 * 1024)
+		offset = 0
+		while offset < len(event_bytes):
+			wd, mask, cookie, name_len = struct.unpack_from('iIII', event_bytes, offset)
+			offset += 16
+			name = os.fsdecode(event_bytes[offset:offset + name_len].rstrip(b'\0'))
+			offset += name_len
+			if mask & _IN_Q_OVERFLOW:
+				self.overflowed = True
+				continue
+			if mask & _IN_IGNORED:
+				self._wd_dirs.pop(wd, None)
+				continue
+			event_dir = self._wd_dirs.get(wd)
+			if event_dir is None:
+				continue
+			event_path = os.path.join(event_dir, name)
+			if mask & _IN_ISDIR:
+				if self.recursive is True and mask & (_IN_CREATE | _IN_MOVED_TO):
+					changed_paths += self._watch_tree(event_path)
+			elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+				changed_paths.append(event_path)
+		return changed_paths
+
+	def close(self):
+		os.close(self.fd)
+
+class _PollingWatcher:
+	"""This class finds the files that are new or changed (by size and modification time) in the watched folders by
+	comparing an os.scandir snapshot of them every interval seconds, for where inotify isn't available."""
+
+	def __init__(self, watch_dirs, recursive=True, interval=2.0):
+		self.watch_dirs = [os.fspath(watch_dir) for watch_dir in watch_dirs]
+		self.recursive = recursive
+		self.interval = interval
+		self.overflowed = False
+		self._snapshot = self._scan()
+		self._next_scan = time.monotonic() + interval
+
+	def _scan(self):
+		snapshot = {}
+		for watch_dir in self.watch_dirs:
+			for file_path, file_stat in _walk_files(watch_dir, self.recursive):
+				snapshot[file_path] = (file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino)
+		return snapshot
+
+	def read(self, timeout):
+		"""Wait up to timeout seconds for the next scan, returns the paths of the new or changed files."""
+
+		wait_time = self._next_scan - time.monotonic()
+		if wait_time > timeout:
+			time.sleep(timeout)
+			return []
+		if wait_time > 0:
+			time.sleep(wait_time)
+		self._next_scan = time.monotonic() + self.interval
+
+		new_snapshot = self._scan()
+		old_snapshot = self._snapshot
+		self._snapshot = new_snapshot
+		return [file_path for file_path, file_record in new_snapshot.items() if old_snapshot.get(file_path) != file_record]
+
+	def close(self):
+		self._snapshot = {}
+
+class HotFolder:
+	"""This class watches folders and runs rules on the files that are written or moved into them, so only new work
+	is done instead of rescanning everything on a schedule.\n
+	On Linux the changes come from inotify, everywhere else (or if use_inotify is False) the folders are compared
+	with an os.scandir snapshot every poll_interval seconds.\n
+	A burst of changes to one file is coalesced: the file is only handed to the rules once it stayed unchanged for
+	settle seconds. The rules run on a pool of workers threads, and at most workers * 2 files wait for one,
+	after that reading new changes waits.\n
+	For example:\n
+	hot_folder.add_rule(['*.jpeg'], lambda path: paths_ops.change_ext(path, '.jpg', keep_orig_file=False))\n
+	hot_folder.add_rule(JUNK_PATTERNS, lambda path: paths_ops.delete(path))\n
+	Keep in mind that the files a rule makes in a watched folder are changes too."""
+
+	def __init__(self, watch_dir_or_dir_list, recursive=True, settle=1.0, workers=4, poll_interval=2.0,
+	             use_inotify=None, on_result=None, print_err=True):
+		if type(watch_dir_or_dir_list) is not list:
+			watch_dir_or_dir_list = [watch_dir_or_dir_list]
+		for watch_dir in watch_dir_or_dir_list:
+			_is_type_or_raise(type(watch_dir), paths.Path, 'watch_dir_or_dir_list')
+			if _is_dir(watch_dir) is False:
+				raise PathNotFoundError(f'''the folder to watch "{watch_dir}" doesn't exist.''')
+		_is_type_or_raise(type(workers), int, 'workers')
+		if workers < 1:
+			raise InvalidInputError(f'workers must be at least 1, not {workers}')
+
+		self.watch_dirs = watch_dir_or_dir_list
+		self.recursive = recursive
+		self.settle = settle
+		self.workers = workers
+		self.poll_interval = poll_interval
+		if use_inotify is None:
+			use_inotify = sys.platform.startswith('linux')
+		self.use_inotify = use_inotify
+		# Called with (path, rule_func, what the rule returned or the exception it raised) after every rule.
+		self.on_result = on_result
+		self.print_err = print_err
+		# (name matcher, rule function) in the order they were added.
+		self._rules = []
+		self._stop = threading.Event()
+		self._thread = None
+		self._slots = threading.BoundedSemaphore(workers * 2)
+		self._in_flight = set()
+		self._in_flight_lock = threading.Lock()
+
+	def add_rule(self, patterns, rule_func):
+		"""Call rule_func(path) (a pathlib path) for every changed file whose name matches one of patterns
+		(exact names or globs like "*.jpeg"). A file that matches several rules goes through them in the order
+		they were added, stopping if a rule moved or deleted it."""
+
+		if type(patterns) is str or len(patterns) == 0:
+			raise InvalidInputError(f'patterns must be a list or tuple of file names/globs, not "{patterns}"')
+		self._rules.append((_name_matcher(patterns), rule_func))
+		return rule_func
+
+	def run(self):
+		"""Watch the folders until the stop method is called (this blocks, see the start method)."""
+
+		watcher = self._make_watcher()
+		# Path to when it last changed.
+		pending = {}
+		last_read_time = time.time()
+		try:
+			with futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+				while self._stop.is_set() is False:
+					timeout = min(self.settle, 0.5) if pending else 0.5
+					read_time = time.time()
+					for changed_path in watcher.read(timeout):
+						pending[changed_path] = time.monotonic()
+					if watcher.overflowed is True:
+						# Some events since the last read were dropped, so look for what changed since then.
+						watcher.overflowed = False
+						for changed_path in self._recently_changed(last_read_time - 1.0):
+							pending.setdefault(changed_path, time.monotonic())
+					last_read_time = read_time
+
+					settled_time = time.monotonic() - self.settle
+					for changed_path in [path for path, changed_time in pending.items() if changed_time <= settled_time]:
+						with self._in_flight_lock:
+							is_running = changed_path in self._in_flight
+						if is_running is True:
+							# Wait for the rules running on the older version of the file to finish.
+							pending[changed_path] = time.monotonic()
+							continue
+						del pending[changed_path]
+						self._dispatch(changed_path, pool)
+		finally:
+			watcher.close()
+
+	def start(self):
+		"""Run the watcher on a background thread, returns self."""
+
+		self._stop.clear()
+		self._thread = threading.Thread(target=self.run, name='HotFolder', daemon=True)
+		self._thread.start()
+		return self
+
+	def stop(self):
+		"""Stop watching and wait for the rules that are running to finish."""
+
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+
+	def _make_watcher(self):
+		if self.use_inotify is True:
+			try:
+				return _InotifyWatcher(self.watch_dirs, self.recursive)
+			except (OSError, AttributeError) as err:
+				# Like running out of inotify watches, or a libc without inotify.
+				if self.print_err is True:
+					print(f'Error, inotify could not be used so the folders are polled instead: {err}')
+		return _PollingWatcher(self.watch_dirs, self.recursive, self.poll_interval)
+
+	def _recently_changed(self, since_time):
+		"""Returns the files that changed (or were moved, which changes their ctime on Linux) since since_time,
+		used when inotify dropped events."""
+
+		changed_paths = []
+		for watch_dir in self.watch_dirs:
+			for file_path, file_stat in _walk_files(os.fspath(watch_dir), self.recursive):
+				if max(file_stat.st_mtime, file_stat.st_ctime) >= since_time:
+					changed_paths.append(file_path)
+		return changed_paths
+
+	def _dispatch(self, changed_path, pool):
+		file_name = os.path.basename(changed_path)
+		rule_funcs = [rule_func for is_match, rule_func in self._rules if is_match(file_name)]
+		if rule_funcs == [] or _is_file(changed_path) is False:
+			return
+		# Blocks while every worker is busy and the pool's queue is full.
+		self._slots.acquire()
+		with self._in_flight_lock:
+			self._in_flight.add(changed_path)
+		pool.submit(self._run_rules, changed_path, rule_funcs)
+
+	def _run_rules(self, changed_path, rule_funcs):
+		try:
+			for rule_func in rule_funcs:
+				if _lexists(changed_path) is False:
+					break
+				try:
+					rule_result = rule_func(paths.Path(changed_path))
+				except Exception as err:
+					rule_result = err
+					if self.print_err is True:
+						print(f'Error, a rule failed on "{changed_path}": {err}')
+				if self.on_result is not None:
+					self.on_result(paths.Path(changed_path), rule_func, rule_result)
+		finally:
+			with self._in_flight_lock:
+				self._in_flight.discard(changed_path)
+			self._slots.release()
+
+# The methods "python -m system" can run, the op of each JSON line is one of these.
+CLI_PATHS_OPS = ('create_dir', 'create_cur_year_month_dir', 'del_ds_store', 'sweep_junk', 'delete', 'move_to_new_dir',
+                 'copy_to_new_dir', 'sync_dir', 'rename', 'rename_many', 'rollback_renames', 'resume_renames',
+                 'duplicate', 'change_ext', 'copy_many', 'move_many', 'verify_manifest', 'archive_by_date')
+CLI_OPERATIONS_OPS = ('copy_to_clipboard', 'get_clipboard', 'open_path_or_app', 'fq_app', 'fq_apps', 'hide_app',
+                      'hide_apps')
+
+# The Paths and Operations of this process, made the first time an operation needs them.
+_cli_instances = None
+
+def _cli_arg(arg_name, arg_value):
+	"""Turn a JSON argument into what the method expects: strings of arguments that are paths or folders become
+	pathlib paths (and so do the paths in lists, copy_many/move_many jobs and rename_many dicts).\n
+	open_this is only a path if it exists, otherwise it's the name of an application."""
+
+	is_path_arg = ('path' in arg_name or 'dir' in arg_name) and arg_name.endswith(('name', 'names')) is False
+	if arg_name == 'open_this' and type(arg_value) is str and _exists(arg_value):
+		return paths.Path(arg_value)
+	elif arg_name == 'jobs':
+		return [[paths.Path(job[0]), paths.Path(job[1])] + list(job[2:]) for job in arg_value]
+	elif arg_name == 'renames':
+		if type(arg_value) is dict:
+			return {paths.Path(in_path): new_name for in_path, new_name in arg_value.items()}
+		return [paths.Path(in_path) for in_path in arg_value]
+	elif is_path_arg and type(arg_value) is str:
+		return paths.Path(arg_value)
+	elif is_path_arg and type(arg_value) is list:
+		return [paths.Path(in_path) if type(in_path) is str else in_path for in_path in arg_value]
+	elif type(arg_value) is list and arg_name.endswith('patterns'):
+		return tuple(arg_value)
+	return arg_value
+
+def _cli_param_names(method):
+	import inspect
+	return inspect.signature(method).parameters
+
+def _cli_json_value(value):
+	"""Turn a method's return value (like an OpResult, DeleteStats or a dict of AppResults) into JSON types."""
+
+	if value is None or type(value) in (bool, int, float, str):
+		return value
+	elif isinstance(value, paths.PurePath):
+		return os.fspath(value)
+	elif type(value) in (list, tuple, set):
+		return [_cli_json_value(item) for item in value]
+	elif type(value) is dict:
+		return {os.fspath(key) if isinstance(key, paths.PurePath) else str(key): _cli_json_value(item)
+		        for key, item in value.items()}
+	elif hasattr(value, '__dict__'):
+		return {attr_name: _cli_json_value(attr_value) for attr_name, attr_value in vars(value).items()
+		        if attr_name.startswith('_') is False}
+	return repr(value)
+
+def _cli_run(op_line, line_number):
+	"""Run the operation of one JSON line and returns its result line as a dict."""
+
+	global _cli_instances
+	result_line = {'line': line_number, 'id': None, 'op': None, 'ok': False, 'result': None, 'error': None}
+	try:
+		op_spec = json.loads(op_line)
+		if type(op_spec) is not dict:
+			raise InvalidInputError(f'each line must be a JSON object, not "{op_line.strip()}"')
+		result_line['id'] = op_spec.pop('id', None)
+		op = result_line['op'] = op_spec.pop('op', None)
+		if op not in CLI_PATHS_OPS and op not in CLI_OPERATIONS_OPS:
+			raise InvalidInputError(f'"{op}" is not an operation that can be run.')
+
+		if _cli_instances is None:
+			# Nothing can print since stdout is the result stream.
+			_cli_instances = (Paths(print_success=False, print_err=False), Operations(print_success=False, print_err=False))
+		method = getattr(_cli_instances[0] if op in CLI_PATHS_OPS else _cli_instances[1], op)
+
+		op_args = op_spec.pop('args', [])
+		if op_args != []:
+			# Positional arguments are converted by the name of the parameter they're for.
+			param_names = list(_cli_param_names(method))
+			op_args = [_cli_arg(param_names[arg_index] if arg_index < len(param_names) else '', arg_value)
+			           for arg_index, arg_value in enumerate(op_args)]
+		op_kwargs = {arg_name: _cli_arg(arg_name, arg_value) for arg_name, arg_value in op_spec.items()}
+		op_result = method(*op_args, **op_kwargs)
+		if op == 'archive_by_date':
+			op_result = list(op_result)
+	except Exception as err:
+		result_line['error'] = f'{type(err).__name__}: {err}'
+		return result_line
+
+	result_line['result'] = _cli_json_value(op_result)
+	result_line['ok'] = _cli_ok(op_result)
+	return result_line
+
+def _cli_ok(op_result):
+	"""Returns True if a method's return value means everything in it worked: no rename conflicts,
+	every OpResult/AppResult of a list or dict ok and every file of a VerifyResult matched."""
+
+	if type(op_result) in (list, tuple):
+		return all(_cli_ok(item) for item in op_result)
+	elif type(op_result) is dict:
+		return all(_cli_ok(item) for item in op_result.values())
+	elif type(op_result) is RenameResult:
+		return op_result.conflicts == []
+	elif type(op_result) is VerifyResult:
+		return bool(op_result)
+	elif hasattr(op_result, 'ok'):
+		return op_result.ok is True
+	return op_result is not False
+
+def _cli_results(op_lines, executor, max_in_flight, ordered=False):
+	"""This generator runs every operation line on executor and yields the result lines, as they finish or
+	(if ordered is True) in the same order as the input. At most max_in_flight lines are read ahead."""
+
+	in_flight = set()
+	# Finished results that are waiting for an earlier line, only used if ordered is True.
+	finished = {}
+	next_line = 1
+
+	def take_done(done_futures):
+		nonlocal next_line
+		for done_future in done_futures:
+			result_line = done_future.result()
+			if ordered is False:
+				yield result_line
+			else:
+				finished[result_line['line']] = result_line
+		while next_line in finished:
+			result_line = finished.pop(next_line)
+			next_line += 1
+			# None is a blank or comment line.
+			if result_line is not None:
+				yield result_line
+
+	for line_number, op_line in enumerate(op_lines, 1):
+		if op_line.strip() == '' or op_line.lstrip().startswith('#'):
+			if ordered is True:
+				finished[line_number] = None
+				yield from take_done([])
+			continue
+		in_flight.add(executor.submit(_cli_run, op_line, line_number))
+		while len(in_flight) + len(finished) >= max_in_flight:
+			done_futures, in_flight = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+			yield from take_done(done_futures)
+
+	while in_flight:
+		done_futures, in_flight = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+		yield from take_done(done_futures)
+
+def _main(argv=None):
+	import argparse
+	parser = argparse.ArgumentParser(
+		prog='python -m system',
+		description='Run a stream of Paths/Operations methods from JSON lines like {"op": "copy_to_new_dir", '
+		            '"copy_file_folder_path": "a.txt", "new_dir_path": "out", "id": 1} and write one JSON result '
+		            'line for each of them.')
+	parser.add_argument('ops_file', nargs='?', default='-', help='file of JSON lines, "-" (the default) reads stdin')
+	parser.add_argument('--workers', type=int, default=8, help='operations that run at once')
+	parser.add_argument('--processes', action='store_true', help='run the operations on processes instead of threads')
+	parser.add_argument('--ordered', action='store_true',
+	                    help='write the results in the same order as the input instead of as they finish '
+	                         '(the operations still run at the same time, use --workers 1 if they depend on each other)')
+	args = parser.parse_args(argv)
+	if args.workers < 1:
+		parser.error(f'--workers must be at least 1, not {args.workers}')
+
+	if args.ops_file == '-':
+		ops_file = sys.stdin
+	else:
+		ops_file = open(args.ops_file, encoding='utf-8')
+	if args.processes is True:
+		executor = futures.ProcessPoolExecutor(max_workers=args.workers)
+	else:
+		executor = futures.ThreadPoolExecutor(max_workers=args.workers)
+
+	all_ok = True
+	try:
+		with executor:
+			# readline instead of iterating the file so each line is run as soon as it arrives on a pipe.
+			for result_line in _cli_results(iter(ops_file.readline, ''), executor, args.workers * 4, args.ordered):
+				all_ok = all_ok and result_line['ok']
+				sys.stdout.write(json.dumps(result_line) + '\n')
+				sys.stdout.flush()
+	finally:
+		if ops_file is not sys.stdin:
+			ops_file.close()
+	return 0 if all_ok is True else 1
+
+if __name__ == '__main__':
+	sys.exit(_main())
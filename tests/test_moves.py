@@ -0,0 +1,100 @@
+# Tests of resuming interrupted copies and cross-filesystem moves (_copy_file with resume and _move_across_devices,
+# 	run here on one filesystem) when the source changes in between.
+#
+# Usage: python -m pytest tests (or python -m unittest discover tests)
+
+import os
+import pathlib as paths
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(paths.Path(__file__).resolve().parent.parent))
+import system
+
+class Crash(Exception):
+	pass
+
+def crash(src_path, copied_bytes, total_bytes):
+	raise Crash()
+
+def rewrite(file_path, data):
+	"""Write data to file_path and move its modification time forward, like an edit a while later."""
+	mtime_ns = file_path.stat().st_mtime_ns
+	file_path.write_bytes(data)
+	os.utime(file_path, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+
+class ResumeTest(unittest.TestCase):
+	def setUp(self):
+		self.work_dir = paths.Path(tempfile.mkdtemp())
+		self.addCleanup(shutil.rmtree, self.work_dir)
+		# Small chunks and no reflink so a copy can be stopped part way.
+		for patcher in (mock.patch.object(system, 'COPY_CHUNK_SIZE', 100),
+		                mock.patch.object(system, '_reflink', lambda src_fd, dst_fd: False)):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def test_copy_resume_after_source_edit(self):
+		src_path = self.work_dir / 'src.bin'
+		dst_path = self.work_dir / 'dst.bin'
+		src_path.write_bytes(b'A' * 1000)
+		with self.assertRaises(Crash):
+			system._copy_file(src_path, dst_path, resume=True, progress=crash)
+		self.assertTrue(self.work_dir.joinpath('dst.bin.part').exists())
+
+		rewrite(src_path, b'B' * 1000)
+		system._copy_file(src_path, dst_path, resume=True)
+		self.assertEqual(dst_path.read_bytes(), b'B' * 1000)
+		self.assertEqual(sorted(os.listdir(self.work_dir)), ['dst.bin', 'src.bin'])
+
+	def test_copy_resume_continues(self):
+		src_path = self.work_dir / 'src.bin'
+		dst_path = self.work_dir / 'dst.bin'
+		src_path.write_bytes(os.urandom(1000))
+		with self.assertRaises(Crash):
+			system._copy_file(src_path, dst_path, resume=True, progress=crash)
+		copied = []
+		system._copy_file(src_path, dst_path, resume=True, progress=lambda *progress: copied.append(progress[1]))
+		# It carried on after the first chunk instead of starting over.
+		self.assertEqual(copied[0], 200)
+		self.assertEqual(dst_path.read_bytes(), src_path.read_bytes())
+
+	def test_move_resume_after_source_edit(self):
+		src_dir = self.work_dir / 'src'
+		dst_dir = self.work_dir / 'dst'
+		src_dir.mkdir()
+		src_dir.joinpath('big.bin').write_bytes(b'A' * 1000)
+		with self.assertRaises(Crash):
+			system._move_across_devices(src_dir, dst_dir, workers=1, progress=crash)
+		self.assertTrue(dst_dir.joinpath('big.bin.part').exists())
+		self.assertIs(system._move_in_progress(src_dir, dst_dir), True)
+
+		rewrite(src_dir / 'big.bin', b'B' * 1000)
+		self.assertEqual(system._move_across_devices(src_dir, dst_dir, workers=1), [])
+		self.assertEqual(dst_dir.joinpath('big.bin').read_bytes(), b'B' * 1000)
+		self.assertFalse(src_dir.exists())
+		self.assertEqual(os.listdir(dst_dir), ['big.bin'])
+		self.assertIs(system._move_in_progress(src_dir, dst_dir), False)
+
+	def test_move_keeps_source_that_changes_while_moving(self):
+		src_path = self.work_dir / 'src.bin'
+		dst_path = self.work_dir / 'dst.bin'
+		src_path.write_bytes(b'A' * 1000)
+
+		def edit_source(progress_src, moved_bytes, total_bytes):
+			if moved_bytes == 100:
+				rewrite(src_path, b'B' * 1000)
+		move_errors = system._move_across_devices(src_path, dst_path, workers=1, progress=edit_source)
+		self.assertEqual(len(move_errors), 1)
+		self.assertIn('changed while it was moved', move_errors[0])
+		self.assertEqual(src_path.read_bytes(), b'B' * 1000)
+
+		# Running it again copies the new version.
+		self.assertEqual(system._move_across_devices(src_path, dst_path, workers=1), [])
+		self.assertEqual(dst_path.read_bytes(), b'B' * 1000)
+		self.assertFalse(src_path.exists())
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,162 @@
+# Tests of how applications are found and quit: _find_pids against a fake /proc folder and spawned sleep processes,
+# 	LinuxBackend.quit_apps against spawned processes and DarwinBackend.quit_apps against stub osascript/killall.
+#
+# Usage: python -m pytest tests (or python -m unittest discover tests)
+
+import os
+import pathlib as paths
+import shutil
+import subprocess as sub
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, str(paths.Path(__file__).resolve().parent.parent))
+import system
+
+def make_proc_entry(proc_dir, pid, comm, cmdline, state='S'):
+	"""Make the comm, cmdline and stat files of a fake /proc/<pid>."""
+
+	pid_dir = proc_dir.joinpath(str(pid))
+	pid_dir.mkdir()
+	pid_dir.joinpath('comm').write_text(comm + '\n')
+	pid_dir.joinpath('cmdline').write_bytes('\0'.join(cmdline).encode('utf-8') + b'\0')
+	pid_dir.joinpath('stat').write_text(f'{pid} ({comm}) {state} 1 {pid} {pid} 0 -1\n')
+
+class FakeProcTest(unittest.TestCase):
+	def setUp(self):
+		self.proc_dir = paths.Path(tempfile.mkdtemp())
+		self.addCleanup(shutil.rmtree, self.proc_dir)
+
+	def test_comm_and_program_name(self):
+		make_proc_entry(self.proc_dir, 101, 'firefox', ['/usr/lib/firefox/firefox', '--new-window'])
+		make_proc_entry(self.proc_dir, 102, 'Web Content', ['/usr/lib/firefox/firefox', '-contentproc'])
+		make_proc_entry(self.proc_dir, 103, 'gedit', ['gedit'])
+		found = system._find_pids(['Firefox', 'gedit', 'missing'], str(self.proc_dir))
+		self.assertEqual(sorted(found['Firefox']), [101, 102])
+		self.assertEqual(found['gedit'], [103])
+		self.assertEqual(found['missing'], [])
+
+	def test_script_name_after_interpreter(self):
+		make_proc_entry(self.proc_dir, 201, 'python3', ['/usr/bin/python3.12', '-u', '/opt/tools/myscript.py'])
+		make_proc_entry(self.proc_dir, 202, 'node', ['node', 'server.js'])
+		found = system._find_pids(['myscript.py', 'server.js', '-u'], str(self.proc_dir))
+		self.assertEqual(found['myscript.py'], [201])
+		self.assertEqual(found['server.js'], [202])
+		self.assertEqual(found['-u'], [])
+
+	def test_only_exact_interpreter_names(self):
+		# shuf and shotwell start with "sh" but they aren't interpreters.
+		make_proc_entry(self.proc_dir, 301, 'shuf', ['shuf', 'words.txt'])
+		make_proc_entry(self.proc_dir, 302, 'shotwell', ['shotwell', 'photos'])
+		make_proc_entry(self.proc_dir, 303, 'sh', ['sh', '-c', 'sleep 5'])
+		found = system._find_pids(['words.txt', 'photos', '-c'], str(self.proc_dir))
+		self.assertEqual(found, {'words.txt': [], 'photos': [], '-c': []})
+
+	def test_long_name_cut_off_comm(self):
+		make_proc_entry(self.proc_dir, 401, 'gnome-calculato', ['/usr/bin/gnome-calculator'])
+		make_proc_entry(self.proc_dir, 402, 'gnome-calculato', ['/opt/other-calculator-helper'])
+		found = system._find_pids(['gnome-calculator'], str(self.proc_dir))
+		self.assertEqual(sorted(found['gnome-calculator']), [401, 402])
+
+	def test_zombie_is_not_running(self):
+		make_proc_entry(self.proc_dir, 501, 'exited', ['exited'], state='Z')
+		make_proc_entry(self.proc_dir, 502, 'running', ['running'], state='S')
+		self.assertIs(system._pid_running(501, str(self.proc_dir)), False)
+		self.assertIs(system._pid_running(502, str(self.proc_dir)), True)
+		self.assertIs(system._pid_running(503, str(self.proc_dir)), False)
+
+@unittest.skipUnless(os.path.isdir('/proc/self') and shutil.which('sleep'), 'needs /proc and sleep')
+class SpawnedProcessTest(unittest.TestCase):
+	def setUp(self):
+		# sleep is run through a symlink with a name nothing else uses, so only these processes can match.
+		self.link_dir = paths.Path(tempfile.mkdtemp())
+		self.addCleanup(shutil.rmtree, self.link_dir)
+		self.app_name = f'sysnap{os.getpid()}'
+		self.link_dir.joinpath(self.app_name).symlink_to(shutil.which('sleep'))
+		self.processes = []
+
+	def tearDown(self):
+		for process in self.processes:
+			if process.poll() is None:
+				process.kill()
+			process.wait()
+
+	def spawn(self, count):
+		self.processes += [sub.Popen([str(self.link_dir.joinpath(self.app_name)), '60']) for index in range(count)]
+		deadline = time.monotonic() + 5
+		while time.monotonic() < deadline:
+			if len(system._find_pids([self.app_name])[self.app_name]) == len(self.processes):
+				break
+			time.sleep(0.01)
+
+	def test_find_pids(self):
+		self.spawn(2)
+		found = system._find_pids([self.app_name, 'no-such-app-zz'])
+		self.assertEqual(sorted(found[self.app_name]), sorted(process.pid for process in self.processes))
+		self.assertEqual(found['no-such-app-zz'], [])
+
+	def test_quit_apps(self):
+		self.spawn(2)
+		app_results = system.LinuxBackend().quit_apps([self.app_name, 'no-such-app-zz'], timeout=5)
+		self.assertIs(app_results[self.app_name].ok, True)
+		self.assertEqual(sorted(app_results[self.app_name].pids), sorted(process.pid for process in self.processes))
+		self.assertIs(app_results['no-such-app-zz'].ok, False)
+		for process in self.processes:
+			self.assertIsNotNone(process.wait(timeout=5))
+
+# Stub osascript where only "Quits" quits and every other app is stuck (like on a save dialog), so its statement
+# 	times out if it has an AppleScript timeout and otherwise blocks the whole script.
+# 	The stub killall only finds "killable".
+STUB_OSASCRIPT = '''import re, sys, time
+for index, statement in enumerate(re.findall(r'try\\n(.*?)\\non error', sys.argv[-1], re.DOTALL)):
+	if 'quit app "Quits"' in statement:
+		print(f'{index}\\tok')
+	elif 'with timeout of' in statement:
+		print(f'{index}\\terr AppleEvent timed out.')
+	else:
+		time.sleep(60)
+'''
+STUB_KILLALL = '''import sys
+if sys.argv[-1] != 'killable':
+	sys.stderr.write('No matching processes belonging to you were found\\n')
+	sys.exit(1)
+'''
+
+@unittest.skipIf(os.name == 'nt', 'the stub executables are scripts with a #! line')
+class DarwinQuitTest(unittest.TestCase):
+	def setUp(self):
+		stub_dir = paths.Path(tempfile.mkdtemp())
+		self.addCleanup(shutil.rmtree, stub_dir)
+		for stub_name, stub_code in (('osascript', STUB_OSASCRIPT), ('killall', STUB_KILLALL)):
+			stub_path = stub_dir.joinpath(stub_name)
+			stub_path.write_text(f'#!{sys.executable}\n' + stub_code)
+			stub_path.chmod(0o755)
+		orig_path = os.environ['PATH']
+		os.environ['PATH'] = str(stub_dir) + os.pathsep + orig_path
+		self.addCleanup(os.environ.__setitem__, 'PATH', orig_path)
+
+	def test_force_checks_killall(self):
+		app_results = system.DarwinBackend().quit_apps(['killable', 'Not Running'], force=True)
+		self.assertIs(app_results['killable'].ok, True)
+		self.assertIs(app_results['Not Running'].ok, False)
+		self.assertIn('No matching processes', app_results['Not Running'].err)
+
+	def test_without_force(self):
+		app_results = system.DarwinBackend().quit_apps(['killable'])
+		self.assertIs(app_results['killable'].ok, False)
+		self.assertEqual(app_results['killable'].err, 'AppleEvent timed out.')
+
+	def test_stuck_app_keeps_the_others(self):
+		app_results = system.DarwinBackend().quit_apps(['Quits', 'Stuck', 'killable'], force=True, timeout=2)
+		self.assertIs(app_results['Quits'].ok, True)
+		self.assertIs(app_results['Stuck'].ok, False)
+		self.assertIn('AppleEvent timed out.', app_results['Stuck'].err)
+		self.assertIs(app_results['killable'].ok, True)
+
+	def test_script_timeout_covers_every_app(self):
+		self.assertEqual(system._applescript_batch_timeout(['a', 'b'], 2.5), 3 * 2 + 5)
+
+if __name__ == '__main__':
+	unittest.main()
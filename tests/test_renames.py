@@ -0,0 +1,95 @@
+# Tests of Paths.rename_many: the order swaps and chains are renamed in, conflicts and the undo journal
+# 	(rollback_renames and resume_renames).
+#
+# Usage: python -m pytest tests (or python -m unittest discover tests)
+
+import json
+import os
+import pathlib as paths
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(paths.Path(__file__).resolve().parent.parent))
+import system
+
+class RenameManyTest(unittest.TestCase):
+	def setUp(self):
+		self.work_dir = paths.Path(tempfile.mkdtemp())
+		self.addCleanup(shutil.rmtree, self.work_dir)
+		self.paths = system.Paths(print_success=False, print_err=False)
+
+	def make_files(self, *names):
+		for name in names:
+			self.work_dir.joinpath(name).write_text(name)
+
+	def contents(self):
+		"""Returns {name: the name the file had when it was made} of every file in the work folder."""
+		return {file_path.name: file_path.read_text() for file_path in self.work_dir.iterdir()}
+
+	def test_swap(self):
+		self.make_files('a.txt', 'b.txt')
+		rename_result = self.paths.rename_many({self.work_dir / 'a.txt': 'b.txt', self.work_dir / 'b.txt': 'a.txt'})
+		self.assertEqual(rename_result.conflicts, [])
+		# One extra step through a temporary name breaks the cycle.
+		self.assertEqual(len(rename_result.steps), 3)
+		self.assertEqual(self.contents(), {'a.txt': 'b.txt', 'b.txt': 'a.txt'})
+
+	def test_chain(self):
+		self.make_files('a.txt', 'b.txt')
+		rename_result = self.paths.rename_many({self.work_dir / 'a.txt': 'b.txt', self.work_dir / 'b.txt': 'c.txt'})
+		self.assertEqual(rename_result.conflicts, [])
+		self.assertEqual(len(rename_result.steps), 2)
+		self.assertEqual(self.contents(), {'b.txt': 'a.txt', 'c.txt': 'b.txt'})
+
+	def test_conflicts_rename_nothing(self):
+		self.make_files('a.txt', 'b.txt', 'c.txt')
+		rename_result = self.paths.rename_many({self.work_dir / 'a.txt': 'c.txt', self.work_dir / 'b.txt': 'd.txt'})
+		self.assertEqual(len(rename_result.conflicts), 1)
+		self.assertIn('already exists', rename_result.conflicts[0])
+		self.assertEqual(self.contents(), {'a.txt': 'a.txt', 'b.txt': 'b.txt', 'c.txt': 'c.txt'})
+
+	def test_target_that_turns_up_is_not_replaced(self):
+		# Like a name that only differs by case from another target on a case-insensitive volume.
+		self.make_files('a.txt', 'b.txt')
+		a_path, b_path, c_path = (str(self.work_dir / name) for name in ('a.txt', 'b.txt', 'c.txt'))
+		with self.assertRaises(FileExistsError):
+			system._apply_rename_steps([(a_path, c_path), (b_path, c_path)])
+		self.assertEqual(self.contents(), {'b.txt': 'b.txt', 'c.txt': 'a.txt'})
+
+	def test_rollback(self):
+		self.make_files('a.txt', 'b.txt', 'c.txt')
+		journal_path = self.work_dir.parent / f'{self.work_dir.name}.journal'
+		self.addCleanup(journal_path.unlink)
+		self.paths.rename_many({self.work_dir / 'a.txt': 'b.txt', self.work_dir / 'b.txt': 'a.txt',
+		                        self.work_dir / 'c.txt': 'd.txt'}, journal_path=journal_path)
+		self.assertEqual(self.contents(), {'a.txt': 'b.txt', 'b.txt': 'a.txt', 'd.txt': 'c.txt'})
+		self.assertIs(self.paths.rollback_renames(journal_path).ok, True)
+		self.assertEqual(self.contents(), {'a.txt': 'a.txt', 'b.txt': 'b.txt', 'c.txt': 'c.txt'})
+
+	def interrupted_batch(self, journal_path):
+		"""Journal a swap as if the process was killed after its first step."""
+		self.make_files('a.txt', 'b.txt')
+		rename_result = self.paths.rename_many({self.work_dir / 'a.txt': 'b.txt', self.work_dir / 'b.txt': 'a.txt'},
+		                                       dry_run=True)
+		first_from, first_to = rename_result.steps[0]
+		os.rename(first_from, first_to)
+		journal_path.write_text(json.dumps({'steps': rename_result.steps}) + '\n' + json.dumps({'done': 0}) + '\n')
+
+	def test_rollback_interrupted(self):
+		journal_path = self.work_dir.parent / f'{self.work_dir.name}.journal'
+		self.addCleanup(journal_path.unlink)
+		self.interrupted_batch(journal_path)
+		self.assertIs(self.paths.rollback_renames(journal_path).ok, True)
+		self.assertEqual(self.contents(), {'a.txt': 'a.txt', 'b.txt': 'b.txt'})
+
+	def test_resume_interrupted(self):
+		journal_path = self.work_dir.parent / f'{self.work_dir.name}.journal'
+		self.addCleanup(journal_path.unlink)
+		self.interrupted_batch(journal_path)
+		self.assertIs(self.paths.resume_renames(journal_path).ok, True)
+		self.assertEqual(self.contents(), {'a.txt': 'b.txt', 'b.txt': 'a.txt'})
+
+if __name__ == '__main__':
+	unittest.main()